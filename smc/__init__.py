@@ -1 +1,30 @@
-import all
+r"""
+Secure multiparty computation and secret sharing
+
+The classes and functions of the submodules are available at package level
+as Sage lazy imports. Importing the package loads none of the submodules,
+they are imported on first use.
+"""
+from sage.misc.lazy_import import lazy_import
+
+_exports = {
+    'AdaptivePolicy': 'adaptive',
+    'BGWSimulation': 'mpc',
+    'FeldmanVSS': 'vss',
+    'IncrementalDecoder': 'incremental',
+    'KrawczykSSMS': 'ssms',
+    'LocalDirectoryBackend': 'dispersal',
+    'PedersenVSS': 'vss',
+    'QuorumStore': 'dispersal',
+    'RabinIDS': 'rabin_ids',
+    'ShamirSS': 'shamir_ss',
+    'StorageBackend': 'dispersal',
+    'berlekamp_welsh': 'berlekamp_welsh',
+    'code_context': 'code_context',
+    'disperse_file': 'file_dispersal',
+    'recover_range': 'file_dispersal',
+    'restore_file': 'file_dispersal',
+}
+
+for _name, _module in _exports.items():
+    lazy_import(__name__ + '.' + _module, _name, namespace=globals())
@@ -0,0 +1,288 @@
+# coding: UTF-8
+r"""
+Adaptive decoding
+
+Implements a decoder policy for :class:`ShamirSS` and :class:`RabinIDS`
+which tracks the reliability of share holders (nodes) and decides per
+share-set between erasure decoding and error correction. Shares of
+reliable nodes are interpolated with cached inverse Vandermonde matrices
+and checked against redundant shares, only share-sets failing the check
+are decoded with the Berlekamp-Welsh decoder. The decisions are exposed as
+counters.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import threading
+
+from sage.structure.sage_object import SageObject
+
+from berlekamp_welsh import berlekamp_welsh
+
+COUNTERS = ('reads', 'lagrange', 'checked', 'unchecked', 'escalated', 'failed', 'faults')
+
+
+class AdaptivePolicy(SageObject):
+    r"""
+    Adaptive decoder selection with per-node reliability tracking.
+
+    Every node (share index) has a fault score, the exponentially decaying
+    average of the faulty shares it delivered. A share-set is decoded from
+    the `k` most reliable shares, and the result is checked against up to
+    ``checks`` further shares. Share-sets failing the check, or without `k`
+    trusted shares, are decoded with the Berlekamp-Welsh decoder, which
+    also identifies the faulty nodes.
+
+    The counters are
+
+    - ``reads`` -- number of calls of :meth:`decode`.
+    - ``lagrange`` -- share-sets decoded without error correction.
+    - ``checked`` -- share-sets verified with redundant shares.
+    - ``unchecked`` -- share-sets decoded from exactly `k` shares, without
+      redundant shares to verify the result.
+    - ``escalated`` -- share-sets decoded with error correction.
+    - ``failed`` -- share-sets which could not be decoded.
+    - ``faults`` -- faulty shares detected.
+
+    INPUT:
+
+    - ``scheme`` -- a :class:`ShamirSS` or :class:`RabinIDS` instance.
+    - ``checks`` -- (default: ``1``) number of redundant shares checked.
+    - ``decay`` -- (default: ``0.5``) weight of the previous fault score.
+    - ``threshold`` -- (default: ``0.25``) fault score from which on a node
+      is not trusted.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.shamir_ss import ShamirSS
+        sage: sss = ShamirSS(7, 3)
+        sage: policy = sss.policy()
+
+    Decode without errors::
+
+        sage: shares = sss.share([1, 2, 3])
+        sage: sss.reconstruct(shares, decoder='auto')
+        [1, 2, 3]
+
+    Corrupted shares are detected and corrected::
+
+        sage: shares[0][0] = (1, (shares[0][0][1] + 1) % 2**8)
+        sage: sss.reconstruct(shares, decoder='auto')
+        [1, 2, 3]
+        sage: sorted(policy.counters().items())
+        [('checked', 6), ('escalated', 1), ('failed', 0), ('faults', 1), ('lagrange', 5), ('reads', 2), ('unchecked', 0)]
+
+    The faulty node is requested last::
+
+        sage: policy.select(range(1, 8))
+        [2, 3, 4, 5]
+    """
+    def __init__(self, scheme, checks=1, decay=0.5, threshold=0.25):
+        self._scheme = scheme
+        self._k = scheme._k
+        self._checks = checks
+        self._decay = decay
+        self._threshold = threshold
+        self._scores = {}  # fault score by node index
+        self._counters = dict((key, 0) for key in COUNTERS)
+        self._lock = threading.Lock()
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: RabinIDS().policy()
+            Adaptive decoder policy for (7,3)-Rabin information dispersal over Finite Field in a of size 2^8
+        """
+        return "Adaptive decoder policy for {}".format(self._scheme)
+
+
+    def _score(self, x):
+        return self._scores.get(x, 0.)
+
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._counters[key] += value
+
+
+    def _update(self, xs, faulty):
+        r"""
+        Update fault scores of nodes after decoding.
+        """
+        with self._lock:
+            for x in xs:
+                fault = 1. if x in faulty else 0.
+                self._scores[x] = self._decay * self._score(x) + (1 - self._decay) * fault
+
+
+    def _berlekamp_welsh(self, element):
+        r"""
+        Decode share-set with error correction.
+
+        OUTPUT:
+
+        Tuple of coefficients as field elements and the faulty share indices.
+        """
+        scheme = self._scheme
+        k = self._k
+        # the least reliable share is dropped if it does not add a correctable error
+        ordered = sorted(element, key=lambda share: self._score(share[0]))
+        if (len(ordered) - k) % 2:
+            ordered = ordered[:-1]
+        X = scheme._to_GF_list([x for x, y in element])
+        Y = scheme._to_GF_list([y for x, y in element])
+        points = [(X[i], Y[i]) for i, share in enumerate(element) if share in ordered]
+        try:
+            poly = berlekamp_welsh(k-1, points, scheme._context, strict=True)
+        except (ValueError, ZeroDivisionError):
+            self._count('failed')
+            raise ValueError("too many erroneous shares.")
+        faulty = [x for (x, y), xi, yi in zip(element, X, Y) if poly(xi) != yi]
+        coeffs = poly.list()
+        return coeffs + [scheme._F.zero()] * (k - len(coeffs)), faulty
+
+    ### begin public api
+
+    def counters(self):
+        r"""
+        Return the decision counters.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: ShamirSS().policy().counters()['reads']
+            0
+        """
+        with self._lock:
+            return dict(self._counters)
+
+
+    def decode(self, shares):
+        r"""
+        Decode share-sets.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets ((x,y)-tuples of integer).
+
+        OUTPUT:
+
+        List of the `k` polynomial coefficients (integer) per share-set.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: ids = RabinIDS(5, 2, 257)
+            sage: ids.policy().decode(ids.share([1, 2, 3, 4]))
+            [[1, 2], [3, 4]]
+        """
+        scheme = self._scheme
+        k = self._k
+        self._count('reads')
+
+        # order shares by reliability, k trusted shares and check shares
+        trusted = []
+        index = []
+        escalate = []
+        seen = set()
+        for b, element in enumerate(shares):
+            if len(element) < k:
+                raise ValueError("not enough shares.")
+            seen.update(x for x, y in element)
+            ordered = sorted(element, key=lambda share: self._score(share[0]))
+            if self._score(ordered[k-1][0]) >= self._threshold:
+                escalate.append(b)
+                continue
+            trusted.append(ordered[:k+self._checks])
+            index.append(b)
+
+        # interpolate trusted shares and compare with check shares
+        rows = [None] * len(shares)
+        decoded, mismatch = scheme._decode_groups(trusted)
+        checked = sum(1 for element in trusted if len(element) > k)
+        self._count('checked', checked)
+        self._count('unchecked', len(trusted) - checked)
+        escalate.extend(index[i] for i in mismatch)
+        mismatch = set(mismatch)
+        for i, b in enumerate(index):
+            if i not in mismatch:
+                rows[b] = decoded[i]
+        self._count('lagrange', len(shares) - len(escalate))
+
+        # error correction
+        faulty = set()
+        for b in escalate:
+            self._count('escalated')
+            rows[b], bad = self._berlekamp_welsh(shares[b])
+            self._count('faults', len(bad))
+            faulty.update(bad)
+        self._update(seen, faulty)
+
+        coeffs = scheme._to_Int_list([c for row in rows for c in row])
+        return [coeffs[i:i+k] for i in range(0, len(coeffs), k)]
+
+
+    def scores(self):
+        r"""
+        Return fault scores of the nodes seen so far.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: ShamirSS().policy().scores()
+            {}
+        """
+        with self._lock:
+            return dict(self._scores)
+
+
+    def select(self, xs, count=None):
+        r"""
+        Select nodes to request shares from.
+
+        INPUT:
+
+        - ``xs`` -- available node indices.
+        - ``count`` -- (default: `k` plus checks) number of nodes.
+
+        OUTPUT:
+
+        List of the most reliable node indices, most reliable first.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: ShamirSS(7, 3).policy().select([7, 6, 5, 4, 3, 2, 1], 3)
+            [7, 6, 5]
+        """
+        if count is None:
+            count = self._k + self._checks
+        return sorted(xs, key=self._score)[:count]
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
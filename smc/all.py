@@ -1 +1,3 @@
-from shamir_ss import ShamirSS
+from sage.misc.lazy_import import lazy_import
+
+lazy_import('sage.crypto.smc.shamir_ss', 'ShamirSS')
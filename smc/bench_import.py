@@ -0,0 +1,151 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Benchmark of the package import time
+
+Times the import of the package, the first access of :class:`ShamirSS` and
+its first use in fresh interpreters, and counts the Sage modules and the
+submodules of the package loaded at every stage. The run fails if importing
+the package loads any of its submodules. Results are written as JSON for
+comparison with earlier runs.
+
+Run ``sage -python bench_import.py --help`` for the options.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+# statements timed in a fresh interpreter, each after the previous ones
+STAGES = [
+    ('package', "import {package} as smc"),
+    ('access', "smc.ShamirSS"),
+    ('first use', "sss = smc.ShamirSS(7, 3); sss.reconstruct(sss.share(42))"),
+]
+
+_SCRIPT = """
+import sys, time, json
+result = []
+for name, statement in {stages!r}:
+    start = time.time()
+    exec(statement)
+    stop = time.time()
+    loaded = [m for m, module in list(sys.modules.items()) if module is not None]
+    result.append((name, stop - start,
+                   len([m for m in loaded if m.split('.')[0] == 'sage']),
+                   len([m for m in loaded if m.startswith({package!r} + '.')])))
+print(json.dumps(result))
+"""
+
+
+def path():
+    r"""
+    Return search path importing the package out of sage tree.
+
+    Only the parent directory is added, the submodules are not importable
+    as top-level modules.
+    """
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(package, env=None):
+    r"""
+    Return seconds, loaded Sage modules and loaded submodules per stage in
+    a fresh interpreter.
+    """
+    stages = [(name, statement.format(package=package)) for name, statement in STAGES]
+    output = subprocess.check_output(
+        [sys.executable, '-c', _SCRIPT.format(stages=stages, package=package)], env=env)
+    return [tuple(stage) for stage in json.loads(output.decode())]
+
+
+def run(package, repeat=5):
+    r"""
+    Run the benchmark.
+
+    OUTPUT:
+
+    Dictionary with the best time, the loaded Sage modules and submodules
+    per stage.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        p for p in [path(), env.get('PYTHONPATH')] if p)
+    best = {}
+    for r in range(repeat):
+        for name, seconds, modules, submodules in time_import(package, env):
+            if name not in best or seconds < best[name]['seconds']:
+                best[name] = {'stage': name, 'seconds': seconds, 'sage_modules': modules,
+                              'submodules': submodules}
+    return {'time': time.time(), 'python': platform.python_version(),
+            'machine': platform.machine(), 'package': package,
+            'results': [best[name] for name, statement in STAGES]}
+
+
+def check(report):
+    r"""
+    Return stages before first access loading submodules of the package.
+
+    The package loads :mod:`sage.misc.lazy_import`, but no submodule.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.bench_import import check
+        sage: check({'results': [{'sage_modules': 0, 'submodules': 1}]})
+        [{'sage_modules': 0, 'submodules': 1}]
+    """
+    return [result for result in report['results'][:1] if result['submodules']]
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='Benchmark package import.')
+    parser.add_argument('-o', '--output', default='bench_import.json',
+                        help='JSON output file.')
+    parser.add_argument('-p', '--package', default='smc',
+                        help='Name of the package.')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of fresh interpreters.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    report = run(args.package, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    for result in report['results']:
+        print("{stage}: {seconds:.3f}s, {sage_modules} sage modules, "
+              "{submodules} submodules".format(**result))
+    failed = check(report)
+    if failed:
+        print("package import is not lazy.")
+        sys.exit(1)
@@ -0,0 +1,173 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Benchmark of the number theoretic transform
+
+Times :func:`ntt` and :func:`intt` of every implementation over power of
+two lengths as well as odd and mixed-radix lengths in prime and binary
+extension fields. The scaling exponent of the running time is fitted per
+field and implementation, and the run fails if the fast implementation on
+power of two lengths grows faster than about `n \log n`. The operand
+length at which :func:`poly_mul` with the transform beats the schoolbook
+method is measured per prime field, see ``ntt.measure_crossover``. Results are
+written as JSON for comparison with earlier runs.
+
+Run ``sage -python bench_ntt.py --help`` for the options.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from sage.rings.finite_rings.constructor import FiniteField
+
+import ntt
+
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+
+PRIME = 7340033  # 7 * 2^20 + 1, power of two lengths up to 2^20
+IMPLEMENTATIONS = ['slow', 'textbook', 'fast']
+TOLERANCE = 0.25  # allowed excess of the exponent of t / log(n)
+
+
+def lengths(F, max_bits):
+    r"""
+    Return power of two and other (odd or mixed-radix) transform lengths.
+    """
+    order = F.order() - 1
+    pow2 = [2**i for i in range(4, max_bits+1) if order % 2**i == 0]
+    other = [m for m in [15, 255, 257, 7, 7*2**4, 7*2**8, 7*2**12]
+             if order % m == 0 and m < 2**max_bits]
+    return pow2, other
+
+
+def time_transform(F, n, implementation, repeat=3):
+    r"""
+    Return best time of ``ntt`` and ``intt`` of length ``n`` in seconds.
+    """
+    a = [F.random_element() for i in range(n)]
+    best = [float('inf'), float('inf')]
+    for r in range(repeat):
+        start = time.time()
+        b = ntt.ntt(a, F, implementation)
+        middle = time.time()
+        ntt.intt(b, F, implementation)
+        stop = time.time()
+        best = [min(best[0], middle - start), min(best[1], stop - middle)]
+    return best
+
+
+def fit_exponent(sizes, times):
+    r"""
+    Fit ``times`` to `c \cdot n^e` by least squares in log-log scale.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.bench_ntt import fit_exponent
+        sage: round(fit_exponent([2, 4, 8, 16], [3., 12., 48., 192.]), 6)
+        2.0
+    """
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    return (sum((x - mx) * (y - my) for x, y in zip(xs, ys)) /
+            sum((x - mx)**2 for x in xs))
+
+
+def run(fields, max_bits=20, max_slow_bits=10, max_textbook_bits=16, repeat=3):
+    r"""
+    Run the benchmark.
+
+    OUTPUT:
+
+    Dictionary with the timings and fitted exponents.
+    """
+    limits = {'slow': max_slow_bits, 'textbook': max_textbook_bits, 'fast': max_bits}
+    results = []
+    fits = []
+    crossovers = []
+    for F in fields:
+        if F.is_prime_field():
+            crossovers.append({'field': str(F), 'crossover': ntt.measure_crossover(F, repeat=repeat)})
+        pow2, other = lengths(F, max_bits)
+        for impl in IMPLEMENTATIONS:
+            sizes = [n for n in pow2 + other if n < 2**(limits[impl]+1)]
+            for n in sizes:
+                t_ntt, t_intt = time_transform(F, n, impl, repeat if n < 2**14 else 1)
+                results.append({'field': str(F), 'implementation': impl, 'size': n,
+                                'radix2': n in pow2, 'ntt': t_ntt, 'intt': t_intt})
+            timed = [r for r in results if r['field'] == str(F)
+                     and r['implementation'] == impl and r['radix2']]
+            if len(timed) > 1:
+                ns = [r['size'] for r in timed]
+                ts = [r['ntt'] / math.log(r['size'], 2) for r in timed]
+                fits.append({'field': str(F), 'implementation': impl,
+                             'exponent': fit_exponent(ns, ts)})
+    return {'time': time.time(), 'python': platform.python_version(),
+            'machine': platform.machine(), 'results': results, 'fits': fits,
+            'crossovers': crossovers}
+
+
+def check(report, tolerance=TOLERANCE):
+    r"""
+    Return fits of the fast implementation not scaling as `n \log n`.
+    """
+    return [fit for fit in report['fits'] if fit['implementation'] == 'fast'
+            and fit['exponent'] > 1 + tolerance]
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='Benchmark ntt/intt.')
+    parser.add_argument('-o', '--output', default='bench_ntt.json',
+                        help='JSON output file.')
+    parser.add_argument('-b', '--max-bits', type=int, default=20,
+                        help='Largest power of two length (bits).')
+    parser.add_argument('-s', '--max-slow-bits', type=int, default=10,
+                        help='Largest length of the matrix implementation (bits).')
+    parser.add_argument('-t', '--tolerance', type=float, default=TOLERANCE,
+                        help='Allowed excess of the scaling exponent.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    fields = [FiniteField(PRIME), FiniteField(257), FiniteField(2**16, 'a')]
+    report = run(fields, args.max_bits, args.max_slow_bits,
+                 min(args.max_bits, 16))
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    for fit in report['fits']:
+        print("{field}: {implementation} t/log(n) ~ n^{exponent:.2f}".format(**fit))
+    for c in report['crossovers']:
+        print("{field}: poly_mul crossover at length {crossover}".format(**c))
+    failed = check(report, args.tolerance)
+    if failed:
+        print("fast implementation does not scale as n log n.")
+        sys.exit(1)
@@ -30,9 +30,16 @@ AUTHORS:
 ###############################################################################
 
 from sage.structure.sage_object import SageObject
+from sage.misc.lazy_import import lazy_import
 
+from ntt import poly_divmod
 
-def berlekamp_welsh(deg, points):
+lazy_import('sage.matrix.constructor', 'Matrix')
+lazy_import('sage.modules.free_module_element', 'vector')
+lazy_import('sage.rings.polynomial.polynomial_ring_constructor', 'PolynomialRing')
+
+
+def berlekamp_welsh(deg, points, context=None, strict=False):
     r"""
     Reconstruct polynomial with Berlekamp-Welsh algorithm.
 
@@ -40,6 +47,11 @@ def berlekamp_welsh(deg, points):
 
     - ``deg``    --  degree of polynomial to reconstruct.
     - ``points`` --  array of points (list of (x,y)-tuples).
+    - ``context`` -- (default: ``None``) :class:`CodeContext` of the code;
+      if given, its polynomial ring and cached powers of the points are used.
+    - ``strict`` -- (default: ``False``) if ``True``, raise ``ValueError``
+      if the system has no solution or the error locator does not divide,
+      i.e. decoding failed.
 
     OUTPUT:
 
@@ -71,6 +83,22 @@ def berlekamp_welsh(deg, points):
         sage: poly == berlekamp_welsh(deg, points)
         True
 
+    Detect decoding failures::
+
+        sage: G = FiniteField(257)
+        sage: bad = [(G(1), G(1)), (G(2), G(2)), (G(3), G(4))]
+        sage: berlekamp_welsh(0, bad)
+        255
+        sage: berlekamp_welsh(0, bad, strict=True)
+        Traceback (most recent call last):
+        ...
+        ValueError: too many erroneous shares.
+
+    Reuse precomputations of the code::
+
+        sage: from sage.crypto.smc.code_context import code_context
+        sage: poly == berlekamp_welsh(deg, points, code_context(n, deg+1, order))
+        True
     """
     # check input vector
     F = points[0][0].parent()
@@ -81,26 +109,42 @@ def berlekamp_welsh(deg, points):
             raise TypeError("all points must be from same field.")
         
     # generate and solve system of linear equations
-    from sage.functions.all import floor
-    deg_E = floor((len(points) - (deg + 1)) / 2.)
+    deg_E = (len(points) - (deg + 1)) // 2
     deg_Q = deg_E + deg
-    from sage.matrix.all import Matrix
-    from sage.all import vector
     sys_size = deg_Q + 1 + deg_E
-    A = Matrix(F, sys_size)
     b = vector(F, sys_size)
-    for n, (x, y) in enumerate(points):
-        A[n] = ([x**i for i in range(deg_Q+1)]+[-y * x**i for i in range(deg_E)])
-        b[n] = (y * x**deg_E)
-    QE = A.solve_right(b)
+    if context is None:
+        A = Matrix(F, sys_size)
+        for n, (x, y) in enumerate(points):
+            powers = [x**i for i in range(deg_Q+1)]
+            A[n] = (powers + [-y * p for p in powers[:deg_E]])
+            b[n] = (y * powers[deg_E])
+    else:
+        # copy of the cached system, only the columns of E are filled
+        A = context.bw_system([x for x, y in points], deg).__copy__()
+        for n, (x, y) in enumerate(points):
+            powers = context.powers(x, deg_Q+1)
+            for j in range(deg_E):
+                A[n, deg_Q+1+j] = -y * powers[j]
+            b[n] = (y * powers[deg_E])
+    try:
+        QE = A.solve_right(b)
+    except ValueError:
+        if strict:
+            raise ValueError("too many erroneous shares.")
+        raise
 
     # reconstruct polynomial
-    from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
-    P = PolynomialRing(F, 'x')
-    Q = sum([coeff * P.gen()**i for i, coeff in enumerate(QE[:deg_Q+1])]);
-    E = P.gen()**deg_E
-    E += sum([coeff * P.gen()**i for i, coeff in enumerate(QE[deg_Q+1:])]);
-    P = Q.quo_rem(E)[0]
-    return P
+    if context is None:
+        P = PolynomialRing(F, 'x')
+    else:
+        P = context._P
+    # divide Q by monic E, coefficients straight from the solution
+    Q = list(QE[:deg_Q+1])
+    E = list(QE[deg_Q+1:]) + [F.one()]
+    quotient, remainder = poly_divmod(Q, E, F)
+    if strict and any(remainder):
+        raise ValueError("too many erroneous shares.")
+    return P(quotient)
 
 # vim: set fileencoding=UTF-8 filetype=python :
@@ -0,0 +1,109 @@
+# coding: UTF-8
+r"""
+Bounded caches
+
+Implements a least recently used cache for precomputed values such as
+inverted Vandermonde matrices or Lagrange weights.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    r"""
+    Least recently used cache.
+
+    INPUT:
+
+    - ``maxsize`` -- (default: ``128``) maximum number of entries.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.cache import LRUCache
+        sage: cache = LRUCache(2)
+        sage: cache['a'] = 1; cache['b'] = 2
+        sage: cache['a']
+        1
+        sage: cache['c'] = 3
+        sage: 'b' in cache, 'a' in cache, len(cache)
+        (False, True, 2)
+        sage: cache.get('b', 0)
+        0
+
+    Caches are pickled without their lock::
+
+        sage: loads(dumps(cache))['a']
+        1
+    """
+    def __init__(self, maxsize=128):
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        with self._lock:
+            return {'_maxsize': self._maxsize, '_data': OrderedDict(self._data)}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data.pop(key)
+            self._data[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        r"""
+        Remove all entries.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def get(self, key, default=None):
+        r"""
+        Return cached value or ``default``.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
@@ -0,0 +1,428 @@
+# coding: UTF-8
+r"""
+Reed-Solomon code context
+
+Holds everything about a Reed-Solomon code of length `n` and dimension `k`
+which does not depend on the data: the field, the polynomial ring, powers of
+the evaluation points, generator and parity check matrices, Lagrange
+weights and inverse Vandermonde matrices. Contexts are kept in a bounded
+process-wide cache, hence instances of :class:`ShamirSS`, :class:`RabinIDS`
+and calls of :func:`berlekamp_welsh` with the same parameters share the
+precomputations.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+from sage.structure.sage_object import SageObject
+from sage.misc.lazy_import import lazy_import
+
+from cache import LRUCache
+
+lazy_import('sage.matrix.constructor', 'Matrix')
+lazy_import('sage.modules.free_module_element', 'vector')
+lazy_import('sage.rings.finite_rings.constructor', 'FiniteField')
+lazy_import('sage.rings.integer', 'Integer')
+lazy_import('sage.rings.polynomial.polynomial_ring_constructor', 'PolynomialRing')
+
+_contexts = LRUCache(64)  # process-wide code contexts
+TABLE_SIZE = 2**16  # maximum field order for conversion tables
+
+
+def code_context(n, k, order, points=None):
+    r"""
+    Return the shared code context.
+
+    INPUT:
+
+    - ``n`` -- the code length (number of shares).
+    - ``k`` -- the code dimension (threshold).
+    - ``order`` -- the field order.
+    - ``points`` -- (default: ``[1, ..., n]``) evaluation points as integer.
+
+    OUTPUT:
+
+    The cached :class:`CodeContext` for the parameters.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.code_context import code_context
+        sage: code_context(7, 3, 2**8) is code_context(7, 3, 2**8)
+        True
+        sage: code_context(7, 3, 2**8)
+        [7,3]-Reed-Solomon code context over Finite Field in a of size 2^8
+    """
+    if points is None:
+        points = range(1, n+1)
+    key = (n, k, order, tuple(points))
+    context = _contexts.get(key)
+    if context is None:
+        context = CodeContext(n, k, order, points)
+        _contexts[key] = context
+    return context
+
+
+class CodeContext(SageObject):
+    r"""
+    Precomputations of a Reed-Solomon code.
+
+    Use :func:`code_context` to obtain shared instances. Contexts are
+    pickled by their parameters and unpickled to the shared instance, the
+    precomputations are not pickled.
+
+    INPUT:
+
+    - ``n`` -- the code length (number of shares).
+    - ``k`` -- the code dimension (threshold).
+    - ``order`` -- the field order.
+    - ``points`` -- evaluation points as integer.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.code_context import CodeContext
+        sage: ctx = CodeContext(4, 2, 257, [1, 2, 3, 4])
+        sage: ctx.generator_matrix()
+        [1 1 1 1]
+        [1 2 3 4]
+        sage: ctx.generator_matrix() * ctx.parity_check_matrix().transpose() == 0
+        True
+        sage: loads(dumps(ctx)) is code_context(4, 2, 257, [1, 2, 3, 4])
+        True
+    """
+    def __init__(self, n, k, order, points):
+        r"""
+        Precomputations of a Reed-Solomon code.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import CodeContext
+            sage: CodeContext(7, 3, 2**8, [1, 2, 3])
+            Traceback (most recent call last):
+            ...
+            ValueError: number of points must match code length.
+        """
+        if len(points) != n:
+            raise ValueError("number of points must match code length.")
+        self._n = n
+        self._k = k
+        self._order = order
+
+        self._F = FiniteField(order, 'a')
+        if not self._F.is_prime_field() and not hasattr(self._F, 'fetch_int'):
+            raise TypeError("field order not supported")
+
+        self._P = PolynomialRing(self._F, 'x')
+
+        self._prime = self._F.is_prime_field()
+        self._table = None  # field elements by integer representation
+        self._index = None  # integer representation by field element
+
+        self._points = list(points)
+        self._X = [self._element(x) for x in self._points]
+        self._powers = {}  # powers of evaluation points
+        self._G = None  # generator matrix
+        self._H = None  # parity check matrix
+        self._weights = LRUCache(1024)  # Lagrange weights per index set and point
+        self._inverses = LRUCache(128)  # inverse Vandermonde per index set
+        self._systems = LRUCache(128)  # Berlekamp-Welsh scratch systems
+
+    ### begin module private api
+
+    def __reduce__(self):
+        r"""
+        Pickle by parameters, unpickling returns the shared context.
+        """
+        return code_context, (self._n, self._k, self._order, tuple(self._points))
+
+
+    def _element(self, x):
+        r"""
+        Convert integer representation to field element without checks.
+        """
+        if self._prime:
+            return self._F(x)
+        return self._F.fetch_int(x)
+
+
+    def _tables(self):
+        r"""
+        Build conversion tables of small extension fields.
+
+        OUTPUT:
+
+        ``True`` if tables are available.
+        """
+        if self._table is None and not self._prime and self._order <= TABLE_SIZE:
+            self._table = [self._F.fetch_int(i) for i in range(self._order)]
+            self._index = dict((e, i) for i, e in enumerate(self._table))
+        return self._table is not None
+
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import CodeContext
+            sage: CodeContext(4, 2, 257, [1, 2, 3, 4])
+            [4,2]-Reed-Solomon code context over Finite Field of size 257
+        """
+        return "[{},{}]-Reed-Solomon code context over {}".format(
+            self._n, self._k, self._F)
+
+    ### begin public api
+
+    def from_integers(self, xs):
+        r"""
+        Convert integer representations to field elements.
+
+        The range is checked once for the whole list, extension fields up
+        to ``TABLE_SIZE`` elements are converted by table lookup.
+
+        INPUT:
+
+        - ``xs`` -- list of integer representations.
+
+        OUTPUT:
+
+        List of field elements.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: code_context(7, 3, 2**8).from_integers([1, 2, 255])
+            [1, a, a^7 + a^6 + a^5 + a^4 + a^3 + a^2 + a + 1]
+            sage: code_context(7, 3, 2**8).from_integers([256])
+            Traceback (most recent call last):
+            ...
+            TypeError: secret must be within 0 and field order.
+        """
+        if not xs:
+            return []
+        if min(xs) < 0 or max(xs) >= self._order:
+            raise TypeError("secret must be within 0 and field order.")
+        if self._prime:
+            F = self._F
+            return [F(x) for x in xs]
+        if not self._tables():
+            fetch = self._F.fetch_int
+            return [fetch(x) for x in xs]
+        table = self._table
+        return [table[x] for x in xs]
+
+
+    def bw_system(self, xs, deg):
+        r"""
+        Return scratch system of the Berlekamp-Welsh decoder.
+
+        The rows hold the powers of the points for the coefficients of `Q`,
+        the columns of the error locator `E` depend on the y-values and are
+        zero. The decoder fills them in a copy.
+
+        INPUT:
+
+        - ``xs`` -- the x-coordinates (field elements).
+        - ``deg`` -- the degree of the polynomial.
+
+        OUTPUT:
+
+        Immutable square matrix.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: ctx = code_context(5, 2, 257)
+            sage: ctx.bw_system(ctx._X, 2).row(1)
+            (1, 2, 4, 8, 0)
+            sage: ctx.bw_system(ctx._X, 2) is ctx.bw_system(ctx._X, 2)
+            True
+        """
+        key = (tuple(xs), deg)
+        A = self._systems.get(key)
+        if A is None:
+            deg_E = (len(xs) - (deg + 1)) // 2
+            deg_Q = deg_E + deg
+            A = Matrix(self._F, deg_Q + 1 + deg_E)
+            zero = [self._F.zero()] * deg_E
+            for n, x in enumerate(xs):
+                A[n] = self.powers(x, deg_Q+1) + zero
+            A.set_immutable()
+            self._systems[key] = A
+        return A
+
+
+    def generator_matrix(self):
+        r"""
+        Return the generator matrix.
+
+        OUTPUT:
+
+        The `k \times n` Vandermonde matrix of the evaluation points.
+        """
+        if self._G is None:
+            self._G = Matrix(self._F, self._k, self._n,
+                             lambda i, j: self.powers(self._X[j], self._k)[i])
+        return self._G
+
+
+    def inverse_vandermonde(self, xs):
+        r"""
+        Return the inverse Vandermonde matrix of share indices.
+
+        INPUT:
+
+        - ``xs`` -- `k` share indices (x-coordinates as integer).
+
+        OUTPUT:
+
+        The `k \times k` matrix mapping the y-values at ``xs`` to the
+        polynomial coefficients.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: code_context(4, 2, 257).inverse_vandermonde((1, 2))
+            [  2 256]
+            [256   1]
+        """
+        xs = tuple(xs)
+        inverse = self._inverses.get(xs)
+        if inverse is None:
+            X = [self._element(x) for x in xs]
+            V = Matrix(self._F, self._k, len(X), lambda i, j: X[j]**i)
+            inverse = V.inverse()
+            self._inverses[xs] = inverse
+        return inverse
+
+
+    def lagrange_weights(self, xs, point=0):
+        r"""
+        Return Lagrange weights of share indices evaluated at a point.
+
+        INPUT:
+
+        - ``xs`` -- share indices (x-coordinates as integer).
+        - ``point`` -- (default: ``0``) integer representation of the point.
+
+        OUTPUT:
+
+        Vector of weights `\lambda_i` with `f(point) = \sum_i \lambda_i f(x_i)`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: code_context(7, 3, 257).lagrange_weights([1, 2, 3])
+            (3, 254, 1)
+        """
+        key = (tuple(xs), point)
+        weights = self._weights.get(key)
+        if weights is not None:
+            return weights
+
+        X = [self._element(x) for x in xs]
+        p = self._element(point)
+        weights = []
+        for i, xi in enumerate(X):
+            l = self._F.one()
+            for j, xj in enumerate(X):
+                if i != j:
+                    l *= (p - xj) / (xi - xj)
+            weights.append(l)
+        weights = vector(self._F, weights)
+        self._weights[key] = weights
+        return weights
+
+
+    def parity_check_matrix(self):
+        r"""
+        Return the parity check matrix.
+
+        OUTPUT:
+
+        The `(n-k) \times n` matrix `H` with `G H^T = 0`.
+        """
+        if self._H is None:
+            self._H = self.generator_matrix().right_kernel_matrix()
+        return self._H
+
+
+    def to_integers(self, elements):
+        r"""
+        Convert field elements to integer representations.
+
+        INPUT:
+
+        - ``elements`` -- list of field elements.
+
+        OUTPUT:
+
+        List of integer representations.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: ctx = code_context(7, 3, 2**8)
+            sage: ctx.to_integers(ctx.from_integers([0, 42, 255]))
+            [0, 42, 255]
+        """
+        if self._prime:
+            return [Integer(e) for e in elements]
+        if not self._tables():
+            return [e.integer_representation() for e in elements]
+        index = self._index
+        return [index[e] for e in elements]
+
+
+    def powers(self, x, count):
+        r"""
+        Return powers of a field element.
+
+        Powers of the evaluation points are cached, e.g. for the rows of
+        the Berlekamp-Welsh system.
+
+        INPUT:
+
+        - ``x`` -- the field element.
+        - ``count`` -- number of powers.
+
+        OUTPUT:
+
+        List `[1, x, ..., x^{count-1}]`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.code_context import code_context
+            sage: ctx = code_context(4, 2, 257)
+            sage: ctx.powers(ctx._X[1], 4)
+            [1, 2, 4, 8]
+        """
+        row = self._powers.get(x)
+        if row is None or len(row) < count:
+            row = [self._F.one()]
+            for i in range(1, max(count, self._n)):
+                row.append(row[-1] * x)
+            if x in self._X:
+                self._powers[x] = row
+        return row[:count]
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
@@ -0,0 +1,513 @@
+# coding: UTF-8
+r"""
+Quorum dispersal
+
+Stores the shares of :class:`ShamirSS` or :class:`RabinIDS` on `n` storage
+backends concurrently and reconstructs from the `k` backends answering
+first. Backends are pluggable, every backend keeps its own pool of
+connections and the number of concurrent requests is bounded by a thread
+pool.
+
+Each backend stores the column of one share holder, i.e. the share index
+together with the y-values of all share-sets, in a simple binary format::
+
+    x (uint32) | length (uint64) | y_0 | y_1 | ...
+
+where the length is the size of the shared object in bytes and the
+y-values are big endian integers of fixed width. A list of secrets counts
+:func:`share_width` bytes per secret.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import os
+import re
+import struct
+import binascii
+import tempfile
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from sage.structure.sage_object import SageObject
+
+HEADER = struct.Struct('>IQ')  # share index, size of shared object in bytes
+
+
+###
+# share format
+#
+def share_width(order):
+    r"""
+    Return number of bytes needed for a field element.
+
+    INPUT:
+
+    - ``order`` -- the field order.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import share_width
+        sage: share_width(2**8), share_width(257), share_width(2**16)
+        (1, 2, 2)
+    """
+    return (int(order - 1).bit_length() + 7) // 8
+
+
+def symbol_width(order):
+    r"""
+    Return number of data bytes stored in a field element.
+
+    INPUT:
+
+    - ``order`` -- the field order.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import symbol_width
+        sage: symbol_width(2**8), symbol_width(257), symbol_width(2**16)
+        (1, 1, 2)
+    """
+    return (int(order).bit_length() - 1) // 8
+
+
+def to_symbols(data, width):
+    r"""
+    Split bytes into big endian integers of ``width`` bytes.
+
+    INPUT:
+
+    - ``data`` -- the bytes, a multiple of ``width``.
+    - ``width`` -- bytes per integer.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import to_symbols
+        sage: to_symbols(b'\x01\x02\x03\x04', 2)
+        [258, 772]
+    """
+    body = binascii.hexlify(data)
+    step = 2*width
+    return [int(body[i:i+step], 16) for i in range(0, len(body), step)]
+
+
+def from_symbols(symbols, width):
+    r"""
+    Join integers into bytes, ``width`` bytes big endian each.
+
+    INPUT:
+
+    - ``symbols`` -- list of integer.
+    - ``width`` -- bytes per integer.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import from_symbols
+        sage: from_symbols([258, 772], 2) == b'\x01\x02\x03\x04'
+        True
+    """
+    return binascii.unhexlify(''.join('%0*x' % (2*width, int(s)) for s in symbols))
+
+
+def pack_share(x, ys, width, length):
+    r"""
+    Pack column of share holder into bytes.
+
+    INPUT:
+
+    - ``x`` -- the share index.
+    - ``ys`` -- list of y-values as integer.
+    - ``width`` -- bytes per y-value (see :func:`share_width`).
+    - ``length`` -- size of the shared object in bytes (see :data:`HEADER`).
+
+    OUTPUT:
+
+    The packed share.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import pack_share, unpack_share
+        sage: payload = pack_share(3, [1, 2, 300], 2, 6)
+        sage: len(payload)
+        18
+        sage: unpack_share(payload, 2)
+        (3, [1, 2, 300], 6)
+    """
+    return HEADER.pack(x, length) + from_symbols(ys, width)
+
+
+def unpack_share(payload, width):
+    r"""
+    Unpack column of share holder from bytes.
+
+    INPUT:
+
+    - ``payload`` -- the packed share.
+    - ``width`` -- bytes per y-value (see :func:`share_width`).
+
+    OUTPUT:
+
+    Tuple of share index, list of y-values and size of the shared object in
+    bytes.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.dispersal import pack_share, unpack_share
+        sage: unpack_share(pack_share(1, [255, 0], 1, 7), 1)
+        (1, [255, 0], 7)
+    """
+    x, length = HEADER.unpack(payload[:HEADER.size])
+    return x, to_symbols(payload[HEADER.size:], width), length
+
+
+###
+# storage backends
+#
+class StorageBackend(object):
+    r"""
+    Base class of storage backends.
+
+    Subclasses implement :meth:`connect`, returning a connection object with
+    the methods ``put(key, payload)``, ``get(key)`` and ``close()``. Idle
+    connections are kept in a pool and reused, the number of open
+    connections is bounded by ``pool_size``.
+
+    INPUT:
+
+    - ``pool_size`` -- (default: ``4``) maximum number of open connections.
+    """
+    def __init__(self, pool_size=4):
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self.connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, conn, broken=False):
+        if broken:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        self._slots.release()
+
+    def _call(self, method, *args):
+        conn = self._acquire()
+        try:
+            result = getattr(conn, method)(*args)
+        except Exception:
+            self._release(conn, broken=True)
+            raise
+        self._release(conn)
+        return result
+
+    def close(self):
+        r"""
+        Close all idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def connect(self):
+        r"""
+        Open new connection.
+        """
+        raise NotImplementedError
+
+    def get(self, key):
+        r"""
+        Read payload stored under key.
+        """
+        return self._call('get', key)
+
+    def put(self, key, payload):
+        r"""
+        Store payload under key.
+        """
+        return self._call('put', key, payload)
+
+
+class LocalDirectoryBackend(StorageBackend):
+    r"""
+    Storage backend writing to a local directory.
+
+    INPUT:
+
+    - ``path`` -- the directory, created if missing.
+    - ``pool_size`` -- (default: ``4``) maximum number of open connections.
+
+    EXAMPLES::
+
+        sage: import tempfile
+        sage: from sage.crypto.smc.dispersal import LocalDirectoryBackend
+        sage: backend = LocalDirectoryBackend(tempfile.mkdtemp())
+        sage: backend.put('obj', b'payload')
+        sage: backend.get('obj') == b'payload'
+        True
+    """
+    def __init__(self, path, pool_size=4):
+        StorageBackend.__init__(self, pool_size)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._path = path
+
+    def connect(self):
+        return _LocalConnection(self._path)
+
+
+class _LocalConnection(object):
+    r"""
+    Connection of :class:`LocalDirectoryBackend`.
+    """
+    _key = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+    def __init__(self, path):
+        self._path = path
+
+    def _file(self, key):
+        if not self._key.match(key) or key.startswith('.'):
+            raise ValueError("invalid key.")
+        return os.path.join(self._path, key)
+
+    def close(self):
+        pass
+
+    def get(self, key):
+        with open(self._file(key), 'rb') as f:
+            return f.read()
+
+    def put(self, key, payload):
+        # write to temporary file first, readers never see partial shares
+        path = self._file(key)
+        fd, tmp = tempfile.mkstemp(prefix='.' + key, dir=self._path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.rename(tmp, path)
+        except Exception:
+            os.remove(tmp)
+            raise
+
+
+###
+# quorum store
+#
+class QuorumStore(SageObject):
+    r"""
+    Quorum dispersal of shares to storage backends.
+
+    The `n` shares are written to the `n` backends concurrently. Reads are
+    issued to all backends and reconstruction starts as soon as `k` of them
+    answered; requests not started by then are cancelled and late answers
+    are dropped.
+
+    INPUT:
+
+    - ``scheme`` -- a :class:`ShamirSS` or :class:`RabinIDS` instance.
+    - ``backends`` -- list of `n` :class:`StorageBackend`, backend `i` stores
+      the share with index `i+1`.
+    - ``workers`` -- (default: `n`) maximum number of concurrent requests.
+
+    EXAMPLES::
+
+        sage: import os, tempfile
+        sage: from sage.crypto.smc.rabin_ids import RabinIDS
+        sage: from sage.crypto.smc.dispersal import QuorumStore, LocalDirectoryBackend
+        sage: root = tempfile.mkdtemp()
+        sage: backends = [LocalDirectoryBackend(os.path.join(root, str(i))) for i in range(7)]
+        sage: store = QuorumStore(RabinIDS(7, 3), backends)
+        sage: data = list(range(30))
+        sage: store.put('obj', data)
+        7
+        sage: data == store.get('obj')
+        True
+
+    Missing backends are tolerated as long as `k` answer::
+
+        sage: for i in range(4): os.remove(os.path.join(root, str(i), 'obj'))
+        sage: data == store.get('obj')
+        True
+        sage: store.close()
+
+    Stores are context managers, closing on exit::
+
+        sage: with QuorumStore(RabinIDS(7, 3), backends) as store:
+        ....:     data == store.get('obj')
+        True
+    """
+    def __init__(self, scheme, backends, workers=None):
+        r"""
+        Quorum dispersal of shares to storage backends.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.dispersal import QuorumStore
+            sage: QuorumStore(ShamirSS(7, 3), [])
+            Traceback (most recent call last):
+            ...
+            ValueError: number of backends must match number of shares.
+        """
+        if len(backends) != scheme._n:
+            raise ValueError("number of backends must match number of shares.")
+        from multiprocessing.pool import ThreadPool
+        self._scheme = scheme
+        self._backends = backends
+        self._width = share_width(scheme._order)
+        self._pool = ThreadPool(workers or len(backends))
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.dispersal import QuorumStore, LocalDirectoryBackend
+            sage: with QuorumStore(ShamirSS(2, 1), [LocalDirectoryBackend('/tmp')] * 2) as store:
+            ....:     store
+            Quorum store for (2,1)-Shamir secret sharing over Finite Field in a of size 2^8
+        """
+        return "Quorum store for {}".format(self._scheme)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    ### begin public api
+
+    def close(self):
+        r"""
+        Shut down worker threads and close idle connections.
+        """
+        self._pool.close()
+        self._pool.join()
+        for backend in self._backends:
+            backend.close()
+
+    def get(self, key):
+        r"""
+        Reconstruct object from the fastest `k` backends.
+
+        INPUT:
+
+        - ``key`` -- the key of the object.
+
+        OUTPUT:
+
+        The reconstructed list of secrets.
+        """
+        k = self._scheme._k
+        done = threading.Event()
+        results = queue.Queue()
+
+        def read(i, backend):
+            if done.is_set():
+                results.put((i, None))
+                return
+            try:
+                results.put((i, backend.get(key)))
+            except Exception:
+                results.put((i, None))
+
+        for i, backend in enumerate(self._backends):
+            self._pool.apply_async(read, (i, backend))
+
+        columns = []
+        for answered in range(len(self._backends)):
+            i, payload = results.get()
+            if payload is None:
+                continue
+            x, ys, length = unpack_share(payload, self._width)
+            if x != i+1:
+                continue
+            columns.append((x, ys))
+            if len(columns) == k:
+                # cancel outstanding reads
+                done.set()
+                break
+        if len(columns) < k:
+            raise IOError("quorum not reached.")
+
+        shares = [[(x, ys[b]) for x, ys in columns] for b in range(len(columns[0][1]))]
+        if not shares:
+            return []
+        secret = self._scheme.reconstruct(shares)
+        # a single share-set reconstructs to a single secret
+        if not type(secret) == list:
+            secret = [secret]
+        return secret
+
+    def put(self, key, data):
+        r"""
+        Share object and store shares on all backends concurrently.
+
+        INPUT:
+
+        - ``key`` -- the key of the object.
+        - ``data`` -- the data or list of secrets to share, a single secret
+          must be given as list of length one.
+
+        OUTPUT:
+
+        Number of backends which stored their share.
+        """
+        if not type(data) == list:
+            raise TypeError("data must be a list.")
+        shares = self._scheme.share(data) if data else []
+        # a single secret is shared to a single share-set
+        if shares and type(shares[0]) == tuple:
+            shares = [shares]
+        length = len(data) * self._width
+
+        def write(i, backend):
+            ys = [element[i][1] for element in shares]
+            try:
+                backend.put(key, pack_share(i+1, ys, self._width, length))
+                return True
+            except Exception:
+                return False
+
+        jobs = [self._pool.apply_async(write, (i, backend))
+                for i, backend in enumerate(self._backends)]
+        stored = sum(1 for job in jobs if job.get())
+        if stored < self._scheme._k:
+            raise IOError("quorum not reached.")
+        return stored
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
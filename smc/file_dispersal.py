@@ -0,0 +1,343 @@
+# coding: UTF-8
+r"""
+File dispersal
+
+Disperses large files with :class:`RabinIDS` using a pool of processes.
+The input is split into stripes of whole blocks which are encoded and
+decoded independently. Workers read their stripe of the input through a
+memory map and write their part of every share file through a memory map
+as well, only file names and block ranges are passed between processes.
+Byte ranges are recovered by decoding only the blocks holding them.
+
+Every share file holds the column of one share holder in the format of
+:func:`pack_share`::
+
+    x (uint32) | length (uint64) | y_0 | y_1 | ...
+
+with the length of the file in bytes (see :data:`HEADER`). The format does not depend on the
+stripe size or the number of processes. The file is read with
+:func:`symbol_width` bytes per field element and zero padded to whole
+blocks.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import os
+import mmap
+import multiprocessing
+
+from rabin_ids import RabinIDS
+from dispersal import HEADER, share_width, symbol_width, to_symbols, from_symbols
+
+STRIPE = 2**16  # blocks per stripe
+
+
+###
+# private functions
+#
+def _read(path, start, stop):
+    r"""
+    Read window of file through a memory map.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return mm[start:stop]
+        finally:
+            mm.close()
+
+
+def _write(path, start, payload):
+    r"""
+    Write window of preallocated file through a memory map.
+    """
+    if not payload:
+        return
+    with open(path, 'r+b') as f:
+        mm = mmap.mmap(f.fileno(), 0)
+        try:
+            mm[start:start+len(payload)] = payload
+            mm.flush()
+        finally:
+            mm.close()
+
+
+def _blocks(length, k, order):
+    r"""
+    Return number of blocks of a file.
+    """
+    step = k * symbol_width(order)
+    return (length + step - 1) // step
+
+
+def _stripes(blocks, stripe):
+    r"""
+    Split blocks into stripes of first block and number of blocks.
+    """
+    return [(first, min(stripe, blocks - first))
+            for first in range(0, blocks, stripe)]
+
+
+def _run(worker, jobs, processes):
+    r"""
+    Run jobs in a pool of processes, in process for a single job.
+    """
+    if processes == 1 or len(jobs) < 2:
+        for job in jobs:
+            worker(job)
+        return
+    pool = multiprocessing.Pool(processes)
+    try:
+        pool.map(worker, jobs)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _encode_stripe(job):
+    r"""
+    Encode one stripe of the input into the share files.
+    """
+    path, share_paths, n, k, order, first, count = job
+    w_in, w_out = symbol_width(order), share_width(order)
+    start = first * k * w_in
+    stop = start + count * k * w_in
+    data = _read(path, start, stop)
+    data += b'\0' * (stop - start - len(data))
+
+    columns = RabinIDS(n, k, order).encode(to_symbols(data, w_in))
+    offset = HEADER.size + first * w_out
+    for share_path, (x, ys) in zip(share_paths, columns):
+        _write(share_path, offset, from_symbols(ys, w_out))
+
+
+def _decode_stripe(job):
+    r"""
+    Decode one stripe of the share files into the output.
+    """
+    share_paths, xs, path, n, k, order, length, first, count = job
+    w_in, w_out = symbol_width(order), share_width(order)
+    start = HEADER.size + first * w_out
+    stop = start + count * w_out
+    columns = [(x, to_symbols(_read(share_path, start, stop), w_out))
+               for x, share_path in zip(xs, share_paths)]
+
+    data = from_symbols(RabinIDS(n, k, order).decode(columns), w_in)
+    offset = first * k * w_in
+    _write(path, offset, data[:length - offset])
+
+
+def _read_at(source, start, size):
+    r"""
+    Read bytes at offset of a share file given by path or seekable file.
+    """
+    if hasattr(source, 'seek'):
+        source.seek(start)
+        return source.read(size)
+    with open(source, 'rb') as f:
+        f.seek(start)
+        return f.read(size)
+
+
+def _read_header(source):
+    r"""
+    Read share index and file length of a share file.
+    """
+    return HEADER.unpack(_read_at(source, 0, HEADER.size))
+
+
+###
+# public functions
+#
+def disperse_file(path, share_paths, n=7, k=3, order=2**8, stripe=STRIPE,
+                  processes=None):
+    r"""
+    Disperse file into share files.
+
+    INPUT:
+
+    - ``path`` -- the input file.
+    - ``share_paths`` -- list of `n` share files, written in the order of
+      the share indices `1, ..., n`.
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``order`` --  (default: ``2^8``) field order, at least `2^8`.
+    - ``stripe`` -- (default: ``STRIPE``) number of blocks per job.
+    - ``processes`` -- (default: number of cpus) number of processes.
+
+    EXAMPLES::
+
+        sage: import os, tempfile
+        sage: from sage.crypto.smc.file_dispersal import disperse_file, restore_file
+        sage: root = tempfile.mkdtemp()
+        sage: path = os.path.join(root, 'data')
+        sage: with open(path, 'wb') as f:
+        ....:     _ = f.write(os.urandom(10000))
+        sage: shares = [os.path.join(root, str(i)) for i in range(7)]
+        sage: disperse_file(path, shares, stripe=1000)
+        sage: restore_file(shares[4:], os.path.join(root, 'copy'))
+        sage: open(path, 'rb').read() == open(os.path.join(root, 'copy'), 'rb').read()
+        True
+    """
+    if order < 2**8:
+        raise TypeError("field order must be at least 2^8.")
+    if len(share_paths) != n:
+        raise ValueError("number of share files must match number of shares.")
+
+    length = os.path.getsize(path)
+    blocks = _blocks(length, k, order)
+
+    # preallocate share files
+    size = HEADER.size + blocks * share_width(order)
+    for i, share_path in enumerate(share_paths):
+        with open(share_path, 'wb') as f:
+            f.write(HEADER.pack(i+1, length))
+            f.truncate(size)
+
+    jobs = [(path, share_paths, n, k, order, first, count)
+            for first, count in _stripes(blocks, stripe)]
+    _run(_encode_stripe, jobs, processes)
+
+
+def restore_file(share_paths, path, n=7, k=3, order=2**8, stripe=STRIPE,
+                 processes=None):
+    r"""
+    Restore file from share files.
+
+    INPUT:
+
+    - ``share_paths`` -- list of at least `k` share files, the first `k`
+      must hold distinct share indices.
+    - ``path`` -- the output file.
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``order`` --  (default: ``2^8``) field order, at least `2^8`.
+    - ``stripe`` -- (default: ``STRIPE``) number of blocks per job.
+    - ``processes`` -- (default: number of cpus) number of processes.
+
+    EXAMPLES::
+
+        sage: import os, tempfile
+        sage: from sage.crypto.smc.file_dispersal import restore_file
+        sage: restore_file([], os.path.join(tempfile.mkdtemp(), 'copy'))
+        Traceback (most recent call last):
+        ...
+        ValueError: not enough shares.
+    """
+    if len(share_paths) < k:
+        raise ValueError("not enough shares.")
+    share_paths = share_paths[:k]
+    headers = [_read_header(share_path) for share_path in share_paths]
+    xs = [x for x, length in headers]
+    if len(set(xs)) != k:
+        raise ValueError("duplicate share indices.")
+    length = headers[0][1]
+    if any(l != length for x, l in headers):
+        raise ValueError("share files of different objects.")
+    blocks = _blocks(length, k, order)
+    size = HEADER.size + blocks * share_width(order)
+    if any(os.path.getsize(share_path) != size for share_path in share_paths):
+        raise ValueError("share file size does not match.")
+
+    # preallocate output
+    with open(path, 'wb') as f:
+        f.truncate(length)
+
+    jobs = [(share_paths, xs, path, n, k, order, length, first, count)
+            for first, count in _stripes(blocks, stripe)]
+    _run(_decode_stripe, jobs, processes)
+
+
+def recover_range(share_sources, offset, length, n=7, k=3, order=2**8):
+    r"""
+    Recover a byte range of a file from share files.
+
+    Only the blocks overlapping the range are read from `k` share files
+    and decoded, the cost depends on the size of the range and not on
+    the size of the file.
+
+    INPUT:
+
+    - ``share_sources`` -- list of at least `k` share files, given as paths
+      or seekable binary file objects, the first `k` must hold distinct
+      share indices.
+    - ``offset`` -- first byte of the range.
+    - ``length`` -- number of bytes, the range ends at the end of the file.
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``order`` --  (default: ``2^8``) field order, at least `2^8`.
+
+    OUTPUT:
+
+    The bytes of the file from ``offset`` on, at most ``length``.
+
+    EXAMPLES::
+
+        sage: import os, tempfile
+        sage: from sage.crypto.smc.file_dispersal import disperse_file, recover_range
+        sage: root = tempfile.mkdtemp()
+        sage: path = os.path.join(root, 'data')
+        sage: data = os.urandom(10000)
+        sage: with open(path, 'wb') as f:
+        ....:     _ = f.write(data)
+        sage: shares = [os.path.join(root, str(i)) for i in range(7)]
+        sage: disperse_file(path, shares)
+        sage: recover_range(shares[2:5], 4000, 96) == data[4000:4096]
+        True
+        sage: recover_range(shares[2:5], 9990, 96) == data[9990:]
+        True
+    """
+    if offset < 0 or length < 0:
+        raise ValueError("offset and length must not be negative.")
+    if len(share_sources) < k:
+        raise ValueError("not enough shares.")
+    share_sources = share_sources[:k]
+    headers = [_read_header(source) for source in share_sources]
+    xs = [x for x, size in headers]
+    if len(set(xs)) != k:
+        raise ValueError("duplicate share indices.")
+    size = headers[0][1]
+    if any(l != size for x, l in headers):
+        raise ValueError("share files of different objects.")
+    length = max(0, min(length, size - offset))
+    if not length:
+        return b''
+
+    # blocks overlapping the range
+    w_in, w_out = symbol_width(order), share_width(order)
+    step = k * w_in
+    first = offset // step
+    count = (offset + length - 1) // step - first + 1
+    start = HEADER.size + first * w_out
+    columns = []
+    for x, source in zip(xs, share_sources):
+        payload = _read_at(source, start, count * w_out)
+        if len(payload) != count * w_out:
+            raise ValueError("share file size does not match.")
+        columns.append((x, to_symbols(payload, w_out)))
+
+    data = from_symbols(RabinIDS(n, k, order).decode(columns), w_in)
+    skip = offset - first * step
+    return data[skip:skip+length]
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
@@ -0,0 +1,342 @@
+# coding: UTF-8
+r"""
+Incremental reconstruction
+
+Implements reconstruction for Shamir secret sharing and Rabin information
+dispersal which consumes shares one at a time. The interpolation polynomial
+is kept in Newton form, hence every share updates the state with `O(k)`
+field operations and decoding finishes as soon as enough consistent shares
+arrived, not when the slowest share arrived.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+from sage.structure.sage_object import SageObject
+from sage.misc.lazy_import import lazy_import
+
+from berlekamp_welsh import berlekamp_welsh
+from rabin_ids import RabinIDS
+
+lazy_import('sage.modules.free_module_element', 'vector')
+
+
+class IncrementalDecoder(SageObject):
+    r"""
+    Incremental decoder for shares arriving one at a time.
+
+    A share is a tuple ``(x, y)`` holding the share index and either a single
+    y-value or a list of y-values, one per share-set (the column of a single
+    share holder). Without error correction decoding is done after `k`
+    shares. With up to `e` errors it is done as soon as `k+e` shares lie on
+    one polynomial of degree `k-1`, or after `k+2e` shares with
+    Berlekamp-Welsh decoding otherwise.
+
+    INPUT:
+
+    - ``scheme`` -- a :class:`ShamirSS` or :class:`RabinIDS` instance.
+    - ``errors`` -- (default: ``0``) number of erroneous shares to correct.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.shamir_ss import ShamirSS
+        sage: from sage.crypto.smc.incremental import IncrementalDecoder
+
+    Feed shares one at a time::
+
+        sage: sss = ShamirSS(7, 3)
+        sage: shares = sss.share(42)
+        sage: dec = IncrementalDecoder(sss)
+        sage: [dec.add(share) for share in shares[:3]]
+        [False, False, True]
+        sage: dec.result()
+        42
+
+    Consume an iterator only as far as needed::
+
+        sage: it = iter(shares)
+        sage: IncrementalDecoder(sss).feed(it)
+        42
+        sage: len(list(it))
+        4
+
+    Correct errors::
+
+        sage: shares[0] = (shares[0][0], shares[0][1]+1)
+        sage: IncrementalDecoder(sss, errors=1).feed(shares)
+        42
+
+    Columns of share holders::
+
+        sage: from sage.crypto.smc.rabin_ids import RabinIDS
+        sage: ids = RabinIDS(7, 3)
+        sage: data = list(range(12))
+        sage: shares = ids.share(data)
+        sage: columns = [(i+1, [block[i][1] for block in shares]) for i in range(7)]
+        sage: data == IncrementalDecoder(ids).feed(reversed(columns))
+        True
+    """
+    def __init__(self, scheme, errors=0):
+        r"""
+        Incremental decoder for shares arriving one at a time.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: dec = IncrementalDecoder(ShamirSS(), errors=2)
+            sage: dec.needed()
+            5
+        """
+        self._scheme = scheme
+        self._k = scheme._k
+        self._e = errors
+        self._scalar = None  # single y-value per share
+        self._points = []  # received points as field elements
+        self._newton = []  # Newton coefficients (vectors)
+        self._consistent = True  # all points lie on the Newton polynomial
+        self._coeffs = None  # decoded coefficients in monomial basis
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: IncrementalDecoder(ShamirSS())
+            Incremental decoder with 0 of 3 shares
+        """
+        return "Incremental decoder with {} of {} shares".format(
+            len(self._points), self.needed())
+
+
+    def _newton_step(self, x, y):
+        r"""
+        Update Newton form with new point.
+
+        The Newton polynomial through the previous points is evaluated at
+        ``x`` with Horner's rule, which gives the next divided difference
+        in `O(k)` operations.
+
+        INPUT:
+
+        - ``x`` -- share index as field element.
+        - ``y`` -- y-values as vector.
+
+        OUTPUT:
+
+        The new Newton coefficient (zero if the point lies on the
+        current polynomial).
+        """
+        acc = y.parent().zero()
+        prod = self._scheme._F.one()
+        for j in reversed(range(len(self._newton))):
+            xj = self._points[j][0]
+            acc = self._newton[j] + (x - xj) * acc
+            prod *= x - xj
+        return (y - acc) / prod
+
+
+    def _to_monomial(self):
+        r"""
+        Convert Newton form to monomial basis.
+
+        OUTPUT:
+
+        List of `k` coefficient vectors, starting with the constant one.
+        """
+        k = self._k
+        poly = [self._newton[k-1]]
+        for j in reversed(range(k-1)):
+            xj = self._points[j][0]
+            shifted = [self._newton[j] - xj * poly[0]]
+            for i in range(1, len(poly)):
+                shifted.append(poly[i-1] - xj * poly[i])
+            shifted.append(poly[-1])
+            poly = shifted
+        return poly
+
+
+    def _berlekamp_welsh(self):
+        r"""
+        Decode all received points with Berlekamp-Welsh.
+
+        OUTPUT:
+
+        List of `k` coefficient vectors, starting with the constant one.
+        """
+        F = self._scheme._F
+        columns = []
+        for b in range(len(self._points[0][1])):
+            points = [(x, y[b]) for x, y in self._points]
+            poly = berlekamp_welsh(self._k-1, points)
+            if sum(1 for x, y in points if poly(x) != y) > self._e:
+                raise ValueError("too many erroneous shares.")
+            coeffs = poly.list()
+            columns.append(coeffs + [F.zero()] * (self._k - len(coeffs)))
+        return [vector(F, [c[i] for c in columns]) for i in range(self._k)]
+
+    ### begin public api
+
+    def add(self, share):
+        r"""
+        Add share.
+
+        INPUT:
+
+        - ``share`` -- share as ``(x, y)``-tuple with integer or list of integer y.
+
+        OUTPUT:
+
+        ``True`` if decoding is done.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: sss = ShamirSS()
+            sage: dec = IncrementalDecoder(sss)
+            sage: dec.add((1, 42))
+            False
+            sage: dec.add((1, 42))
+            Traceback (most recent call last):
+            ...
+            ValueError: duplicate share index.
+        """
+        if self.done():
+            return True
+
+        x, y = share
+        if self._scalar is None:
+            self._scalar = not type(y) == list
+        if self._scalar:
+            y = [y]
+        x = self._scheme._to_GF(x)
+        y = vector(self._scheme._F, self._scheme._to_GF_list(y))
+        if self._points and len(y) != len(self._points[0][1]):
+            raise ValueError("shares must hold the same number of y-values.")
+        if x in [p[0] for p in self._points]:
+            raise ValueError("duplicate share index.")
+
+        if len(self._newton) < self._k:
+            # interpolation phase
+            self._newton.append(self._newton_step(x, y))
+        elif self._consistent and self._newton_step(x, y) != 0:
+            # point does not lie on polynomial of degree k-1
+            self._consistent = False
+        self._points.append((x, y))
+
+        if self._consistent and len(self._points) == self._k + self._e:
+            self._coeffs = self._to_monomial()
+        elif len(self._points) == self._k + 2*self._e:
+            self._coeffs = self._berlekamp_welsh()
+        return self.done()
+
+
+    def done(self):
+        r"""
+        Return if decoding is done.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: sss = ShamirSS()
+            sage: dec = IncrementalDecoder(sss)
+            sage: dec.done()
+            False
+        """
+        return self._coeffs is not None
+
+
+    def feed(self, shares):
+        r"""
+        Consume shares until decoding is done.
+
+        Shares are taken from any iterable, e.g. a generator reading from a
+        queue filled by concurrent network requests. No more shares are taken
+        than needed.
+
+        INPUT:
+
+        - ``shares`` -- iterable of shares.
+
+        OUTPUT:
+
+        The reconstructed secret or data (see :meth:`result`).
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: sss = ShamirSS()
+            sage: IncrementalDecoder(sss).feed(sss.share(42)[:2])
+            Traceback (most recent call last):
+            ...
+            ValueError: not enough shares.
+        """
+        for share in shares:
+            if self.add(share):
+                break
+        return self.result()
+
+
+    def needed(self):
+        r"""
+        Return number of shares needed in the worst case.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: from sage.crypto.smc.incremental import IncrementalDecoder
+            sage: IncrementalDecoder(ShamirSS(7, 3), errors=1).needed()
+            5
+        """
+        return self._k + 2*self._e
+
+
+    def result(self):
+        r"""
+        Return reconstructed secret or data.
+
+        OUTPUT:
+
+        For :class:`ShamirSS` the secret, or list of secrets if the shares
+        hold lists of y-values. For :class:`RabinIDS` the data.
+        """
+        if not self.done():
+            raise ValueError("not enough shares.")
+
+        to_Int = self._scheme._to_Int_list
+        if isinstance(self._scheme, RabinIDS):
+            return to_Int([c[b] for b in range(len(self._coeffs[0]))
+                                for c in self._coeffs])
+        secret = to_Int(list(self._coeffs[0]))
+        if self._scalar:
+            secret = secret[0]
+        return secret
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
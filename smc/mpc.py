@@ -0,0 +1,226 @@
+# coding: UTF-8
+r"""
+Multiparty computation
+
+Implements an in-process simulation of the multiparty computation protocol
+of Ben-Or, Goldwasser and Wigderson [BGW1988]_ on top of
+:class:`ShamirSS`. Addition of shared values is local, multiplication
+computes the local products of the shares, which lie on a polynomial of
+degree `2(k-1)`, followed by a degree reduction: every party reshares its
+product share with degree `k-1` and the sub-shares are combined with the
+recombination vector, i.e. the Lagrange weights of `2k-1` parties at zero.
+Every party evaluates its own sub-sharing and the receiving parties
+recombine the sub-shares, so no product is formed in the clear, see
+:meth:`ShamirSS.reshare`.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+REFERENCES:
+
+.. [BGW1988] Ben-Or, M., Goldwasser, S., Wigderson, A. (1988). Completeness
+   theorems for non-cryptographic fault-tolerant distributed computation.
+   Proceedings of the 20th Annual ACM Symposium on Theory of Computing, 1-10.
+   :doi:`10.1145/62212.62213`
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+from sage.structure.sage_object import SageObject
+
+from shamir_ss import ShamirSS
+
+
+class BGWSimulation(SageObject):
+    r"""
+    Simulation of the BGW protocol with `n` parties.
+
+    Shared values are lists of share-sets as returned by
+    :meth:`ShamirSS.share`, holding the shares of all `n` parties.
+
+    INPUT:
+
+    - ``n``  --  (default: ``7``) the number of parties.
+    - ``k``  --  (default: ``3``) the threshold, `n \geq 2k-1`.
+    - ``order`` --  (default: ``2^8``) field order.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.mpc import BGWSimulation
+        sage: mpc = BGWSimulation(7, 3, 257)
+
+    Multiply vectors of shared values::
+
+        sage: a = mpc.share([2, 3, 4])
+        sage: b = mpc.share([5, 6, 7])
+        sage: c = mpc.multiply(a, b)
+        sage: mpc.open(c)
+        [10, 18, 28]
+
+    Products are sharings of degree `k-1` again::
+
+        sage: mpc.open(mpc.multiply(c, mpc.add(a, b)))
+        [70, 162, 51]
+    """
+    def __init__(self, n=7, k=3, order=2**8):
+        r"""
+        Simulation of the BGW protocol with `n` parties.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: BGWSimulation(4, 3)
+            Traceback (most recent call last):
+            ...
+            ValueError: multiplication needs at least 2k-1 parties.
+        """
+        if n < 2*k - 1:
+            raise ValueError("multiplication needs at least 2k-1 parties.")
+        self._n = n
+        self._k = k
+        self._sss = ShamirSS(n, k, order)
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: BGWSimulation()
+            BGW simulation with 7 parties and threshold 3 over Finite Field in a of size 2^8
+        """
+        return "BGW simulation with {} parties and threshold {} over {}".format(
+            self._n, self._k, self._sss._F)
+
+
+    def _matrix(self, shares):
+        r"""
+        Convert shared values of all parties to field matrix.
+        """
+        xs, Y = self._sss._to_matrix(shares)
+        if xs != list(range(1, self._n+1)):
+            raise ValueError("shares of all parties required.")
+        return Y
+
+    ### begin public api
+
+    def add(self, a, b):
+        r"""
+        Add shared values (local operation).
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: mpc = BGWSimulation()
+            sage: mpc.open(mpc.add(mpc.share([1, 2]), mpc.share([3, 4])))
+            [2, 6]
+        """
+        return self._sss.add(a, b)
+
+
+    def multiply(self, a, b):
+        r"""
+        Multiply shared values.
+
+        The parties multiply their shares locally and reduce the degree of
+        the products by resharing them. The first `2k-1` parties reshare,
+        their sub-shares are combined with the cached recombination vector.
+
+        INPUT:
+
+        - ``a``, ``b`` -- shared values (share-sets of all parties).
+
+        OUTPUT:
+
+        Sharings of the products with threshold `k`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: mpc = BGWSimulation(5, 3, 2**31-1)
+            sage: mpc.open(mpc.multiply(mpc.share(12345), mpc.share(6789)))
+            83810205
+        """
+        single = type(a[0]) == tuple
+        if single:
+            a, b = [a], [b]
+        if len(a) != len(b):
+            raise ValueError("number of shared values must match.")
+
+        # local products of degree 2(k-1)
+        Y = self._matrix(a).elementwise_product(self._matrix(b))
+
+        # degree reduction, every one of 2k-1 parties reshares its products
+        # and the receiving parties recombine the evaluated sub-shares
+        t = 2*self._k - 1
+        Z = self._sss._reshare(range(1, t+1), Y.matrix_from_columns(range(t)),
+                               self._n, self._k)
+        shares = self._sss._from_matrix(range(1, self._n+1), Z)
+        if single:
+            shares = shares[0]
+        return shares
+
+
+    def open(self, shares):
+        r"""
+        Reconstruct shared values.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: mpc = BGWSimulation()
+            sage: mpc.open(mpc.share(42))
+            42
+        """
+        return self._sss.reconstruct(shares)
+
+
+    def recombination_vector(self):
+        r"""
+        Return the recombination vector of the degree reduction.
+
+        OUTPUT:
+
+        The Lagrange weights at zero of the parties `1, ..., 2k-1`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: BGWSimulation(5, 2, 257).recombination_vector()
+            (3, 254, 1)
+        """
+        return self._sss._lagrange_weights(range(1, 2*self._k))
+
+
+    def share(self, secret):
+        r"""
+        Share values among the parties.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.mpc import BGWSimulation
+            sage: len(BGWSimulation().share([1, 2, 3]))
+            3
+        """
+        return self._sss.share(secret)
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
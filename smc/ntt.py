@@ -2,7 +2,12 @@
 r"""
 Number theoretic transform
 
-Implements a finite field (Fast) Fourier Transform. 
+Implements a finite field (Fast) Fourier Transform. The fast transform is
+an iterative radix-2 transform with cached twiddle plans, on top of it
+polynomials are multiplied, divided and vectors convolved in quasi-linear
+time. Pruned transforms compute only the needed outputs from only the
+nonzero inputs. Binary extension fields have an additive FFT over
+`\mathbb{F}_2`-linear subspaces of any power of two size.
 
 AUTHORS:
 
@@ -26,15 +31,25 @@ AUTHORS:
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 
-from sage import *
-from sage.matrix.constructor import Matrix
-from sage.misc.functional import is_odd
+import time
+
+from sage.misc.lazy_import import lazy_import
+
+from cache import LRUCache
+
+lazy_import('sage.matrix.constructor', 'Matrix')
+lazy_import('sage.rings.infinity', 'Infinity')
+
+_plans = LRUCache(64)  # twiddle plans by field, length and root of unity
+_crossovers = LRUCache(64)  # measured crossover by field, see tuned_crossover
 
 ###
 # public interface to ntt
 #
 def ntt(a, F, implementation='fast'):
     n = len(a)
+    if implementation == 'additive':
+        return additive_fft(a, F)
     g = F.gen()
     w = F.one().nth_root(n)
     assert w != F.one(), "No nth root!"
@@ -46,13 +61,22 @@ def ntt(a, F, implementation='fast'):
     elif implementation == 'textbook':
         ntt_impl = _fntt_textbook
     elif implementation == 'fast':
-        ntt_impl = _fntt_textbook # FIXME: Efficient implementation is missing
+        if n & (n-1):
+            return _fntt_textbook(a, w)
+        k = n
+        while k and not a[k-1]:
+            k -= 1
+        if 2*k <= n:
+            return _pruned(a[:k], F, n, n, w)
+        return _fntt(a, _plan(F, n, w))
 
     return ntt_impl(a, w)
 
 
 def intt(a, F, implementation='fast'):
     n = len(a)
+    if implementation == 'additive':
+        return additive_ifft(a, F)
     g = F.gen()
     w = F.one().nth_root(n)
     assert w != F.one(), "No nth root!"
@@ -64,18 +88,644 @@ def intt(a, F, implementation='fast'):
     elif implementation == 'textbook':
         intt_impl = _ifntt_textbook
     elif implementation == 'fast':
-        intt_impl = _ifntt_textbook # FIXME: Efficient implementation is missin
+        if n & (n-1):
+            return _ifntt_textbook(a, w)
+        return _fntt(a, _plan(F, n, w), inverse=True)
 
     return intt_impl(a, w)
 
+
+def ntt_pruned(a, F, n=None, outputs=None, w=None):
+    r"""
+    Transform of length `n` of a short input, computing only the first
+    outputs.
+
+    The input is zero padded to length `n`, a power of two dividing
+    `|F| - 1`. Transforms of `k` inputs are split into `n/K` transforms
+    of length `K \geq k` on the cosets of the `K`-th roots of unity (input
+    pruning), transforms to `m` outputs into `n/M` transforms of length
+    `M \geq m` of the decimated input (output pruning), whichever needs
+    fewer operations. E.g. evaluating a polynomial with `k` coefficients
+    at all `n`-th roots of unity costs `O(n \log k)`.
+
+    INPUT:
+
+    - ``a`` -- list of at most `n` elements in ``F``.
+    - ``F`` -- the finite field.
+    - ``n`` -- (default: ``len(a)``) the transform length.
+    - ``outputs`` -- (default: `n`) number of outputs.
+    - ``w`` -- (default: as :func:`ntt`) primitive `n`-th root of unity.
+
+    OUTPUT:
+
+    The first ``outputs`` values of ``ntt(a + [0]*(n - len(a)), F)``.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import ntt, ntt_pruned
+        sage: F = GF(257)
+        sage: a = [F(1), F(2), F(3)]
+        sage: ntt_pruned(a, F, 16) == ntt(a + [F(0)]*13, F)
+        True
+        sage: ntt_pruned(a, F, 16, 2) == ntt(a + [F(0)]*13, F)[:2]
+        True
+    """
+    return _pruned(a, F, n, outputs, w)
+
+
+def intt_pruned(a, F, n=None, outputs=None, w=None):
+    r"""
+    Inverse transform of length `n` of a short input, computing only the
+    first outputs.
+
+    See :func:`ntt_pruned`. E.g. the `k` coefficients of a polynomial of
+    degree less than `k` are interpolated from its values at all `n`-th
+    roots of unity in `O(n \log k)`.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import ntt_pruned, intt_pruned
+        sage: F = GF(257)
+        sage: intt_pruned(ntt_pruned([F(1), F(2), F(3)], F, 16), F, outputs=3)
+        [1, 2, 3]
+    """
+    return _pruned(a, F, n, outputs, w, inverse=True)
+
+
+def additive_fft(a, F, n=None):
+    r"""
+    Additive FFT over a binary extension field.
+
+    Evaluates the polynomial with coefficients ``a`` at the `n` points of
+    the `\mathbb{F}_2`-linear subspace spanned by `1, a, ..., a^{m-1}`,
+    `n = 2^m`, with the algorithm of Gao and Mateer [GM2010]_. Point `i`
+    is the field element with integer representation `i`, i.e.
+    ``F.fetch_int(i)``, so the lengths are not restricted to divisors of
+    `|F| - 1`. Every recursion step twists the polynomial, expands it at
+    `x^2 + x` and evaluates both halves on the image subspace, the cost is
+    `O(n \log^2 n)` additions and `O(n \log n)` multiplications.
+
+    INPUT:
+
+    - ``a`` -- list of at most `n` elements in ``F``.
+    - ``F`` -- finite field of characteristic two.
+    - ``n`` -- (default: ``len(a)``) number of points, a power of two not
+      larger than `|F|`.
+
+    OUTPUT:
+
+    List of the values at the points `0, ..., n-1`.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import additive_fft
+        sage: F = GF(2**8, 'a')
+        sage: a = [F.fetch_int(i) for i in [3, 1, 4, 1, 5]]
+        sage: P = PolynomialRing(F, 'x')
+        sage: additive_fft(a, F, 8) == [P(a)(F.fetch_int(i)) for i in range(8)]
+        True
+
+    REFERENCES:
+
+    .. [GM2010] Gao, S., Mateer, T. (2010). Additive fast Fourier transforms
+       over finite fields. IEEE Transactions on Information Theory, 56(12),
+       6265-6272. :doi:`10.1109/TIT.2010.2079016`
+    """
+    if n is None:
+        n = len(a)
+    plan = _additive_plan(F, n)
+    if len(a) > n:
+        raise ValueError("more coefficients than points.")
+    return _afft(list(a) + [F.zero()] * (n - len(a)), plan)
+
+
+def additive_ifft(a, F):
+    r"""
+    Inverse of :func:`additive_fft`.
+
+    INPUT:
+
+    - ``a`` -- list of the values at the points `0, ..., n-1`, `n` a power
+      of two not larger than `|F|`.
+    - ``F`` -- finite field of characteristic two.
+
+    OUTPUT:
+
+    The `n` coefficients of the interpolating polynomial.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import additive_fft, additive_ifft
+        sage: F = GF(2**16, 'a')
+        sage: a = [F.random_element() for i in range(16)]
+        sage: additive_ifft(additive_fft(a, F), F) == a
+        True
+    """
+    return _iafft(list(a), _additive_plan(F, len(a)))
+
+
+def poly_mul(a, b, F, crossover=None):
+    r"""
+    Multiply polynomials given as coefficient lists.
+
+    The product is computed with the fast transform of the smallest power
+    of two length dividing `|F| - 1` that holds the product. Operands
+    shorter than ``crossover`` and fields without a suitable length, e.g.
+    `GF(2^8)`, use schoolbook multiplication.
+
+    INPUT:
+
+    - ``a``, ``b`` -- lists of coefficients in ``F``, lowest degree first.
+    - ``F`` -- the finite field.
+    - ``crossover`` -- (default: ``None``) minimum operand length for the
+      transform, ``None`` uses :func:`tuned_crossover` of ``F``.
+
+    OUTPUT:
+
+    List of the ``len(a) + len(b) - 1`` coefficients of the product.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import poly_mul
+        sage: F = GF(257)
+        sage: poly_mul([F(1), F(2)], [F(3), F(4), F(5)], F)
+        [3, 10, 13, 10]
+        sage: poly_mul([F(1), F(2)], [F(3), F(4), F(5)], F, crossover=0)
+        [3, 10, 13, 10]
+    """
+    return convolve_batch([a], b, F, crossover)[0]
+
+
+def convolve_batch(vectors, kernel, F, crossover=None):
+    r"""
+    Convolve vectors with a common kernel.
+
+    All vectors share one transform length and twiddle plan, the kernel is
+    transformed once.
+
+    INPUT:
+
+    - ``vectors`` -- list of lists of elements in ``F``.
+    - ``kernel`` -- list of elements in ``F``.
+    - ``F`` -- the finite field.
+    - ``crossover`` -- (default: ``None``) minimum operand length for the
+      transform, ``None`` uses :func:`tuned_crossover` of ``F``.
+
+    OUTPUT:
+
+    List of the linear convolutions of the vectors with the kernel.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import convolve_batch
+        sage: F = GF(7340033)
+        sage: convolve_batch([[F(1), F(1)], [F(2)]], [F(1), F(-1)], F, crossover=0)
+        [[1, 0, 7340032], [2, 7340031]]
+    """
+    if not kernel or not vectors:
+        return [[] for v in vectors]
+    if crossover is None:
+        crossover = tuned_crossover(F)
+    size = max(len(v) for v in vectors) + len(kernel) - 1
+    N = _length(F, size)
+    if N is None or min(len(kernel), max(len(v) for v in vectors)) < crossover:
+        return [_schoolbook(v, kernel, F) for v in vectors]
+
+    plan = _plan(F, N)
+    zero = F.zero()
+    K = _fntt(list(kernel) + [zero] * (N - len(kernel)), plan)
+    result = []
+    for v in vectors:
+        if not v:
+            result.append([])
+            continue
+        V = _fntt(list(v) + [zero] * (N - len(v)), plan)
+        c = _fntt([x*y for x, y in zip(V, K)], plan, inverse=True)
+        result.append(c[:len(v) + len(kernel) - 1])
+    return result
+
+
+def poly_divmod(a, b, F, crossover=None):
+    r"""
+    Divide polynomials given as coefficient lists.
+
+    The quotient is the reversed product of the reversed dividend and the
+    inverse power series of the reversed divisor, computed by Newton
+    iteration with :func:`poly_mul`. Short quotients use long division.
+
+    INPUT:
+
+    - ``a``, ``b`` -- lists of coefficients in ``F``, lowest degree first.
+    - ``F`` -- the finite field.
+    - ``crossover`` -- (default: ``None``) minimum quotient length for
+      Newton iteration, ``None`` uses :func:`tuned_crossover` of ``F``.
+
+    OUTPUT:
+
+    Tuple of the coefficient lists of quotient and remainder, the remainder
+    has ``len(b) - 1`` coefficients.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import poly_divmod
+        sage: F = GF(257)
+        sage: poly_divmod([F(3), F(10), F(13), F(11)], [F(1), F(2)], F)
+        ([228, 68, 134], [32])
+        sage: poly_divmod([F(3), F(10), F(13), F(10)], [F(1), F(2)], F, crossover=0)
+        ([3, 4, 5], [0])
+    """
+    b = list(b)
+    while b and not b[-1]:
+        b.pop()
+    if not b:
+        raise ZeroDivisionError("division by zero polynomial.")
+    a = list(a)
+    d = len(b) - 1
+    l = len(a) - d  # length of quotient
+    if l <= 0:
+        return [], a + [F.zero()] * (d - len(a))
+    if crossover is None:
+        crossover = tuned_crossover(F)
+    if l < crossover:
+        q, r = _long_division(a, b, F)
+        return q, r
+
+    # quotient from reversed polynomials
+    g = _inverse_series(b[::-1], l, F, crossover)
+    q = poly_mul(a[::-1][:l], g, F, crossover)[:l][::-1]
+    r = [x - y for x, y in zip(a[:d], poly_mul(b, q, F, crossover))]
+    return q, r
+
+
+def tuned_crossover(F):
+    r"""
+    Return the crossover of :func:`poly_mul` over ``F``.
+
+    The crossover is measured with :func:`measure_crossover` on first use
+    and cached per field. Fields where the transform is never faster get
+    ``Infinity``, i.e. always use the schoolbook method.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import tuned_crossover
+        sage: tuned_crossover(GF(2**8))
+        +Infinity
+        sage: tuned_crossover(GF(7340033)) in [2**i for i in range(1, 8)] + [Infinity]
+        True
+    """
+    crossover = _crossovers.get(F)
+    if crossover is None:
+        crossover = measure_crossover(F)
+        if crossover is None:
+            crossover = Infinity
+        _crossovers[F] = crossover
+    return crossover
+
+
+def measure_crossover(F, max_bits=7, repeat=3):
+    r"""
+    Measure the crossover of :func:`poly_mul` over ``F``.
+
+    Operands of power of two lengths are multiplied with the transform and
+    with the schoolbook method, the best of ``repeat`` runs counts.
+
+    INPUT:
+
+    - ``F`` -- the finite field.
+    - ``max_bits`` -- (default: 7) largest operand length is ``2^max_bits``.
+    - ``repeat`` -- (default: 3) number of timed runs per method and length.
+
+    OUTPUT:
+
+    Shortest operand length for which the transform is faster, ``None`` if
+    it never is up to ``2^max_bits`` or ``F`` has no suitable transform
+    length.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ntt import measure_crossover
+        sage: measure_crossover(GF(2**8)) is None
+        True
+    """
+    for n in [2**i for i in range(1, max_bits+1)]:
+        if _length(F, 2*n - 1) is None:
+            break
+        a = [F.random_element() for i in range(n)]
+        b = [F.random_element() for i in range(n)]
+        best = []
+        # transform, schoolbook
+        for threshold in [0, n+1]:
+            t = float('inf')
+            for r in range(repeat):
+                start = time.time()
+                convolve_batch([a], b, F, threshold)
+                t = min(t, time.time() - start)
+            best.append(t)
+        if best[0] < best[1]:
+            return n
+    return None
+
+
 ###
 # private functions
 #
+def _length(F, size):
+    r"""
+    Return smallest power of two transform length over ``F`` holding
+    ``size`` coefficients or ``None``.
+    """
+    N = _pow2(size)
+    if (F.order() - 1) % N:
+        return None
+    return N
+
+
+def _plan(F, N, w=None):
+    r"""
+    Return cached twiddle plan of a radix-2 transform of length ``N``.
+
+    The plan holds the bit reversal permutation, the powers of ``w`` and
+    its inverse and `1/N`. Without ``w`` a primitive root of unity is
+    derived from the multiplicative generator.
+    """
+    if w is None:
+        w = F.multiplicative_generator()**((F.order() - 1) // N)
+    key = (F, N, w)
+    plan = _plans.get(key)
+    if plan is None:
+        bits = N.bit_length() - 1
+        rev = [int(bin(i)[2:].zfill(bits)[::-1], 2) if bits else 0 for i in range(N)]
+        roots, iroots = [F.one()], [F.one()]
+        wi = 1 / w
+        for j in range(1, max(N//2, 1)):
+            roots.append(roots[-1] * w)
+            iroots.append(iroots[-1] * wi)
+        plan = (rev, roots, iroots, 1 / F(N))
+        _plans[key] = plan
+    return plan
+
+
+def _fntt(a, plan, inverse=False):
+    r"""
+    Iterative radix-2 transform (decimation in time).
+    """
+    rev, roots, iroots, ninv = plan
+    if inverse:
+        roots = iroots
+    N = len(rev)
+    a = [a[r] for r in rev]
+    half = 1
+    while half < N:
+        step = N // (2*half)
+        for start in range(0, N, 2*half):
+            for j in range(half):
+                u = a[start+j]
+                t = roots[j*step] * a[start+j+half]
+                a[start+j] = u + t
+                a[start+j+half] = u - t
+        half *= 2
+    if inverse:
+        return [x * ninv for x in a]
+    return a
+
+
+def _pow2(size):
+    r"""
+    Return smallest power of two not less than ``size``.
+    """
+    N = 1
+    while N < size:
+        N *= 2
+    return N
+
+
+def _pruned(a, F, n, outputs, w, inverse=False):
+    r"""
+    Pruned transform, choosing input or output pruning.
+    """
+    k = len(a)
+    if n is None:
+        n = k
+    if outputs is None:
+        outputs = n
+    if n < 1 or n & (n-1) or (F.order() - 1) % n:
+        raise ValueError("length must be a power of two dividing the field order minus one.")
+    if k > n or outputs > n:
+        raise ValueError("more inputs or outputs than transform length.")
+    if w is None:
+        w = F.one().nth_root(n)
+    if inverse:
+        w = 1 / w
+
+    # estimated butterflies of both prunings
+    K = _pow2(k)
+    M = _pow2(outputs)
+    if min(n // K, outputs) * K * K.bit_length() <= n * M.bit_length():
+        b = _input_pruned(a, F, n, K, outputs, w)
+    else:
+        b = _output_pruned(a, F, n, M, outputs, w)
+    if inverse:
+        ninv = 1 / F(n)
+        b = [x * ninv for x in b]
+    return b
+
+
+def _input_pruned(a, F, n, K, outputs, w):
+    r"""
+    Transform of at most ``K`` inputs on the cosets `w^s \langle w^{n/K}
+    \rangle`, output `s + (n/K) t` is output `t` of coset `s`.
+    """
+    cosets = n // K
+    plan = _plan(F, K, w**cosets)
+    zero = F.zero()
+    b = [zero] * outputs
+    ws = F.one()  # w^s
+    for s in range(min(cosets, outputs)):
+        t = F.one()
+        c = []
+        for x in a:
+            c.append(x * t)
+            t *= ws
+        c += [zero] * (K - len(c))
+        for j, y in enumerate(_fntt(c, plan)):
+            if s + cosets*j < outputs:
+                b[s + cosets*j] = y
+        ws *= w
+    return b
+
+
+def _output_pruned(a, F, n, M, outputs, w):
+    r"""
+    Transform to at most ``M`` outputs from the decimated inputs
+    `a_{r + (n/M) t}`, twisted by `w^{rj}`.
+    """
+    R = n // M
+    plan = _plan(F, M, w**R)
+    zero = F.zero()
+    a = list(a) + [zero] * (n - len(a))
+    b = [zero] * outputs
+    for r in range(R):
+        sub = a[r::R]
+        if not any(sub):
+            continue
+        S = _fntt(sub, plan)
+        wr = w**r
+        t = F.one()
+        for j in range(outputs):
+            b[j] += t * S[j]
+            t *= wr
+    return b
+
+
+def _additive_plan(F, n):
+    r"""
+    Return cached plan of an additive FFT with `n` points.
+
+    One level per recursion step with basis `\beta_1, ..., \beta_j`: the
+    powers of `\beta_j` and their inverses, and the subspace spanned by
+    `\gamma_i = \beta_i / \beta_j`, `i < j`. The next basis is
+    `\delta_i = \gamma_i^2 + \gamma_i`.
+    """
+    if F.characteristic() != 2 or n < 1 or n & (n-1) or n > F.order():
+        raise ValueError("length must be a power of two in a field of characteristic two.")
+    key = ('additive', F, n)
+    plan = _plans.get(key)
+    if plan is None:
+        a = F.gen()
+        basis = [a**j for j in range(n.bit_length() - 1)]
+        plan = []
+        while basis:
+            beta = basis[-1]
+            gammas = [b / beta for b in basis[:-1]]
+            powers = [F.one()]
+            for i in range(1, 2**len(basis)):
+                powers.append(powers[-1] * beta)
+            span = [F.zero()]
+            for g in gammas:
+                span += [x + g for x in span]
+            plan.append((powers, [1 / p for p in powers], span))
+            basis = [g*g + g for g in gammas]
+        _plans[key] = plan
+    return plan
+
+
+def _taylor(f, start, n):
+    r"""
+    In place Taylor expansion of ``f[start:start+n]`` at `x^2 + x`, the
+    coefficients `c_{i,0} + c_{i,1} x` of `(x^2 + x)^i` end up at `2i` and
+    `2i + 1`. Characteristic two, `n` a power of two.
+    """
+    if n <= 2:
+        return
+    t = n // 4
+    # f = f0 + x^(2t) f1 + x^(3t) f2 = (f0 + x^t h) + (x^2 + x)^t (h + x^t f2)
+    for i in range(start + 2*t, start + 3*t):
+        f[i] += f[i+t]  # h = f1 + f2
+    for i in range(start + t, start + 2*t):
+        f[i] += f[i+t]
+    _taylor(f, start, 2*t)
+    _taylor(f, start + 2*t, 2*t)
+
+
+def _itaylor(f, start, n):
+    r"""
+    Inverse of :func:`_taylor`.
+    """
+    if n <= 2:
+        return
+    t = n // 4
+    _itaylor(f, start, 2*t)
+    _itaylor(f, start + 2*t, 2*t)
+    for i in range(start + t, start + 2*t):
+        f[i] -= f[i+t]
+    for i in range(start + 2*t, start + 3*t):
+        f[i] -= f[i+t]
+
+
+def _afft(f, plan, level=0):
+    r"""
+    Recursive additive FFT (Gao-Mateer) of ``f`` of length `2^j`.
+    """
+    if level == len(plan):
+        return f
+    powers, ipowers, span = plan[level]
+    g = [x * p for x, p in zip(f, powers)]
+    _taylor(g, 0, len(g))
+    u = _afft(g[0::2], plan, level+1)
+    v = _afft(g[1::2], plan, level+1)
+    w = [x + s*y for x, s, y in zip(u, span, v)]
+    return w + [x + y for x, y in zip(w, v)]
+
+
+def _iafft(w, plan, level=0):
+    r"""
+    Recursive inverse additive FFT.
+    """
+    if level == len(plan):
+        return w
+    powers, ipowers, span = plan[level]
+    h = len(w) // 2
+    v = [y - x for x, y in zip(w[:h], w[h:])]
+    u = [x - s*y for x, s, y in zip(w[:h], span, v)]
+    g = [None] * len(w)
+    g[0::2] = _iafft(u, plan, level+1)
+    g[1::2] = _iafft(v, plan, level+1)
+    _itaylor(g, 0, len(g))
+    return [x * p for x, p in zip(g, ipowers)]
+
+
+def _inverse_series(f, l, F, crossover):
+    r"""
+    Inverse power series of ``f`` modulo `x^l` by Newton iteration.
+    """
+    g = [1 / f[0]]
+    prec = 1
+    while prec < l:
+        prec = min(2*prec, l)
+        e = poly_mul(f[:prec], g, F, crossover)[:prec]
+        e += [F.zero()] * (prec - len(e))
+        e = [-x for x in e]
+        e[0] += 2
+        g = poly_mul(g, e, F, crossover)[:prec]
+    return g
+
+
+def _long_division(a, b, F):
+    r"""
+    Long division of coefficient lists.
+    """
+    r = list(a)
+    d = len(b) - 1
+    lead = 1 / b[-1]
+    q = [F.zero()] * (len(a) - d)
+    for i in range(len(q)-1, -1, -1):
+        c = r[i+d] * lead
+        q[i] = c
+        if c:
+            for j, y in enumerate(b):
+                r[i+j] -= c * y
+    return q, r[:d]
+
+
+def _schoolbook(a, b, F):
+    r"""
+    Schoolbook multiplication of coefficient lists.
+    """
+    if not a or not b:
+        return []
+    c = [F.zero()] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                c[i+j] += x * y
+    return c
+
+
 def _fntt_textbook(a, w, n = 0, axis = 0):
     n = len(a)
     if n == 1:
         return a
-    if is_odd(n):
+    if n % 2:
         return _ntt(a, w)
     else:
         Feven = _fntt_textbook([a[i] for i in xrange(0, n, 2)], w**2)
@@ -36,8 +36,12 @@ REFERENCES:
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 
+from sage.misc.lazy_import import lazy_import
+
 from shamir_ss import ShamirSS
 
+lazy_import('sage.matrix.constructor', 'Matrix')
+
 class RabinIDS(ShamirSS):
     r"""
     Rabin information dispersal.
@@ -62,7 +66,6 @@ class RabinIDS(ShamirSS):
             sage: data == ids.reconstruct(shares)
             True
     """
-
     ### begin module private api
 
     def _latex_(self):
@@ -94,8 +97,242 @@ class RabinIDS(ShamirSS):
         """
         return "({},{})-Rabin information dispersal over {}".format(self._n, self._k, 
                                                               self._F)
+
+
+    def _generator_matrix(self):
+        r"""
+        Return the cached generator matrix.
+
+        OUTPUT:
+
+        The `k \times n` matrix evaluating the `k` coefficients of a block
+        at the share indices `1, ..., n`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: RabinIDS(4, 2, 257)._generator_matrix()
+            [1 1 1 1]
+            [1 2 3 4]
+        """
+        return self._context.generator_matrix()
+
+
+    def _inverse_vandermonde(self, xs):
+        r"""
+        Return the cached inverse Vandermonde matrix of share indices.
+
+        INPUT:
+
+        - ``xs`` -- `k` share indices (x-coordinates as integer).
+
+        OUTPUT:
+
+        The `k \times k` matrix mapping the y-values at ``xs`` to the
+        coefficients of a block.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: ids = RabinIDS(4, 2, 257)
+            sage: ids._inverse_vandermonde((1, 2))
+            [  2 256]
+            [256   1]
+        """
+        return self._context.inverse_vandermonde(xs)
+
+
+    def _decode(self, shares):
+        r"""
+        Decode share-sets with cached inverse Vandermonde matrices.
+
+        The first `k` shares of every share-set are decoded, surplus shares
+        must lie on the decoded polynomial (see :meth:`_decode_groups`).
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets.
+
+        OUTPUT:
+
+        The reconstructed data.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: ids = RabinIDS(4, 2, 257)
+            sage: ids._decode([[(1, 3), (2, 5), (3, 7)]])
+            [1, 2]
+            sage: ids._decode([[(1, 3), (2, 5), (3, 8)]])
+            Traceback (most recent call last):
+            ...
+            ValueError: lagrange polynomial degree mismatch.
+        """
+        blocks, mismatch = self._decode_groups(shares)
+        if mismatch:
+            raise ValueError("lagrange polynomial degree mismatch.")
+        return self._to_Int_list([d for row in blocks for d in row])
+
+
+    def _encode(self, data, chunk, encoder='poly'):
+        r"""
+        Encode data chunk-wise with the generator matrix.
+
+        INPUT:
+
+        - ``data`` -- the data as list of integer (multiple of `k`).
+        - ``chunk`` -- number of blocks encoded at once.
+        - ``encoder`` -- (default: ``'poly'``) either ``'poly'`` to evaluate
+          the blocks with the generator matrix or ``'additive'`` to evaluate
+          them with the additive FFT.
+
+        OUTPUT:
+
+        Generator of share matrices, one row per block and one column per
+        share index.
+        """
+        # check input list size (padding is not supported)
+        if len(data)%self._k:
+            raise TypeError("input list must be multiple of k (padding is not supported).")
+
+        if encoder not in ('poly', 'additive'):
+            raise ValueError("unknown encoder.")
+
+        G = self._generator_matrix()
+        step = chunk * self._k
+        for start in range(0, len(data), step):
+            D = self._to_GF_list(data[start:start+step])
+            if encoder == 'additive':
+                blocks = [D[i:i+self._k] for i in range(0, len(D), self._k)]
+                yield Matrix(self._F, len(blocks), self._n,
+                             [y for ys in self._additive_encode(blocks) for y in ys])
+            else:
+                yield Matrix(self._F, len(D)//self._k, self._k, D) * G
+
+
+    def _repair(self, shares, index):
+        r"""
+        Repair share of every share-set.
+
+        Share-sets are grouped by the indices of their first `k` shares and
+        every group is repaired with one matrix-vector product.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets of (x,y)-tuples.
+        - ``index`` -- the index (x-coordinate) of the missing share.
+
+        OUTPUT:
+
+        List of the repaired y-values, one per share-set.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+            sage: ids = RabinIDS(4, 2, 257)
+            sage: ids._repair([[(1, 3), (2, 5)], [(2, 5), (4, 9)]], 3)
+            [7, 7]
+        """
+        groups = {}
+        for b, element in enumerate(shares):
+            xs = [x for x, y in element]
+            if index in xs:
+                raise ValueError("share is not missing.")
+            if len(xs) < self._k:
+                raise ValueError("not enough shares for repair.")
+            groups.setdefault(tuple(xs[:self._k]), []).append(b)
+
+        ys = [None] * len(shares)
+        for xs, rows in groups.items():
+            Y = Matrix(self._F, len(rows), self._k,
+                       self._to_GF_list([y for b in rows for x, y in shares[b][:self._k]]))
+            weights = self._lagrange_weights(list(xs), index)
+            for b, y in zip(rows, self._to_Int_list(list(Y * weights))):
+                ys[b] = y
+        return ys
+
     ### begin public api
 
+    def decode(self, columns):
+        r"""
+        Decode data from columns of share holders.
+
+        INPUT:
+
+        - ``columns`` -- list of at least `k` tuples holding the share index
+          and the y-values of all blocks for this index (see :meth:`encode`).
+
+        OUTPUT:
+
+        The reconstructed data.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+
+            sage: n, k, order = 7, 3, 2**8
+            sage: data = [i for i in range(15)]
+            sage: ids = RabinIDS(n, k, order)
+            sage: columns = ids.encode(data)
+            sage: data == ids.decode(columns[4:])
+            True
+        """
+        if len(columns) < self._k:
+            raise ValueError("not enough shares.")
+        columns = columns[:self._k]
+        xs = tuple(x for x, ys in columns)
+        Y = Matrix(self._F, self._k, len(columns[0][1]),
+                   self._to_GF_list([y for x, ys in columns for y in ys])).transpose()
+        return self._to_Int_list((Y * self._inverse_vandermonde(xs)).list())
+
+
+    def encode(self, data, chunk=4096, encoder='poly'):
+        r"""
+        Encode data into columns of share holders.
+
+        The data is treated as a matrix of blocks with `k` elements each and
+        multiplied by the cached `k \times n` generator matrix, ``chunk``
+        blocks at a time. In binary extension fields the blocks can be
+        evaluated with the additive FFT instead, which needs `O(\log n)`
+        instead of `k` multiplications per share.
+
+        INPUT:
+
+        - ``data`` -- the data to be shared as list of integer.
+        - ``chunk`` -- (default: ``4096``) number of blocks encoded at once.
+        - ``encoder`` -- (default: ``'poly'``) either ``'poly'`` to evaluate
+          the blocks with the generator matrix or ``'additive'`` to evaluate
+          them with the additive FFT (binary extension fields only, see
+          :func:`additive_fft`).
+
+        OUTPUT:
+
+        List of `n` tuples holding the share index and the y-values of all
+        blocks for this index.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+
+            sage: n, k, order = 7, 3, 2**8
+            sage: data = [i for i in range(15)]
+            sage: ids = RabinIDS(n, k, order)
+            sage: columns = ids.encode(data, chunk=2)
+            sage: len(columns), len(columns[0][1])
+            (7, 5)
+            sage: shares = ids.share(data)
+            sage: columns[3] == (4, [block[3][1] for block in shares])
+            True
+            sage: columns == ids.encode(data, encoder='additive')
+            True
+        """
+        columns = [[] for i in range(self._n)]
+        for S in self._encode(data, chunk, encoder):
+            for column, ys in zip(columns, S.columns()):
+                column.extend(self._to_Int_list(list(ys)))
+        return [(i+1, column) for i, column in enumerate(columns)]
+
+
     def reconstruct(self, shares, decoder='lg'):
         r"""
         Reconstruct shares.
@@ -103,8 +340,14 @@ class RabinIDS(ShamirSS):
         INPUT:
 
         - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+            Shares with integrity tags ((x,y,tag)-tuples) are checked first and
+            dropped if corrupted.
         - ``decoder`` -- (default: ``'lg'``) decoder used to reconstruct secret. Must
-            be one of the supported types ``'lg'`` or ``'bw'``.
+            be one of the supported types ``'lg'``, ``'bw'`` or ``'auto'``. The
+            ``'lg'`` decoder uses the first `k` shares of every share-set and a
+            cached inverse Vandermonde matrix per set of share indices, surplus
+            shares are checked for consistency. The ``'auto'`` decoder
+            escalates to ``'bw'`` only if needed (see :meth:`policy`).
 
         OUTPUT:
 
@@ -121,14 +364,27 @@ class RabinIDS(ShamirSS):
             sage: data == ids.reconstruct(shares)
             True
 
+        Shares with integrity tags::
+
+            sage: ids = RabinIDS(n, k, order, tag_key=b'key')
+            sage: shares = ids.share(data)
+            sage: shares[0][1] = (2, (shares[0][1][1]+1) % 256, shares[0][1][2])
+            sage: data == ids.reconstruct(shares)
+            True
         """
         # make shares iterable
         if type(shares[0]) == tuple:
             shares = [shares]
 
+        # drop corrupted shares
+        if len(shares[0][0]) == 3:
+            shares = self._check_tags(shares)
+
         # set decoder
-        if decoder == 'lg':
-            decode = self._rec_lagrange
+        if decoder == 'auto':
+            return [d for coeffs in self.policy().decode(shares) for d in coeffs]
+        elif decoder == 'lg':
+            return self._decode(shares)
         elif decoder == 'bw':
             decode = self._rec_berlekamp_welsh
         else:
@@ -138,26 +394,114 @@ class RabinIDS(ShamirSS):
         secret = []
         for element in shares:
             # convert to field
-            points = [(self._to_GF(x), self._to_GF(y)) for x,y in element]
+            points = list(zip(self._to_GF_list([x for x, y in element]),
+                              self._to_GF_list([y for x, y in element])))
             # call decoder
-            secret.extend([self._to_Int(i) for i in decode(points)])
+            secret.extend(self._to_Int_list(decode(points)))
         return secret
 
 
-    def share(self, secret):
+    def repair(self, shares, index):
+        r"""
+        Repair single share.
+
+        The missing share is a linear combination of `k` surviving shares.
+        The Lagrange weights are cached per set of survivors, hence the
+        repair costs one inner product of length `k` per block, without
+        reconstructing the data.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets missing the share to repair, or
+          list of columns of share holders (see :meth:`encode`). Shares with
+          integrity tags ((x,y,tag)-tuples) are checked first and dropped if
+          corrupted, the repaired shares are tagged anew.
+        - ``index`` -- the index (x-coordinate) of the missing share.
+
+        OUTPUT:
+
+        The repaired share of every share-set as list of (x,y)-tuples, or
+        the repaired column as tuple of the index and the y-values.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.rabin_ids import RabinIDS
+
+            sage: n, k, order = 7, 3, 2**8
+            sage: data = [i for i in range(15)]
+            sage: ids = RabinIDS(n, k, order)
+            sage: shares = ids.share(data)
+            sage: lost = [block.pop(2) for block in shares]
+            sage: lost == ids.repair(shares, 3)
+            True
+
+        Columns of share holders::
+
+            sage: columns = ids.encode(data)
+            sage: columns[2] == ids.repair(columns[:2] + columns[3:], 3)
+            True
+
+        Shares with integrity tags::
+
+            sage: ids = RabinIDS(n, k, order, tag_key=b'key')
+            sage: shares = ids.share(data)
+            sage: lost = [block.pop(2) for block in shares]
+            sage: shares[0][0] = (1, (shares[0][0][1]+1) % 256, shares[0][0][2])
+            sage: repaired = ids.repair(shares, 3)
+            sage: lost == repaired
+            True
+            sage: data == ids.reconstruct([b[1:3] + [r] for b, r in zip(shares, repaired)])
+            True
+
+        TESTS::
+
+            sage: ids.repair(shares, 1)
+            Traceback (most recent call last):
+            ...
+            ValueError: share is not missing.
+        """
+        # columns of share holders
+        if type(shares[0]) == tuple:
+            blocks = [[(x, ys[b]) for x, ys in shares] for b in range(len(shares[0][1]))]
+            return (index, self._repair(blocks, index))
+
+        # drop corrupted shares
+        tagged = len(shares[0][0]) == 3
+        if tagged:
+            raw, shares = shares, self._check_tags(shares)
+
+        ys = self._repair(shares, index)
+        if not tagged:
+            return [(index, y) for y in ys]
+
+        # tag with sharing and position of the valid shares
+        repaired = []
+        for element, valid, y in zip(raw, shares, ys):
+            tags = dict(((x, v), tag) for x, v, tag in element)
+            nonce, b = str(tags[valid[0]]).split(':')[:2]
+            repaired.append((index, y, '{}:{}:{}'.format(nonce, b, self._tag(index, y, nonce, b))))
+        return repaired
+
+
+    def share(self, secret, encoder='poly'):
         r"""
         Generate shares.
 
-        A polynomial of degree `k-1` is generated from input data.
-        It is then evaluated at points starting from `1`.
+        A polynomial of degree `k-1` is generated from every `k` elements of
+        the input data. It is then evaluated at points starting from `1`,
+        for many blocks at once by multiplication with the generator matrix.
 
         INPUT:
 
         - ``secret`` -- the data to be shared as list of integer.
+        - ``encoder`` -- (default: ``'poly'``) either ``'poly'`` to evaluate
+          the blocks with the generator matrix or ``'additive'`` to evaluate
+          them with the additive FFT (binary extension fields only, see
+          :meth:`encode`).
 
         OUTPUT:
 
-        The shares.
+        The shares. With a tag key the shares are (x,y,tag)-tuples.
 
         EXAMPLES::
 
@@ -170,19 +514,16 @@ class RabinIDS(ShamirSS):
             sage: data == ids.reconstruct(shares)
             True
         """
-        # check input list size (padding is not supported)
-        if len(secret)%self._k:
-            raise TypeError("input list must be multiple of k (padding is not supported).")
-        
-        # generate shares
+        # generate shares block-wise with the generator matrix
+        xs = list(range(1, self._n+1))
         shares = []
-        for i in range(len(secret)/self._k):
-            poly = 0
-            for j in range(self._k):
-                # gen polynomial form data
-                poly += self._to_GF(secret[i*self._k + j]) * self._P.gen()**j
-            # evaluate polynomial at different points (shares)
-            shares.append([(i, self._to_Int(poly(self._to_GF(i)))) for i in range(1, self._n+1)])
+        for S in self._encode(secret, 4096, encoder):
+            ys = self._to_Int_list(S.list())
+            for start in range(0, len(ys), self._n):
+                shares.append(list(zip(xs, ys[start:start+self._n])))
+
+        if self._tag_key is not None:
+            shares = self._add_tags(shares)
         return shares
 
 
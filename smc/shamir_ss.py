@@ -32,7 +32,46 @@ REFERENCES:
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 
+import os
+import hmac
+import hashlib
+import binascii
+import weakref
+import threading
+from collections import deque
+from itertools import islice
+
 from sage.structure.sage_object import SageObject
+from sage.misc.lazy_import import lazy_import
+
+from berlekamp_welsh import berlekamp_welsh
+from code_context import code_context
+from ntt import additive_fft
+
+lazy_import('sage.matrix.constructor', ['Matrix', 'random_matrix'])
+lazy_import('sage.modules.free_module_element', 'vector')
+lazy_import('sage.rings.integer', 'Integer')
+
+POOL_CHUNK = 1024  # zero-sharings generated at once when refilling the pool
+
+
+def _refill_loop(ref, wanted, filled):
+    r"""
+    Refill pool of zero-sharings in the background.
+
+    The scheme is only referenced weakly, the loop ends once it is
+    collected or its pool size is set to zero.
+    """
+    while True:
+        wanted.wait()
+        wanted.clear()
+        scheme = ref()
+        if scheme is None or not scheme._pool_size:
+            return
+        scheme._refill()
+        del scheme
+        filled.set()
+
 
 class ShamirSS(SageObject):
     r"""
@@ -47,6 +86,9 @@ class ShamirSS(SageObject):
     - ``k``  --  (default: ``3``) the threshold for reconstruction.
     - ``n``  --  (default: ``7``) the number of shares.
     - ``order`` --  (default: ``2^8``) field order for data to share.
+    - ``tag_key`` -- (default: ``None``) key for integrity tags; if given every
+      share is extended by a keyed hash of its index and value, bound to the
+      sharing and the position of the share-set.
 
     EXAMPLES::
 
@@ -117,8 +159,10 @@ class ShamirSS(SageObject):
         True
 
         sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
-        sage: secret == sss.reconstruct(shares, decoder='bw')
-        False
+        sage: sss.reconstruct(shares, decoder='bw')
+        Traceback (most recent call last):
+        ...
+        ValueError: too many erroneous shares.
 
     Working in extension fields::
 
@@ -138,10 +182,12 @@ class ShamirSS(SageObject):
         True
 
         sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
-        sage: secret == sss.reconstruct(shares, decoder='bw')
-        False
+        sage: sss.reconstruct(shares, decoder='bw')
+        Traceback (most recent call last):
+        ...
+        ValueError: too many erroneous shares.
     """
-    def __init__(self, n=7, k=3, order=2**8):
+    def __init__(self, n=7, k=3, order=2**8, tag_key=None):
         r"""
         Sharmir secret sharing.
 
@@ -158,16 +204,82 @@ class ShamirSS(SageObject):
         self._n = n  # number shares
         self._order = order  # order of field
 
-        from sage.rings.finite_rings.constructor import FiniteField
-        self._F = FiniteField(self._order, 'a')
-        if not self._F.is_prime_field() and not hasattr(self._F, 'fetch_int'):
-            raise TypeError("field order not supported")
+        # shared field, polynomial ring and precomputations
+        self._context = code_context(n, k, order)
+        self._F = self._context._F
+        self._P = self._context._P
 
-        from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
-        self._P = PolynomialRing(self._F, 'x')
+        self._tag_key = tag_key  # key for integrity tags
+        self._policy = None  # adaptive decoder policy, created on first use
+
+        # pool of precomputed zero-sharings (offline phase)
+        self._init_pool()
+
+
+    def __getstate__(self):
+        r"""
+        Return state for pickling.
+
+        Precomputed zero-sharings, the refill thread and the decoder policy
+        are not pickled, every copy starts with an empty pool.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3)
+            sage: sss.precompute(10, background=True)
+            sage: copy = loads(dumps(sss))
+            sage: len(copy._pool), copy.reconstruct(copy.share(42))
+            (0, 42)
+            sage: sss.precompute(0)
+        """
+        state = self.__dict__.copy()
+        for key in ('_pool', '_pool_size', '_refiller', '_refiller_lock',
+                    '_wanted', '_filled', '_policy'):
+            state.pop(key, None)
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._policy = None
+        self._init_pool()
 
     ### begin module private api
 
+    def _additive_encode(self, coeffs):
+        r"""
+        Evaluate polynomials at the share indices with the additive FFT.
+
+        The share index `x` is the field element with integer representation
+        `x`, i.e. a point of the `\mathbb{F}_2`-linear subspace of size
+        `2^m > n` evaluated by :func:`additive_fft`.
+
+        INPUT:
+
+        - ``coeffs`` -- list of lists of `k` coefficients (field elements).
+
+        OUTPUT:
+
+        List of the `n` y-values (field elements) per polynomial.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(5, 2)
+            sage: one = sss._F.one()
+            sage: ys = sss._additive_encode([[one, one]])[0]
+            sage: ys == [one + sss._to_GF(x) for x in range(1, 6)]
+            True
+        """
+        if self._F.characteristic() != 2 or self._F.is_prime_field():
+            raise TypeError("additive encoder needs a binary extension field.")
+        size = 1
+        while size <= self._n:
+            size *= 2
+        return [additive_fft(c, self._F, size)[1:self._n+1] for c in coeffs]
+
+
     def _latex_(self):
         r"""
         Return Latex representation of self.
@@ -237,13 +349,59 @@ class ShamirSS(SageObject):
             sage: test == secret
             True
         """
-        from sage.rings.all import Integer
         if self._F.is_prime_field():
             return Integer(x)
         else:
             return x.integer_representation()
 
 
+    def _to_GF_list(self, xs):
+        r"""
+        Convert list of integer representations to finite field
+
+        The range is checked once for the whole list, small extension
+        fields are converted by table lookup.
+
+        INPUT:
+
+        - ``xs`` --  list of integer representations.
+
+        OUTPUT:
+
+        List of finite field elements.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS()
+            sage: sss._to_GF_list([42, 255]) == [sss._to_GF(42), sss._to_GF(255)]
+            True
+        """
+        return self._context.from_integers(xs)
+
+
+    def _to_Int_list(self, xs):
+        r"""
+        Convert list of field elements to integer representations
+
+        INPUT:
+
+        - ``xs`` -- list of field elements.
+
+        OUTPUT:
+
+        List of integer representations.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS()
+            sage: sss._to_Int_list(sss._to_GF_list([0, 42, 255]))
+            [0, 42, 255]
+        """
+        return self._context.to_integers(xs)
+
+
     def _rec_berlekamp_welsh(self, points):
         r"""
         Reconstruct with Berlekamp-Welsh decoding.
@@ -254,7 +412,8 @@ class ShamirSS(SageObject):
 
         OUTPUT:
 
-        Reconstructed secret.
+        Reconstructed secret. Raises ``ValueError`` if there are too many
+        erroneous shares to decode.
 
         EXAMPLES::
 
@@ -280,8 +439,7 @@ class ShamirSS(SageObject):
             True
 
         """
-        from berlekamp_welsh import berlekamp_welsh
-        polycoeffs =  berlekamp_welsh(self._k-1, points).coeffs()
+        polycoeffs = berlekamp_welsh(self._k-1, points, self._context, strict=True).coeffs()
         return polycoeffs
 
 
@@ -322,187 +480,1335 @@ class ShamirSS(SageObject):
         return polycoeffs
 
 
-    def _repr_(self):
+    def _lagrange_weights(self, xs, point=0):
         r"""
-        Return String representation of self.
+        Lagrange weights of share indices evaluated at a point.
+
+        The weights are cached per index set in the code context, hence
+        recombining many share-sets with the same indices costs a single
+        inner product each.
+
+        INPUT:
+
+        - ``xs`` -- share indices (x-coordinates as integer).
+        - ``point`` -- (default: ``0``) integer representation of the point
+          to evaluate at.
+
+        OUTPUT:
+
+        Vector of weights `\lambda_i` with `f(point) = \sum_i \lambda_i f(x_i)`.
 
         EXAMPLES::
 
             sage: from sage.crypto.smc.shamir_ss import ShamirSS
-            sage: sss=ShamirSS()
-            sage: print(sss)
-            (7,3)-Shamir secret sharing over Finite Field in a of size 2^8
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: sss._lagrange_weights([1, 2, 3])
+            (3, 254, 1)
         """
-        return "({},{})-Shamir secret sharing over {}".format(self._n, self._k, 
-                                                              self._F)
-    ### begin public api
+        return self._context.lagrange_weights(xs, point)
 
-    def reconstruct(self, shares, decoder='lg'):
+
+    def _vandermonde(self, xs, k, start=0):
         r"""
-        Reconstruct shares.
+        Evaluation matrix of monomials at share indices.
 
         INPUT:
 
-        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
-        - ``decoder`` -- (default: ``'lg'``) decoder used to reconstruct secret. Must
-            be one of the supported types ``'lg'`` or ``'bw'``.
+        - ``xs`` -- share indices (x-coordinates as integer).
+        - ``k`` -- number of monomials (rows).
+        - ``start`` -- (default: ``0``) degree of the first monomial.
 
         OUTPUT:
 
-        The reconstructed secret or list of secrets.
+        The `k \times len(xs)` matrix with entries `x_j^{i+start}`.
 
         EXAMPLES::
 
             sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: sss._vandermonde([1, 2, 3], 2, 1)
+            [1 2 3]
+            [1 4 9]
+        """
+        X = self._to_GF_list(list(xs))
+        return Matrix(self._F, k, len(X), lambda i, j: X[j]**(i+start))
 
-        Simple interface::
 
-            sage: sss = ShamirSS()
-            sage: secret = 42
-            sage: shares = sss.share(secret)
-            sage: secret == sss.reconstruct(shares)
-            True
+    def _to_matrix(self, shares):
+        r"""
+        Convert share-sets to field matrix.
 
-        Decoding with errors::
+        INPUT:
 
-            sage: shares[0] = (shares[0][0], shares[0][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
+        - ``shares`` -- list of share-sets with identical share indices.
 
-            sage: k = 4; n = 10
-            sage: sss = ShamirSS(n,k)
-            sage: secret = randint(0, 255)
-            sage: shares = sss.share(secret)
-            sage: shares[0] = (shares[0][0], shares[0][1]+1)
-            sage: shares[1] = (shares[1][0], shares[1][1]+1)
-            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
+        OUTPUT:
 
-        TESTS:
+        Tuple of share indices and matrix of y-values (one row per share-set).
 
-        Working in prime fields::
+        EXAMPLES::
 
-            sage: from sage.rings.arith import random_prime
-            sage: order = random_prime(10**10)
-            sage: secret = randint(0, order-1)
-            sage: sss = ShamirSS(7, 3, order)
-            sage: shares = sss.share(secret)
-            sage: secret == sss.reconstruct(shares)
-            True
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: xs, Y = sss._to_matrix([[(1, 5), (2, 7)], [(1, 6), (2, 8)]])
+            sage: xs
+            [1, 2]
+            sage: Y
+            [5 7]
+            [6 8]
+        """
+        if any(len(share) != 2 for element in shares for share in element):
+            raise ValueError("tagged shares must be checked first, see reconstruct.")
+        xs = [x for x, y in shares[0]]
+        ys = []
+        for element in shares:
+            if [x for x, y in element] != xs:
+                raise ValueError("share-sets must have identical share indices.")
+            ys.extend([y for x, y in element])
+        return xs, Matrix(self._F, len(shares), len(xs), self._to_GF_list(ys))
 
-            sage: shares[0] = (shares[0][0], shares[0][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
 
-            sage: shares[1] = (shares[1][0], shares[1][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
+    def _from_matrix(self, xs, Y):
+        r"""
+        Convert field matrix to share-sets.
 
-            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            False
+        INPUT:
 
-        Working in extension fields::
+        - ``xs`` -- share indices (x-coordinates as integer).
+        - ``Y`` -- matrix of y-values (one row per share-set).
 
-            sage: order = 2**randint(3, 15)
-            sage: secret = randint(0, order-1)
-            sage: sss = ShamirSS(7, 3, order)
-            sage: shares = sss.share(secret)
-            sage: secret == sss.reconstruct(shares[:-2])
-            True
+        OUTPUT:
 
-            sage: shares[0] = (shares[0][0], shares[0][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
+        List of share-sets.
 
-            sage: shares[1] = (shares[1][0], shares[1][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            True
+        EXAMPLES::
 
-            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
-            sage: secret == sss.reconstruct(shares, decoder='bw')
-            False
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: xs, Y = sss._to_matrix([[(1, 5), (2, 7)], [(1, 6), (2, 8)]])
+            sage: sss._from_matrix(xs, Y)
+            [[(1, 5), (2, 7)], [(1, 6), (2, 8)]]
         """
-        # make shares iterable
-        if type(shares[0]) == tuple:
-            shares = [shares]
+        ys = self._to_Int_list(Y.list())
+        n = len(xs)
+        return [list(zip(xs, ys[i:i+n])) for i in range(0, len(ys), n)]
 
-        # set decoder
-        if decoder == 'lg':
-            decode = self._rec_lagrange
-        elif decoder == 'bw':
-            decode = self._rec_berlekamp_welsh
-        else:
-            raise ValueError("unknown decoder.")
 
-        # reconstruct secret
-        secret = []
-        for element in shares:
-            # convert to field
-            points = [(self._to_GF(x), self._to_GF(y)) for x,y in element]
-            # call decoder
-            secret.append(self._to_Int(decode(points)[0]))
-        if len(secret) == 1:
-            secret = secret[0]
-        return secret
+    def _reshare(self, xs, Y, n, k):
+        r"""
+        Reshare share matrix by sub-sharing and recombination.
 
+        Every share holder `x_i` shares its y-values with a fresh random
+        polynomial of degree `k-1` and evaluates it at the new indices. New
+        share holder `j` combines the sub-shares it received with the
+        Lagrange weights. Only sub-shares are combined, the secrets (the
+        weighted sum of the old y-values) are never formed.
 
-    def share(self, secret):
-        r"""
-        Generate shares.
+        INPUT:
 
-        A polynomial of degree `k-1` is generated at random with the secret
-        being the constant coefficient. It is then evaluated at points starting
-        from `1`.
+        - ``xs`` -- share indices of the contributing share holders.
+        - ``Y`` -- matrix of y-values (one row per share-set).
+        - ``n`` -- number of new shares.
+        - ``k`` -- new threshold.
+
+        OUTPUT:
+
+        Matrix of new y-values at indices `1, ..., n`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: xs, Y = sss._to_matrix(sss.share([42, 43]))
+            sage: Z = sss._reshare(xs[:3], Y.matrix_from_columns(range(3)), 5, 2)
+            sage: ShamirSS(5, 2, 257).reconstruct(sss._from_matrix(range(1, 6), Z))
+            [42, 43]
+        """
+        if k > n:
+            raise ValueError("threshold must not exceed number of shares.")
+        weights = self._lagrange_weights(xs)
+        V = self._vandermonde(range(1, n+1), k)
+        Z = Matrix(self._F, Y.nrows(), n)
+        for i, weight in enumerate(weights):
+            # sub-shares of share holder i for the new share holders
+            R = random_matrix(self._F, Y.nrows(), k)
+            R.set_column(0, Y.column(i))
+            S = R * V
+            # recombination by the receiving share holders
+            Z += weight * S
+        return Z
+
+
+    def _tag(self, x, y, nonce, b):
+        r"""
+        Compute integrity tag of share.
 
         INPUT:
 
-        - ``secret`` -- the secret to be shared as integer or list of integer.
+        - ``x`` -- the share index as integer.
+        - ``y`` -- the share value as integer.
+        - ``nonce`` -- the random identifier of the sharing (hex string).
+        - ``b`` -- the position of the share-set in the sharing.
 
         OUTPUT:
 
-        The shares or a list of shares, if list input.
+        HMAC-SHA256 of nonce, position, index and value, truncated to 128 bit
+        (hex string).
 
         EXAMPLES::
 
             sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(tag_key=b'key')
+            sage: len(sss._tag(1, 42, '00', 0))
+            32
+        """
+        message = '{}:{}:{}:{}'.format(nonce, b, x, y).encode('ascii')
+        return hmac.new(self._tag_key, message, hashlib.sha256).hexdigest()[:32]
 
-        Simple interface::
 
-            sage: sss = ShamirSS()
-            sage: secret = 42
-            sage: shares = sss.share(secret)
-            sage: [i+1 == share[0]  for i, share in enumerate(shares)]
-            [True, True, True, True, True, True, True]
+    def _add_tags(self, shares):
+        r"""
+        Extend shares by integrity tags.
 
-        Input vector::
+        INPUT:
 
-            sage: sss = ShamirSS()
-            sage: secret = [42, 43, 44, 45]
-            sage: shares = sss.share(secret)
-            sage: secret == sss.reconstruct(shares)
-            True
+        - ``shares`` -- list of share-sets.
+
+        OUTPUT:
+
+        List of share-sets of (x,y,tag)-tuples. The tag holds a fresh nonce
+        of the sharing, the position of the share-set and the keyed hash,
+        separated by colons.
         """
-        # make input iterable
-        from sage.rings.integer import Integer
-        if not type(secret) == list:
-            secret = [secret]
-        
-        # generate shares
-        shares = []
-        for s in secret:
-            # random polynomial with s as constant coefficient
-            ssp = self._to_GF(s)
-            for i in range(1, self._k):
-                ssp += self._F.random_element() * self._P.gen()**i
+        nonce = binascii.hexlify(os.urandom(8)).decode('ascii')
+        return [[(x, y, '{}:{}:{}'.format(nonce, b, self._tag(x, y, nonce, b)))
+                 for x, y in element] for b, element in enumerate(shares)]
 
-            # evaluate polynomial at different points (shares)
-            shares.append([(i, self._to_Int(ssp(self._to_GF(i)))) for i in range(1, self._n+1)])
-        
-        if len(shares) == 1:
+
+    def _check_tags(self, shares):
+        r"""
+        Drop shares with invalid integrity tags.
+
+        Shares with a valid tag from another sharing or share-set than the
+        majority of the share-set are dropped as well, i.e. shares moved
+        between share-sets or replayed from before a refresh. Share-sets of
+        one sharing must keep their order.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets of (x,y,tag)-tuples.
+
+        OUTPUT:
+
+        List of share-sets of (x,y)-tuples with valid tag.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(tag_key=b'key')
+            sage: shares = sss.share(42)
+            sage: shares[0] = (shares[0][0], (shares[0][1]+1) % 256, shares[0][2])
+            sage: len(sss._check_tags([shares])[0])
+            6
+
+        Shares of another share-set are dropped::
+
+            sage: shares = sss.share([42, 43])
+            sage: shares[0][1] = shares[1][1]
+            sage: len(sss._check_tags(shares)[0])
+            6
+        """
+        if self._tag_key is None:
+            raise ValueError("tag key required to check tagged shares.")
+        result = []
+        last = {}  # last position per sharing
+        for element in shares:
+            valid = []
+            for x, y, tag in element:
+                try:
+                    nonce, b, mac = str(tag).split(':')
+                except ValueError:
+                    continue
+                if hmac.compare_digest(mac, self._tag(x, y, nonce, b)):
+                    valid.append(((nonce, int(b)), (x, y)))
+            origins = [origin for origin, share in valid]
+            origin = max(sorted(set(origins)), key=origins.count) if origins else None
+            if origin is not None:
+                nonce, b = origin
+                if last.get(nonce, -1) >= b:
+                    raise ValueError("share-sets out of order.")
+                last[nonce] = b
+            result.append([share for o, share in valid if o == origin])
+        return result
+
+
+    def _combine(self, a, b, op):
+        r"""
+        Apply linear operation to share matrices.
+
+        INPUT:
+
+        - ``a`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+        - ``b`` -- shares of the same shape and share indices as ``a``.
+        - ``op`` -- function mapping the two share matrices to the result.
+
+        OUTPUT:
+
+        The resulting shares or list of shares.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: sss._combine([(1, 5), (2, 7)], [(1, 6), (2, 8)], lambda A, B: A + B)
+            [(1, 11), (2, 15)]
+        """
+        # make shares iterable
+        single = type(a[0]) == tuple
+        if single:
+            a, b = [a], [b]
+        if len(a) != len(b):
+            raise ValueError("operands must have the same number of share-sets.")
+
+        xs, A = self._to_matrix(a)
+        xb, B = self._to_matrix(b)
+        if xs != xb:
+            raise ValueError("operands must have identical share indices.")
+
+        shares = self._from_matrix(xs, op(A, B))
+        if single:
             shares = shares[0]
         return shares
 
 
+    def _decode_groups(self, shares, constant=False):
+        r"""
+        Decode share-sets from their first `k` shares, grouped by share indices.
+
+        Share-sets with the same share indices are interpolated with a
+        cached inverse Vandermonde matrix in one matrix product, surplus
+        shares are compared with the interpolated polynomials. If only the
+        constant coefficients are asked for, share-sets without surplus
+        shares are combined with cached Lagrange weights instead.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets.
+        - ``constant`` -- (default: ``False``) if ``True``, return only the
+          constant coefficient of every share-set.
+
+        OUTPUT:
+
+        Tuple of the `k` polynomial coefficients (field elements) per
+        share-set, or the constant coefficient only, and the positions of
+        the share-sets whose surplus shares do not match.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(5, 2, 257)
+            sage: sss._decode_groups([[(1, 3), (2, 5), (3, 7)], [(2, 5), (1, 3)], [(1, 3), (2, 5), (3, 8)]])
+            ([[1, 2], [1, 2], [1, 2]], [2])
+            sage: sss._decode_groups([[(1, 3), (2, 5)], [(1, 3), (2, 5), (3, 7)]], constant=True)
+            ([1, 1], [])
+        """
+        k = self._k
+        # group share-sets by share indices
+        groups = {}
+        for b, element in enumerate(shares):
+            if len(element) < k:
+                raise ValueError("not enough shares.")
+            groups.setdefault(tuple(x for x, y in element), []).append(b)
+
+        rows = [None] * len(shares)
+        mismatch = []
+        for xs, index in groups.items():
+            Y = Matrix(self._F, len(index), len(xs),
+                       self._to_GF_list([y for b in index for x, y in shares[b]]))
+            if constant and len(xs) == k:
+                for b, s in zip(index, Y * self._lagrange_weights(xs)):
+                    rows[b] = s
+                continue
+            C = Y.matrix_from_columns(range(k)) * self._context.inverse_vandermonde(xs[:k])
+            if len(xs) > k:
+                D = C * self._vandermonde(xs[k:], k) - Y.matrix_from_columns(range(k, len(xs)))
+            for i, b in enumerate(index):
+                rows[b] = C[i, 0] if constant else C.row(i).list()
+                if len(xs) > k and not D.row(i).is_zero():
+                    mismatch.append(b)
+        return rows, sorted(mismatch)
+
+
+    def _reconstruct_columns(self, columns):
+        r"""
+        Reconstruct secrets from columns of share holders.
+
+        The y-values of the first `k` columns are combined with cached
+        Lagrange weights.
+
+        INPUT:
+
+        - ``columns`` -- list of (x,ys)-tuples, one per share holder.
+
+        OUTPUT:
+
+        The secret or list of secrets.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(5, 2, 257)
+            sage: sss._reconstruct_columns([(1, [3, 5]), (2, [4, 7])])
+            [2, 3]
+        """
+        if len(columns) < self._k:
+            raise ValueError("not enough shares.")
+        columns = columns[:self._k]
+        xs = [x for x, ys in columns]
+        Y = Matrix(self._F, self._k, len(columns[0][1]),
+                   self._to_GF_list([y for x, ys in columns for y in ys]))
+        secret = self._to_Int_list(list(self._lagrange_weights(xs) * Y))
+        if len(secret) == 1:
+            secret = secret[0]
+        return secret
+
+
+    def _lagrange_chunk(self, shares):
+        r"""
+        Reconstruct secrets of share-sets with the ``'lg'`` decoder.
+
+        Surplus shares beyond the first `k` must be consistent, see
+        :meth:`_decode_groups`.
+
+        INPUT:
+
+        - ``shares`` -- list of share-sets.
+
+        OUTPUT:
+
+        List of secrets.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(5, 2, 257)
+            sage: sss._lagrange_chunk([[(1, 3), (2, 4)], [(2, 4), (1, 3)], [(1, 5), (2, 7)]])
+            [2, 2, 3]
+            sage: sss._lagrange_chunk([[(1, 3), (2, 4), (3, 6)]])
+            Traceback (most recent call last):
+            ...
+            ValueError: lagrange polynomial degree mismatch.
+        """
+        secret, mismatch = self._decode_groups(shares, constant=True)
+        if mismatch:
+            raise ValueError("lagrange polynomial degree mismatch.")
+        return self._to_Int_list(secret)
+
+
+    def _zero_sharings(self, count):
+        r"""
+        Generate random sharings of zero.
+
+        INPUT:
+
+        - ``count`` -- number of sharings.
+
+        OUTPUT:
+
+        List of y-values (field elements) at indices `1, ..., n` per sharing.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(5, 2, 257)
+            sage: zeros = sss._zero_sharings(3)
+            sage: sss.reconstruct([list(zip(range(1, 6), sss._to_Int_list(z))) for z in zeros])
+            [0, 0, 0]
+        """
+        R = random_matrix(self._F, count, self._k - 1)
+        Z = R * self._vandermonde(range(1, self._n+1), self._k - 1, 1)
+        return [row.list() for row in Z.rows()]
+
+
+    def _init_pool(self):
+        r"""
+        Create empty pool of zero-sharings without refill thread.
+        """
+        self._pool = deque()
+        self._pool_size = 0
+        self._refiller = None
+        self._refiller_lock = threading.Lock()
+        self._wanted = threading.Event()  # refill requested
+        self._filled = threading.Event()  # refill done
+
+
+    def _refill(self):
+        r"""
+        Fill pool of zero-sharings up to its size.
+        """
+        while len(self._pool) < self._pool_size:
+            count = min(POOL_CHUNK, self._pool_size - len(self._pool))
+            self._pool.extend(self._zero_sharings(count))
+
+
+    def _take(self, count):
+        r"""
+        Take up to ``count`` zero-sharings from the pool.
+        """
+        taken = []
+        try:
+            for i in range(count):
+                taken.append(self._pool.popleft())
+        except IndexError:
+            pass
+        if self._refiller is not None and len(self._pool) < self._pool_size // 2 + 1:
+            self._wanted.set()
+        return taken
+
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss=ShamirSS()
+            sage: print(sss)
+            (7,3)-Shamir secret sharing over Finite Field in a of size 2^8
+        """
+        return "({},{})-Shamir secret sharing over {}".format(self._n, self._k, 
+                                                              self._F)
+    ### begin public api
+
+    def accumulator(self):
+        r"""
+        Return streaming accumulator for share-sets.
+
+        OUTPUT:
+
+        An empty :class:`ShareAccumulator` for this scheme.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: acc = sss.accumulator()
+            sage: for s in range(10): acc.add(sss.share(s))
+            sage: sss.reconstruct(acc.value())
+            45
+        """
+        return ShareAccumulator(self)
+
+
+    def add(self, a, b):
+        r"""
+        Add shared values.
+
+        INPUT:
+
+        - ``a`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+        - ``b`` -- shares of the same shape and share indices as ``a``.
+
+        OUTPUT:
+
+        The shares of the sum or list of it.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: a = sss.share([40, 41]); b = sss.share([2, 3])
+            sage: sss.reconstruct(sss.add(a, b))
+            [42, 44]
+        """
+        return self._combine(a, b, lambda A, B: A + B)
+
+
+    def policy(self):
+        r"""
+        Return the adaptive decoder policy.
+
+        The policy is created on first use and used by :meth:`reconstruct`
+        with ``decoder='auto'``.
+
+        OUTPUT:
+
+        The :class:`AdaptivePolicy` of this instance.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS()
+            sage: sss.policy() is sss.policy()
+            True
+        """
+        if self._policy is None:
+            from adaptive import AdaptivePolicy
+            self._policy = AdaptivePolicy(self)
+        return self._policy
+
+
+    def precompute(self, count, background=False):
+        r"""
+        Precompute random sharings of zero (offline phase).
+
+        The pool of zero-sharings is filled up to ``count`` entries. Each
+        call of :meth:`share` takes one sharing per secret from the pool and
+        only adds the secret to its y-values, i.e. `O(n)` operations per
+        secret. Every pooled sharing is used once, secrets exceeding the
+        pool are shared as usual.
+
+        INPUT:
+
+        - ``count`` -- size of the pool, ``0`` empties the pool.
+        - ``background`` -- (default: ``False``) if ``True``, a background
+          thread refills the pool whenever it is half empty. It is stopped
+          by ``precompute(0)`` or when the instance is collected.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3)
+            sage: sss.precompute(100)
+            sage: shares = sss.share(list(range(10)))
+            sage: len(sss._pool)
+            90
+            sage: sss.reconstruct(shares) == list(range(10))
+            True
+        """
+        with self._refiller_lock:
+            self._pool_size = count
+            if not count:
+                self._pool.clear()
+                # stop refill thread
+                refiller, self._refiller = self._refiller, None
+                if refiller is not None:
+                    self._wanted.set()
+                    refiller.join()
+                return
+            self._refill()
+            if background and self._refiller is None:
+                # the thread must not keep the scheme alive
+                wanted = self._wanted
+                ref = weakref.ref(self, lambda ref: wanted.set())
+                self._refiller = threading.Thread(target=_refill_loop,
+                                                  args=(ref, wanted, self._filled))
+                self._refiller.daemon = True
+                self._refiller.start()
+
+
+    def reconstruct(self, shares, decoder='lg'):
+        r"""
+        Reconstruct shares.
+
+        INPUT:
+
+        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+            Shares with integrity tags ((x,y,tag)-tuples) are checked first and
+            dropped if corrupted. Shares in node-major layout, i.e. a
+            :class:`NodeMajorShares` view or a list of (x,ys)-tuples, are
+            accepted as well.
+        - ``decoder`` -- (default: ``'lg'``) decoder used to reconstruct secret. Must
+            be one of the supported types ``'lg'``, ``'bw'`` or ``'auto'``. The
+            ``'lg'`` decoder combines share-sets with the same share indices
+            with cached Lagrange weights and checks surplus shares for
+            consistency, the ``'auto'`` decoder escalates to ``'bw'`` only if
+            needed (see :meth:`policy`).
+
+        OUTPUT:
+
+        The reconstructed secret or list of secrets.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+
+        Simple interface::
+
+            sage: sss = ShamirSS()
+            sage: secret = 42
+            sage: shares = sss.share(secret)
+            sage: secret == sss.reconstruct(shares)
+            True
+
+        Decoding with errors::
+
+            sage: shares[0] = (shares[0][0], shares[0][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+            sage: k = 4; n = 10
+            sage: sss = ShamirSS(n,k)
+            sage: secret = randint(0, 255)
+            sage: shares = sss.share(secret)
+            sage: shares[0] = (shares[0][0], shares[0][1]+1)
+            sage: shares[1] = (shares[1][0], shares[1][1]+1)
+            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+        TESTS:
+
+        Working in prime fields::
+
+            sage: from sage.rings.arith import random_prime
+            sage: order = random_prime(10**10)
+            sage: secret = randint(0, order-1)
+            sage: sss = ShamirSS(7, 3, order)
+            sage: shares = sss.share(secret)
+            sage: secret == sss.reconstruct(shares)
+            True
+
+            sage: shares[0] = (shares[0][0], shares[0][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+            sage: shares[1] = (shares[1][0], shares[1][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
+            sage: sss.reconstruct(shares, decoder='bw')
+            Traceback (most recent call last):
+            ...
+            ValueError: too many erroneous shares.
+
+        Working in extension fields::
+
+            sage: order = 2**randint(3, 15)
+            sage: secret = randint(0, order-1)
+            sage: sss = ShamirSS(7, 3, order)
+            sage: shares = sss.share(secret)
+            sage: secret == sss.reconstruct(shares[:-2])
+            True
+
+            sage: shares[0] = (shares[0][0], shares[0][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+            sage: shares[1] = (shares[1][0], shares[1][1]+1)
+            sage: secret == sss.reconstruct(shares, decoder='bw')
+            True
+
+            sage: shares[-1] = (shares[-1][0], shares[-1][1]+1)
+            sage: sss.reconstruct(shares, decoder='bw')
+            Traceback (most recent call last):
+            ...
+            ValueError: too many erroneous shares.
+
+        Shares with integrity tags::
+
+            sage: sss = ShamirSS(7, 3, tag_key=b'key')
+            sage: secret = 42
+            sage: shares = sss.share(secret)
+            sage: for i in range(4): shares[i] = (shares[i][0], (shares[i][1]+1) % 2**8, shares[i][2])
+            sage: secret == sss.reconstruct(shares)
+            True
+        """
+        # node-major layout
+        if isinstance(shares, NodeMajorShares):
+            shares = shares.columns()
+        if type(shares[0]) == tuple and type(shares[0][1]) == list:
+            if decoder == 'lg':
+                return self._reconstruct_columns(shares)
+            shares = [[(x, ys[b]) for x, ys in shares]
+                      for b in range(len(shares[0][1]))]
+
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+
+        # drop corrupted shares
+        if len(shares[0][0]) == 3:
+            shares = self._check_tags(shares)
+
+        # set decoder
+        if decoder == 'auto':
+            secret = [coeffs[0] for coeffs in self.policy().decode(shares)]
+            if len(secret) == 1:
+                secret = secret[0]
+            return secret
+        elif decoder == 'lg':
+            secret = self._lagrange_chunk(shares)
+            if len(secret) == 1:
+                secret = secret[0]
+            return secret
+        elif decoder == 'bw':
+            decode = self._rec_berlekamp_welsh
+        else:
+            raise ValueError("unknown decoder.")
+
+        # reconstruct secret
+        secret = []
+        for element in shares:
+            # convert to field
+            points = list(zip(self._to_GF_list([x for x, y in element]),
+                              self._to_GF_list([y for x, y in element])))
+            # call decoder
+            secret.append(self._to_Int(decode(points)[0]))
+        if len(secret) == 1:
+            secret = secret[0]
+        return secret
+
+
+    def reconstruct_iter(self, shares, chunk=1024, decoder='lg'):
+        r"""
+        Reconstruct share-sets from an iterable, lazily.
+
+        The share-sets are consumed in chunks of fixed size, every chunk is
+        decoded at once and its secrets are yielded one by one. Hence the
+        memory used does not depend on the number of share-sets. The
+        decoders behave as in :meth:`reconstruct`.
+
+        INPUT:
+
+        - ``shares`` -- iterable of share-sets.
+        - ``chunk`` -- (default: ``1024``) number of share-sets decoded at once.
+        - ``decoder`` -- (default: ``'lg'``) decoder, see :meth:`reconstruct`.
+
+        OUTPUT:
+
+        Generator of the secrets.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 2**31-1)
+            sage: from itertools import count
+            sage: stream = (sss.share(i) for i in count())
+            sage: secrets = sss.reconstruct_iter(stream, chunk=100)
+            sage: [next(secrets) for i in range(5)]
+            [0, 1, 2, 3, 4]
+        """
+        shares = iter(shares)
+        while True:
+            block = list(islice(shares, chunk))
+            if not block:
+                return
+            if len(block[0][0]) == 3:
+                block = self._check_tags(block)
+            if decoder == 'lg':
+                secret = self._lagrange_chunk(block)
+            else:
+                secret = self.reconstruct(block, decoder)
+                if len(block) == 1:
+                    secret = [secret]
+            for s in secret:
+                yield s
+
+
+    def refresh(self, shares):
+        r"""
+        Proactively refresh shares.
+
+        Random sharings of zero are added to the shares, hence the secrets
+        stay the same while old and new shares cannot be combined anymore.
+        All share-sets of a batch are refreshed with one matrix operation.
+        Tagged shares are checked and the refreshed shares tagged anew.
+
+        INPUT:
+
+        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+          All share-sets must have identical share indices.
+
+        OUTPUT:
+
+        The refreshed shares or list of shares.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS()
+            sage: secret = [42, 43, 44, 45]
+            sage: shares = sss.share(secret)
+            sage: fresh = sss.refresh(shares)
+            sage: secret == sss.reconstruct(fresh)
+            True
+            sage: secret == sss.reconstruct([s[2:5] for s in fresh])
+            True
+
+        Single share-sets, also without all shares::
+
+            sage: shares = sss.share(42)
+            sage: sss.reconstruct(sss.refresh(shares[1:4]))
+            42
+        """
+        # make shares iterable
+        single = type(shares[0]) == tuple
+        if single:
+            shares = [shares]
+        tagged = len(shares[0][0]) == 3
+        if tagged:
+            shares = self._check_tags(shares)
+
+        xs, Y = self._to_matrix(shares)
+        # random polynomials with zero constant coefficient
+        R = random_matrix(self._F, Y.nrows(), self._k-1)
+        Y += R * self._vandermonde(xs, self._k-1, start=1)
+
+        shares = self._from_matrix(xs, Y)
+        if tagged:
+            shares = self._add_tags(shares)
+        if single:
+            shares = shares[0]
+        return shares
+
+
+    def reshare(self, shares, n, k):
+        r"""
+        Reshare to new number of shares and threshold.
+
+        The first `k` share holders sub-share their shares with a
+        `(n,k)`-sharing, the new share holders recombine the sub-shares with
+        cached Lagrange weights. The secrets are never reconstructed, see
+        :meth:`_reshare`. Tagged shares are checked and the new shares
+        tagged anew.
+
+        INPUT:
+
+        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+          All share-sets must have identical share indices.
+        - ``n`` -- the new number of shares.
+        - ``k`` -- the new threshold for reconstruction.
+
+        OUTPUT:
+
+        The new shares or list of shares for indices `1, ..., n`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3)
+            sage: secret = [42, 43, 44, 45]
+            sage: shares = sss.reshare(sss.share(secret), 10, 4)
+            sage: secret == ShamirSS(10, 4).reconstruct(shares)
+            True
+
+        TESTS::
+
+            sage: sss.reshare(sss.share(42)[:2], 10, 4)
+            Traceback (most recent call last):
+            ...
+            ValueError: not enough shares for resharing.
+        """
+        # make shares iterable
+        single = type(shares[0]) == tuple
+        if single:
+            shares = [shares]
+        tagged = len(shares[0][0]) == 3
+        if tagged:
+            shares = self._check_tags(shares)
+
+        xs, Y = self._to_matrix(shares)
+        if len(xs) < self._k:
+            raise ValueError("not enough shares for resharing.")
+        Y = self._reshare(xs[:self._k], Y.matrix_from_columns(range(self._k)), n, k)
+
+        shares = self._from_matrix(range(1, n+1), Y)
+        if tagged:
+            shares = self._add_tags(shares)
+        if single:
+            shares = shares[0]
+        return shares
+
+
+    def scale(self, shares, scalar):
+        r"""
+        Multiply shared values by public scalar.
+
+        INPUT:
+
+        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+        - ``scalar`` -- integer representation of the public scalar.
+
+        OUTPUT:
+
+        The shares of the product or list of it.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: sss.reconstruct(sss.scale(sss.share(21), 2))
+            42
+        """
+        # make shares iterable
+        single = type(shares[0]) == tuple
+        if single:
+            shares = [shares]
+
+        xs, Y = self._to_matrix(shares)
+        shares = self._from_matrix(xs, self._to_GF(scalar) * Y)
+        if single:
+            shares = shares[0]
+        return shares
+
+
+    def share(self, secret, layout='secret', encoder='poly'):
+        r"""
+        Generate shares.
+
+        A polynomial of degree `k-1` is generated at random with the secret
+        being the constant coefficient. It is then evaluated at points starting
+        from `1`. Precomputed zero-sharings are used if available (see
+        :meth:`precompute`).
+
+        INPUT:
+
+        - ``secret`` -- the secret to be shared as integer or list of integer.
+        - ``layout`` -- (default: ``'secret'``) either ``'secret'`` for one
+          share-set per secret or ``'node'`` for one column of y-values per
+          share holder (see :class:`NodeMajorShares`).
+        - ``encoder`` -- (default: ``'poly'``) either ``'poly'`` to evaluate
+          every polynomial at the share indices or ``'additive'`` to evaluate
+          it with the additive FFT (binary extension fields only, see
+          :func:`additive_fft`).
+
+        OUTPUT:
+
+        The shares or a list of shares, if list input. With a tag key the
+        shares are (x,y,tag)-tuples. With ``layout='node'`` a
+        :class:`NodeMajorShares` view.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+
+        Simple interface::
+
+            sage: sss = ShamirSS()
+            sage: secret = 42
+            sage: shares = sss.share(secret)
+            sage: [i+1 == share[0]  for i, share in enumerate(shares)]
+            [True, True, True, True, True, True, True]
+
+        Input vector::
+
+            sage: sss = ShamirSS()
+            sage: secret = [42, 43, 44, 45]
+            sage: shares = sss.share(secret)
+            sage: secret == sss.reconstruct(shares)
+            True
+
+        Node-major layout::
+
+            sage: shares = sss.share(secret, layout='node')
+            sage: shares.shares_for(3)[0]
+            3
+            sage: secret == sss.reconstruct(shares.columns()[2:5])
+            True
+
+        Additive FFT encoder::
+
+            sage: shares = sss.share(secret, encoder='additive')
+            sage: secret == sss.reconstruct(shares)
+            True
+        """
+        if encoder not in ('poly', 'additive'):
+            raise ValueError("unknown encoder.")
+        if layout == 'node':
+            if self._tag_key is not None:
+                raise ValueError("tags are not supported with node-major layout.")
+            if encoder != 'poly':
+                raise ValueError("node-major layout needs the polynomial encoder.")
+            return NodeMajorShares(self, secret)
+        elif layout != 'secret':
+            raise ValueError("unknown layout.")
+
+        # make input iterable
+        if not type(secret) == list:
+            secret = [secret]
+        
+        # generate shares
+        xs = list(range(1, self._n+1))
+        shares = []
+        secret = self._to_GF_list(secret)
+        pooled = self._take(len(secret))
+        for s, zeros in zip(secret, pooled):
+            # add s to precomputed zero-sharing
+            shares.append(list(zip(xs, self._to_Int_list([s + z for z in zeros]))))
+        if encoder == 'additive':
+            coeffs = [[s] + [self._F.random_element() for i in range(1, self._k)]
+                      for s in secret[len(pooled):]]
+            for ys in self._additive_encode(coeffs):
+                shares.append(list(zip(xs, self._to_Int_list(ys))))
+            secret = secret[:len(pooled)]
+        for s in secret[len(pooled):]:
+            # random polynomial with s as constant coefficient
+            ssp = self._P(s)
+            for i in range(1, self._k):
+                ssp += self._F.random_element() * self._P.gen()**i
+
+            # evaluate polynomial at different points (shares)
+            ys = [ssp(x) for x in self._context._X]
+            shares.append(list(zip(xs, self._to_Int_list(ys))))
+
+        if self._tag_key is not None:
+            shares = self._add_tags(shares)
+        if len(shares) == 1:
+            shares = shares[0]
+        return shares
+
+
+    def sub(self, a, b):
+        r"""
+        Subtract shared values.
+
+        INPUT:
+
+        - ``a`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+        - ``b`` -- shares of the same shape and share indices as ``a``.
+
+        OUTPUT:
+
+        The shares of the difference or list of it.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: sss.reconstruct(sss.sub(sss.share(50), sss.share(8)))
+            42
+        """
+        return self._combine(a, b, lambda A, B: A - B)
+
+
+    def sum(self, shares):
+        r"""
+        Sum over batch of shared values.
+
+        INPUT:
+
+        - ``shares`` -- a share-set or list of share-sets with identical share
+          indices.
+
+        OUTPUT:
+
+        The shares of the sum of all shared values.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 2**31-1)
+            sage: sss.reconstruct(sss.sum(sss.share(list(range(100)))))
+            4950
+            sage: sss.reconstruct(sss.sum(sss.share(5)))
+            5
+        """
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+        return self.weighted_sum(shares, [1] * len(shares))
+
+
+    def weighted_sum(self, shares, weights):
+        r"""
+        Weighted sum over batch of shared values.
+
+        The sum is computed as a single vector-matrix product on the share
+        matrix, i.e. `O(n)` field operations per share-set.
+
+        INPUT:
+
+        - ``shares`` -- a share-set or list of share-sets with identical share
+          indices.
+        - ``weights`` -- list of public weights as integer, one per share-set.
+
+        OUTPUT:
+
+        The shares of the weighted sum of all shared values.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: sss = ShamirSS(7, 3, 257)
+            sage: shares = sss.share([10, 11])
+            sage: sss.reconstruct(sss.weighted_sum(shares, [2, 2]))
+            42
+        """
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+        if len(shares) != len(weights):
+            raise ValueError("number of weights must match number of share-sets.")
+        xs, Y = self._to_matrix(shares)
+        w = vector(self._F, self._to_GF_list(list(weights)))
+        return self._from_matrix(xs, Matrix(w * Y))[0]
+
+
+class ShareAccumulator(SageObject):
+    r"""
+    Streaming accumulator for share-sets.
+
+    Sums (weighted) share-sets in the share domain. Only the running sum of
+    `n` field elements is kept, hence arbitrary many shared values can be
+    aggregated and reconstructed once at the end.
+
+    INPUT:
+
+    - ``scheme`` -- the :class:`ShamirSS` instance the shares belong to.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.shamir_ss import ShamirSS
+        sage: sss = ShamirSS(7, 3, 2**31-1)
+        sage: acc = sss.accumulator()
+        sage: acc.add(sss.share([1, 2, 3]))
+        sage: acc.add(sss.share(4), weight=9)
+        sage: acc
+        Accumulator over 4 share-sets
+        sage: sss.reconstruct(acc.value())
+        42
+    """
+    def __init__(self, scheme):
+        r"""
+        Streaming accumulator for share-sets.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: acc = ShamirSS().accumulator()
+            sage: acc.value()
+            Traceback (most recent call last):
+            ...
+            ValueError: no share-sets accumulated.
+        """
+        self._scheme = scheme
+        self._xs = None  # share indices
+        self._acc = None  # running sum of y-values
+        self._count = 0  # number of accumulated share-sets
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: ShamirSS().accumulator()
+            Accumulator over 0 share-sets
+        """
+        return "Accumulator over {} share-sets".format(self._count)
+
+    def add(self, shares, weight=1):
+        r"""
+        Add share-sets to the running sum.
+
+        INPUT:
+
+        - ``shares`` -- a list of shares ((x,y)-tuples of integer) or list of it.
+        - ``weight`` -- (default: ``1``) public weight applied to all share-sets.
+        """
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+
+        F = self._scheme._F
+        xs, Y = self._scheme._to_matrix(shares)
+        if self._xs is None:
+            self._xs = xs
+            self._acc = vector(F, len(xs))
+        elif xs != self._xs:
+            raise ValueError("share-sets must have identical share indices.")
+
+        w = self._scheme._to_GF(weight)
+        self._acc += vector(F, [w] * Y.nrows()) * Y
+        self._count += len(shares)
+
+    def value(self):
+        r"""
+        Return shares of the accumulated value.
+
+        OUTPUT:
+
+        The share-set of the (weighted) sum.
+        """
+        if self._acc is None:
+            raise ValueError("no share-sets accumulated.")
+        return list(zip(self._xs, self._scheme._to_Int_list(list(self._acc))))
+
+
+class NodeMajorShares(SageObject):
+    r"""
+    Shares in node-major layout.
+
+    Holds the y-values of every share holder for all secrets in one flat
+    list per share holder. The sharing polynomials are evaluated at once
+    and their coefficients, i.e. the secrets, are not kept.
+
+    INPUT:
+
+    - ``scheme`` -- the :class:`ShamirSS` instance.
+    - ``secret`` -- the secret to be shared as integer or list of integer.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.shamir_ss import ShamirSS
+        sage: sss = ShamirSS(7, 3, 257)
+        sage: shares = sss.share([10, 20, 30], layout='node')
+        sage: shares
+        Node-major shares of 3 secrets for 7 share holders
+        sage: x, ys = shares.shares_for(5)
+        sage: x, len(ys)
+        (5, 3)
+        sage: sss.reconstruct(shares)
+        [10, 20, 30]
+    """
+    def __init__(self, scheme, secret):
+        if not type(secret) == list:
+            secret = [secret]
+        self._scheme = scheme
+        self._count = len(secret)
+        C = random_matrix(scheme._F, len(secret), scheme._k)
+        C.set_column(0, scheme._to_GF_list(secret))
+        Y = C * scheme._vandermonde(range(1, scheme._n+1), scheme._k)
+        # y-values by share index - 1, one flat list per share holder
+        self._columns = [scheme._to_Int_list(list(ys)) for ys in Y.columns()]
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+        """
+        return "Node-major shares of {} secrets for {} share holders".format(
+            self._count, self._scheme._n)
+
+    def __len__(self):
+        return self._scheme._n
+
+    def columns(self):
+        r"""
+        Return columns of all share holders.
+
+        OUTPUT:
+
+        List of (x,ys)-tuples for `x = 1, ..., n`.
+        """
+        return [(x+1, ys) for x, ys in enumerate(self._columns)]
+
+    def shares_for(self, node):
+        r"""
+        Return column of a single share holder.
+
+        INPUT:
+
+        - ``node`` -- the share index.
+
+        OUTPUT:
+
+        Tuple of share index and list of y-values, one per secret.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.shamir_ss import ShamirSS
+            sage: ShamirSS(7, 3).share(42, layout='node').shares_for(8)
+            Traceback (most recent call last):
+            ...
+            ValueError: unknown share index.
+        """
+        if not 1 <= node <= self._scheme._n:
+            raise ValueError("unknown share index.")
+        return node, self._columns[node-1]
+
+
 # vim: set fileencoding=UTF-8 filetype=python :
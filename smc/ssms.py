@@ -0,0 +1,223 @@
+# coding: UTF-8
+r"""
+Secret sharing made short
+
+Implements the computational secret sharing scheme of Krawczyk [Krawczyk1993]_.
+The data is encrypted with a fresh random key, the ciphertext is dispersed
+with Rabin information dispersal and only the key is shared with Shamir
+secret sharing. Every share is about `1/k` of the data size, compared to
+the full data size for perfectly secure secret sharing.
+
+The cipher is a stream cipher with the keystream generated by SHA-256 in
+counter mode. Note that this code is for educational purposes only.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+REFERENCES:
+
+.. [Krawczyk1993] Krawczyk, H. (1993). Secret sharing made short.
+   Advances in Cryptology - CRYPTO'93, 136-146. :doi:`10.1007/3-540-48329-2_12`
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import os
+import struct
+import hashlib
+import binascii
+
+from sage.structure.sage_object import SageObject
+
+from shamir_ss import ShamirSS
+from rabin_ids import RabinIDS
+from dispersal import symbol_width, to_symbols, from_symbols
+
+KEY_SIZE = 32
+LENGTH = struct.Struct('>Q')
+
+
+###
+# private functions
+#
+def _keystream(key, length):
+    r"""
+    Generate keystream with SHA-256 in counter mode.
+    """
+    blocks = [hashlib.sha256(key + struct.pack('>Q', i)).digest()
+              for i in range((length + 31) // 32)]
+    return b''.join(blocks)[:length]
+
+
+def _xor(a, b):
+    r"""
+    Xor two byte strings of equal length.
+    """
+    if not a:
+        return a
+    x = int(binascii.hexlify(a), 16) ^ int(binascii.hexlify(b), 16)
+    return binascii.unhexlify('%0*x' % (2*len(a), x))
+
+
+class KrawczykSSMS(SageObject):
+    r"""
+    Krawczyk secret sharing made short.
+
+    INPUT:
+
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``order`` --  (default: ``2^8``) field order, at least `2^8`.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.ssms import KrawczykSSMS
+
+    Generate shares::
+
+        sage: ssms = KrawczykSSMS(7, 3)
+        sage: data = b'attack at dawn' * 100
+        sage: shares = ssms.share(data)
+        sage: len(shares[0][2]) < len(data) / 2
+        True
+
+    Reconstruct data::
+
+        sage: data == ssms.reconstruct(shares[4:])
+        True
+    """
+    def __init__(self, n=7, k=3, order=2**8):
+        r"""
+        Krawczyk secret sharing made short.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.ssms import KrawczykSSMS
+            sage: KrawczykSSMS(7, 3, 2**4)
+            Traceback (most recent call last):
+            ...
+            TypeError: field order must be at least 2^8.
+        """
+        if order < 2**8:
+            raise TypeError("field order must be at least 2^8.")
+        self._n = n
+        self._k = k
+        self._width = symbol_width(order)  # bytes per symbol
+        self._sss = ShamirSS(n, k, order)
+        self._ids = RabinIDS(n, k, order)
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.ssms import KrawczykSSMS
+            sage: print(KrawczykSSMS())
+            (7,3)-Krawczyk secret sharing made short over Finite Field in a of size 2^8
+        """
+        return "({},{})-Krawczyk secret sharing made short over {}".format(
+            self._n, self._k, self._sss._F)
+
+    ### begin public api
+
+    def reconstruct(self, shares):
+        r"""
+        Reconstruct shares.
+
+        INPUT:
+
+        - ``shares`` -- list of at least `k` shares.
+
+        OUTPUT:
+
+        The reconstructed data.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.ssms import KrawczykSSMS
+            sage: ssms = KrawczykSSMS(5, 2, 2**16)
+            sage: shares = ssms.share(b'secret')
+            sage: ssms.reconstruct(shares[3:]) == b'secret'
+            True
+        """
+        if len(shares) < self._k:
+            raise ValueError("not enough shares.")
+
+        # reconstruct key from the first k shares
+        key_shares = [[(x, key_ys[j]) for x, key_ys, data_ys in shares[:self._k]]
+                      for j in range(len(shares[0][1]))]
+        xs, Y = self._sss._to_matrix(key_shares)
+        key = Y * self._sss._lagrange_weights(xs)
+        key = from_symbols(self._sss._to_Int_list(list(key)), self._width)
+
+        # reconstruct and decrypt data
+        columns = [(x, data_ys) for x, key_ys, data_ys in shares]
+        ciphertext = from_symbols(self._ids.decode(columns), self._width)
+        plaintext = _xor(ciphertext, _keystream(key, len(ciphertext)))
+        length = LENGTH.unpack(plaintext[:LENGTH.size])[0]
+        return plaintext[LENGTH.size:LENGTH.size+length]
+
+
+    def share(self, data):
+        r"""
+        Generate shares.
+
+        The data is encrypted with a fresh key, the ciphertext dispersed with
+        :class:`RabinIDS` and the key shared with :class:`ShamirSS`.
+
+        INPUT:
+
+        - ``data`` -- the data to be shared as bytes.
+
+        OUTPUT:
+
+        List of `n` shares as tuples of the share index, the y-values of the
+        key and the y-values of the ciphertext.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.ssms import KrawczykSSMS
+            sage: ssms = KrawczykSSMS()
+            sage: shares = ssms.share(b'')
+            sage: [x for x, key, data in shares]
+            [1, 2, 3, 4, 5, 6, 7]
+            sage: ssms.reconstruct(shares) == b''
+            True
+        """
+        # fresh key, a multiple of the symbol size
+        key = os.urandom(KEY_SIZE + -KEY_SIZE % self._width)
+
+        # encrypt length prefixed and padded data
+        plaintext = LENGTH.pack(len(data)) + data
+        plaintext += b'\0' * (-len(plaintext) % (self._k * self._width))
+        ciphertext = _xor(plaintext, _keystream(key, len(plaintext)))
+
+        # disperse ciphertext and share key
+        columns = self._ids.encode(to_symbols(ciphertext, self._width))
+        key_shares = self._sss.share(to_symbols(key, self._width))
+        if type(key_shares[0]) == tuple:
+            # key fits in a single symbol
+            key_shares = [key_shares]
+        return [(x, [element[i][1] for element in key_shares], data_ys)
+                for i, (x, data_ys) in enumerate(columns)]
+
+
+# vim: set fileencoding=UTF-8 filetype=python :
@@ -0,0 +1,127 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for adaptive module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from adaptive import AdaptivePolicy
+from shamir_ss import ShamirSS
+from rabin_ids import RabinIDS
+
+from sage import *
+from sage.misc.prandom import randint
+
+import sys
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+def corrupt(shares, index, order):
+    for element in shares:
+        for i, (x, y) in enumerate(element):
+            if x == index:
+                element[i] = (x, (y + 1) % order)
+
+
+class TestAdaptive():
+    def test_no_errors(self):
+        sss = ShamirSS(7, 3, 2**31-1)
+        secret = [randint(0, 2**31-2) for i in range(20)]
+        assert secret == sss.reconstruct(sss.share(secret), decoder='auto')
+        counters = sss.policy().counters()
+        assert counters['lagrange'] == 20 and counters['checked'] == 20
+        assert counters['escalated'] == 0 and counters['faults'] == 0
+        assert counters['unchecked'] == 0
+
+        # exactly k shares cannot be checked
+        shares = [element[4:] for element in sss.share(secret)]
+        assert secret == sss.reconstruct(shares, decoder='auto')
+        counters = sss.policy().counters()
+        assert counters['checked'] == 20 and counters['unchecked'] == 20
+
+    def test_faulty_node(self):
+        sss = ShamirSS(7, 3, 2**31-1)
+        policy = sss.policy()
+        secret = [randint(0, 2**31-2) for i in range(10)]
+        shares = sss.share(secret)
+        corrupt(shares, 2, 2**31-1)
+        assert secret == sss.reconstruct(shares, decoder='auto')
+        assert policy.counters()['escalated'] == 10
+        assert policy.counters()['faults'] == 10
+        assert policy.scores()[2] > policy.scores()[1]
+        assert 2 not in policy.select(range(1, 8))
+
+        # the faulty node is avoided, no further error correction
+        assert secret == sss.reconstruct(shares, decoder='auto')
+        assert policy.counters()['escalated'] == 10
+        assert policy.counters()['lagrange'] == 10
+
+    def test_untrusted(self):
+        sss = ShamirSS(5, 3, 2**31-1)
+        policy = AdaptivePolicy(sss, threshold=0.4)
+        policy._update([1, 2, 3], set([1, 2, 3]))
+        shares = sss.share([7, 8])
+        assert [7, 8] == [coeffs[0] for coeffs in policy.decode(shares)]
+        assert policy.counters()['escalated'] == 2
+
+    def test_too_many_errors(self):
+        sss = ShamirSS(7, 3, 2**31-1)
+        shares = [sss.share(42)]
+        for index in [1, 2, 3]:
+            corrupt(shares, index, 2**31-1)
+        with pytest.raises(ValueError):
+            sss.reconstruct(shares, decoder='auto')
+        assert sss.policy().counters()['failed'] == 1
+
+    def test_rabin(self):
+        ids = RabinIDS(7, 3, 2**8)
+        data = [randint(1, 255) for i in range(30)]
+        shares = ids.share(data)
+        assert data == ids.reconstruct(shares, decoder='auto')
+        corrupt(shares, 5, 2**8)
+        assert data == ids.reconstruct(shares, decoder='auto')
+        assert data == ids.reconstruct([element[2:] for element in shares], decoder='auto')
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
@@ -35,6 +35,22 @@ class TestDummy():
         print(points)
         assert poly == berlekamp_welsh(deg, points)
 
+    def test_strict(self):
+        F = FiniteField(2**31-1)
+        P = PolynomialRing(F, 'x')
+        n, deg = 8, 3
+        poly = P([F.random_element() for i in range(deg+1)])
+        points = [(F(i), poly(F(i))) for i in range(1, n+1)]
+        assert poly == berlekamp_welsh(deg, points, strict=True)
+        for i in [0, 4]:
+            points[i] = (points[i][0], points[i][1] + 1)
+        assert poly == berlekamp_welsh(deg, points, strict=True)
+
+        F = FiniteField(257)
+        points = [(F(1), F(1)), (F(2), F(2)), (F(3), F(4))]
+        with pytest.raises(ValueError):
+            berlekamp_welsh(0, points, strict=True)
+
 #### manual test cases
 class ManualTest():
     def test_generic_01(self):
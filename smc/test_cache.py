@@ -0,0 +1,79 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for cache module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from cache import LRUCache
+
+import os
+import sys
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+class TestLRUCache():
+    def test_eviction(self):
+        cache = LRUCache(3)
+        for i in range(5):
+            cache[i] = i*i
+        assert len(cache) == 3
+        assert 0 not in cache and 1 not in cache
+        assert cache[2] == 4
+        cache[5] = 25
+        assert 2 in cache and 3 not in cache
+        assert cache.get(3) is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_update(self):
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a'] = 3
+        cache['c'] = 4
+        assert cache['a'] == 3 and 'b' not in cache
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
@@ -0,0 +1,131 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for code_context module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from code_context import code_context, CodeContext
+from berlekamp_welsh import berlekamp_welsh
+from shamir_ss import ShamirSS
+from rabin_ids import RabinIDS
+
+from sage import *
+from sage.misc.prandom import randint
+
+import os
+import sys
+import pickle
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+class TestCodeContext():
+    def test_shared(self):
+        assert code_context(7, 3, 257) is code_context(7, 3, 257)
+        assert code_context(7, 3, 257) is not code_context(7, 4, 257)
+        assert ShamirSS(7, 3, 257)._context is RabinIDS(7, 3, 257)._context
+
+    def test_matrices(self):
+        for order in [257, 2**8]:
+            ctx = code_context(7, 3, order)
+            G = ctx.generator_matrix()
+            H = ctx.parity_check_matrix()
+            assert (G.nrows(), G.ncols()) == (3, 7)
+            assert (H.nrows(), H.ncols()) == (4, 7)
+            assert G * H.transpose() == 0
+            xs = (2, 5, 7)
+            V = G.matrix_from_columns([x-1 for x in xs])
+            assert V * ctx.inverse_vandermonde(xs) == 1
+
+    def test_lagrange_weights(self):
+        ctx = code_context(7, 3, 257)
+        F = ctx._F
+        poly = ctx._P([F(3), F(5), F(7)])
+        xs = [1, 4, 6]
+        for point in [0, 2, 3]:
+            weights = ctx.lagrange_weights(xs, point)
+            assert poly(F(point)) == sum(w * poly(F(x)) for w, x in zip(weights, xs))
+
+    def test_berlekamp_welsh(self):
+        order = 2**8
+        ctx = code_context(7, 3, order)
+        F = ctx._F
+        poly = ctx._P([F.random_element() for i in range(3)])
+        points = [(x, poly(x)) for x in ctx._X]
+        points[3] = (points[3][0], points[3][1] + F.one())
+        assert poly == berlekamp_welsh(2, points, ctx)
+
+    def test_pickle(self):
+        ctx = code_context(7, 3, 2**8)
+        ctx.inverse_vandermonde((1, 2, 3))
+        assert pickle.loads(pickle.dumps(ctx)) is ctx
+        cache = pickle.loads(pickle.dumps(ctx._inverses))
+        assert cache[(1, 2, 3)] == ctx.inverse_vandermonde((1, 2, 3))
+        cache[(1, 2, 4)] = None
+        assert len(cache) == 2
+
+    def test_bw_system(self):
+        ctx = code_context(9, 3, 257)
+        F = ctx._F
+        for i in range(3):
+            poly = ctx._P([F.random_element() for i in range(3)])
+            points = [(x, poly(x)) for x in ctx._X]
+            points[i] = (points[i][0], points[i][1] + F.one())
+            assert poly == berlekamp_welsh(2, points, ctx)
+        A = ctx.bw_system(ctx._X, 2)
+        assert A.is_immutable() and A.matrix_from_columns(range(6, 9)) == 0
+
+    def test_conversion(self):
+        for order in [257, 2**8, 2**16, 2**20, 2**61-1]:
+            ctx = code_context(7, 3, order)
+            xs = [0, 1, order-1] + [randint(0, order-1) for i in range(100)]
+            elements = ctx.from_integers(xs)
+            assert elements == [ctx._element(x) for x in xs]
+            assert xs == ctx.to_integers(elements)
+            for x in [-1, order, order+1]:
+                with pytest.raises(TypeError):
+                    ctx.from_integers([0, x])
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
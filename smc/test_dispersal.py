@@ -0,0 +1,166 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for dispersal module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from dispersal import QuorumStore, LocalDirectoryBackend, StorageBackend
+from dispersal import pack_share, unpack_share, share_width
+from shamir_ss import ShamirSS
+from rabin_ids import RabinIDS
+
+from sage import *
+from sage.misc.prandom import randint
+
+import os
+import sys
+import threading
+import shutil
+import tempfile
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+class BlockedBackend(LocalDirectoryBackend):
+    def __init__(self, path):
+        LocalDirectoryBackend.__init__(self, path)
+        self.release = threading.Event()
+        self.reads = 0
+
+    def get(self, key):
+        self.release.wait(30)
+        self.reads += 1
+        return LocalDirectoryBackend.get(self, key)
+
+
+class FailingBackend(StorageBackend):
+    def connect(self):
+        raise IOError("backend down")
+
+
+def templ_generic(scheme, data, backends=None):
+        root = tempfile.mkdtemp()
+        try:
+            if backends is None:
+                backends = [LocalDirectoryBackend(os.path.join(root, str(i)))
+                            for i in range(scheme._n)]
+            with QuorumStore(scheme, backends) as store:
+                store.put('obj', data)
+                return store.get('obj')
+        finally:
+            shutil.rmtree(root)
+
+
+class TestDispersal():
+    def test_share_format(self):
+        for order in [2**8, 257, 2**16, 2**31-1]:
+            width = share_width(order)
+            ys = [randint(0, order-1) for i in range(32)]
+            assert (5, ys, 32*width) == unpack_share(pack_share(5, ys, width, 32*width), width)
+
+    def test_local_backend(self):
+        root = tempfile.mkdtemp()
+        try:
+            backend = LocalDirectoryBackend(root)
+            payloads = [os.urandom(1000) for i in range(16)]
+            threads = [threading.Thread(target=backend.put, args=('obj', p)) for p in payloads]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert backend.get('obj') in payloads
+            assert ['obj'] == os.listdir(root)
+        finally:
+            shutil.rmtree(root)
+
+    def test_rabin(self):
+        data = [randint(0, 255) for i in range(60)]
+        assert data == templ_generic(RabinIDS(7, 3, 2**8), data)
+        assert data == templ_generic(RabinIDS(7, 3, 257), data)
+
+    def test_shamir(self):
+        secret = [randint(0, 2**31-2) for i in range(16)]
+        assert secret == templ_generic(ShamirSS(7, 3, 2**31-1), secret)
+        assert [42] == templ_generic(ShamirSS(7, 3), [42])
+        assert [] == templ_generic(ShamirSS(7, 3), [])
+        with pytest.raises(TypeError):
+            templ_generic(ShamirSS(7, 3), 42)
+
+    def test_single_symbol(self):
+        # one secret gives a single share-set, still stored and read as list
+        assert [7] == templ_generic(ShamirSS(5, 2, 257), [7])
+        assert [7] == templ_generic(ShamirSS(7, 3, 2**31-1), [7])
+        assert [1, 2, 3] == templ_generic(RabinIDS(7, 3, 257), [1, 2, 3])
+
+    def test_failing_backends(self):
+        root = tempfile.mkdtemp()
+        try:
+            backends = [LocalDirectoryBackend(os.path.join(root, str(i)))
+                        for i in range(3)] + [FailingBackend() for i in range(4)]
+            data = list(range(30))
+            assert data == templ_generic(RabinIDS(7, 3), data, backends)
+            backends[0] = FailingBackend()
+            with pytest.raises(IOError):
+                templ_generic(RabinIDS(7, 3), data, backends)
+        finally:
+            shutil.rmtree(root)
+
+    def test_quorum(self):
+        root = tempfile.mkdtemp()
+        try:
+            backends = [BlockedBackend(os.path.join(root, str(i))) for i in range(3)] + \
+                [LocalDirectoryBackend(os.path.join(root, str(i))) for i in range(3, 7)]
+            with QuorumStore(RabinIDS(7, 3), backends) as store:
+                data = list(range(30))
+                store.put('obj', data)
+                # blocked backends never answered, reconstructed from the others
+                assert data == store.get('obj')
+                assert [0, 0, 0] == [backend.reads for backend in backends[:3]]
+                for backend in backends[:3]:
+                    backend.release.set()
+        finally:
+            shutil.rmtree(root)
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
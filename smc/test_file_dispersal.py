@@ -0,0 +1,213 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for file_dispersal module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from file_dispersal import disperse_file, restore_file, recover_range
+from dispersal import pack_share, share_width, symbol_width, to_symbols
+from rabin_ids import RabinIDS
+
+from sage import *
+from sage.misc.prandom import randint, sample
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+def templ_generic(length, n, k, order, stripe, processes, subset=None):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'data')
+            data = os.urandom(length)
+            with open(path, 'wb') as f:
+                f.write(data)
+            shares = [os.path.join(root, 'share%d' % i) for i in range(n)]
+            disperse_file(path, shares, n, k, order, stripe, processes)
+            if subset is None:
+                subset = sample(shares, k)
+            copy = os.path.join(root, 'copy')
+            restore_file(subset, copy, n, k, order, stripe, processes)
+            with open(copy, 'rb') as f:
+                assert data == f.read()
+            return [open(share, 'rb').read() for share in shares]
+        finally:
+            shutil.rmtree(root)
+
+
+class TestFileDispersal():
+    def test_sizes(self):
+        for length in [0, 1, 2, 3, 100, 1001]:
+            templ_generic(length, 7, 3, 2**8, 16, 1)
+        for length in [0, 1, 5, 6, 999]:
+            templ_generic(length, 5, 2, 2**16, 16, 1)
+            templ_generic(length, 5, 2, 257, 16, 1)
+
+    def test_processes(self):
+        templ_generic(5000, 7, 3, 2**8, 100, 2)
+        templ_generic(5000, 7, 3, 2**8, 100, None)
+        templ_generic(4000, 5, 3, 2**16, 64, 3)
+
+    def test_format(self):
+        # share files equal the packed columns of RabinIDS
+        n, k, order = 6, 3, 2**16
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'data')
+            data = os.urandom(6 * 50)
+            with open(path, 'wb') as f:
+                f.write(data)
+            shares = [os.path.join(root, str(i)) for i in range(n)]
+            disperse_file(path, shares, n, k, order, 7, 2)
+            columns = RabinIDS(n, k, order).encode(to_symbols(data, symbol_width(order)))
+            for share, (x, ys) in zip(shares, columns):
+                with open(share, 'rb') as f:
+                    assert pack_share(x, ys, share_width(order), len(data)) == f.read()
+        finally:
+            shutil.rmtree(root)
+
+    def test_stripe_invariance(self):
+        # stripe layout does not change the share files
+        reference = None
+        for stripe, processes in [(1, 1), (3, 2), (1000, 1)]:
+            root = tempfile.mkdtemp()
+            try:
+                path = os.path.join(root, 'data')
+                with open(path, 'wb') as f:
+                    f.write(b''.join(bytes(bytearray([i % 256])) for i in range(301)))
+                shares = [os.path.join(root, str(i)) for i in range(7)]
+                disperse_file(path, shares, 7, 3, 2**8, stripe, processes)
+                result = [open(share, 'rb').read() for share in shares]
+            finally:
+                shutil.rmtree(root)
+            if reference is None:
+                reference = result
+            assert reference == result
+
+    def test_recover_range(self):
+        for n, k, order in [(7, 3, 2**8), (5, 2, 2**16), (5, 3, 257)]:
+            root = tempfile.mkdtemp()
+            try:
+                path = os.path.join(root, 'data')
+                data = os.urandom(5000)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                shares = [os.path.join(root, str(i)) for i in range(n)]
+                disperse_file(path, shares, n, k, order, 64, 1)
+                for offset, length in [(0, 0), (0, 1), (1, 4096), (4095, 3), (4990, 100),
+                                       (5000, 10), (6000, 1), (0, 5000)]:
+                    subset = sample(shares, k)
+                    assert data[offset:offset+length] == \
+                        recover_range(subset, offset, length, n, k, order)
+                files = [open(share, 'rb') for share in shares[-k:]]
+                try:
+                    assert data[123:4567] == recover_range(files, 123, 4444, n, k, order)
+                finally:
+                    for f in files:
+                        f.close()
+                with pytest.raises(ValueError):
+                    recover_range(shares[:k-1], 0, 1, n, k, order)
+                with pytest.raises(ValueError):
+                    recover_range(shares, -1, 1, n, k, order)
+                with pytest.raises(ValueError):
+                    recover_range([shares[0]] * k, 0, 1, n, k, order)
+            finally:
+                shutil.rmtree(root)
+
+    def test_errors(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'data')
+            with open(path, 'wb') as f:
+                f.write(os.urandom(100))
+            shares = [os.path.join(root, str(i)) for i in range(7)]
+            with pytest.raises(ValueError):
+                disperse_file(path, shares[:6])
+            with pytest.raises(TypeError):
+                disperse_file(path, shares, order=2**4)
+            disperse_file(path, shares)
+            with pytest.raises(ValueError):
+                restore_file(shares[:2], os.path.join(root, 'copy'))
+            with pytest.raises(ValueError):
+                restore_file([shares[0], shares[1], shares[0]], os.path.join(root, 'copy'))
+            with open(shares[0], 'ab') as f:
+                f.write(b'\0')
+            with pytest.raises(ValueError):
+                restore_file(shares[:3], os.path.join(root, 'copy'))
+        finally:
+            shutil.rmtree(root)
+
+
+class ManualTest():
+    def test_throughput(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'data')
+            with open(path, 'wb') as f:
+                f.write(os.urandom(2**22))
+            shares = [os.path.join(root, str(i)) for i in range(7)]
+            for processes in [1, None]:
+                start = time.time()
+                disperse_file(path, shares, processes=processes)
+                encode = time.time() - start
+                start = time.time()
+                restore_file(shares[4:], os.path.join(root, 'copy'), processes=processes)
+                decode = time.time() - start
+                print("processes {}: encode {:.2f} MB/s, decode {:.2f} MB/s".format(
+                    processes, 4 / encode, 4 / decode))
+        finally:
+            shutil.rmtree(root)
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    if args.manual:
+        # manual testing zone
+        ManualTest().test_throughput()
+
+    else:
+        # run py.test for current file
+        pytest.main([sys.argv[0]])
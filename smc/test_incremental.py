@@ -0,0 +1,114 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for incremental module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from incremental import IncrementalDecoder
+from shamir_ss import ShamirSS
+from rabin_ids import RabinIDS
+
+from sage import *
+from sage.misc.prandom import randint, shuffle
+
+import os
+import sys
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+def columns(shares):
+    return [(block[0][0] + i, [b[i][1] for b in shares])
+            for i in range(len(shares[0]))]
+
+
+class TestIncrementalDecoder():
+    def test_shamir(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        secret = randint(0, o-1)
+        shares = sss.share(secret)
+        shuffle(shares)
+        dec = IncrementalDecoder(sss)
+        assert not dec.add(shares[0])
+        assert not dec.add(shares[1])
+        assert dec.add(shares[2])
+        assert secret == dec.result()
+
+    def test_shamir_batch(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        secret = [randint(0, o-1) for i in range(16)]
+        cols = columns(sss.share(secret))
+        assert secret == IncrementalDecoder(sss).feed(cols[3:])
+
+    def test_early_exit(self):
+        sss = ShamirSS(7, 3, 257)
+        shares = iter(sss.share(42))
+        assert 42 == IncrementalDecoder(sss, errors=1).feed(shares)
+        assert 3 == len(list(shares))
+
+    def test_errors(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        secret = randint(0, o-1)
+        shares = sss.share(secret)
+        shares[1] = (shares[1][0], (shares[1][1]+1) % o)
+        shares[4] = (shares[4][0], (shares[4][1]+1) % o)
+        dec = IncrementalDecoder(sss, errors=2)
+        assert secret == dec.feed(shares)
+        with pytest.raises(ValueError):
+            IncrementalDecoder(sss, errors=1).feed(shares)
+
+    def test_rabin(self):
+        ids = RabinIDS(7, 3, 257)
+        data = [randint(0, 255) for i in range(30)]
+        cols = columns(ids.share(data))
+        shuffle(cols)
+        assert data == IncrementalDecoder(ids).feed(cols)
+        cols[0] = (cols[0][0], [(y+1) % 257 for y in cols[0][1]])
+        assert data == IncrementalDecoder(ids, errors=2).feed(cols)
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
@@ -0,0 +1,106 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for mpc module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from mpc import BGWSimulation
+
+from sage import *
+from sage.misc.prandom import randint
+from sage.rings.finite_rings.constructor import FiniteField
+
+import sys
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+class TestBGW():
+    def test_multiply(self):
+        p = 2**31-1
+        for n, k in [(3, 2), (5, 3), (7, 3), (10, 4)]:
+            mpc = BGWSimulation(n, k, p)
+            a = [randint(0, p-1) for i in range(50)]
+            b = [randint(0, p-1) for i in range(50)]
+            c = mpc.multiply(mpc.share(a), mpc.share(b))
+            assert [x*y % p for x, y in zip(a, b)] == mpc.open(c)
+            # any k parties reconstruct the product
+            assert mpc.open(c) == mpc.open([element[-k:] for element in c])
+
+    def test_circuit(self):
+        p = 2**31-1
+        mpc = BGWSimulation(7, 3, p)
+        a = [randint(0, p-1) for i in range(10)]
+        x = mpc.share(a)
+        y = x
+        for i in range(4):
+            y = mpc.multiply(y, x)
+        assert [pow(v, 5, p) for v in a] == mpc.open(y)
+        assert [(v + v**2) % p for v in a] == mpc.open(mpc.add(x, mpc.multiply(x, x)))
+
+    def test_extension_field(self):
+        F = FiniteField(2**8, 'a')
+        mpc = BGWSimulation(5, 2, 2**8)
+        a = [randint(0, 255) for i in range(20)]
+        b = [randint(0, 255) for i in range(20)]
+        expected = [(F.fetch_int(x) * F.fetch_int(y)).integer_representation()
+                    for x, y in zip(a, b)]
+        assert expected == mpc.open(mpc.multiply(mpc.share(a), mpc.share(b)))
+
+    def test_single(self):
+        mpc = BGWSimulation(5, 3, 257)
+        assert 6 == mpc.open(mpc.multiply(mpc.share(2), mpc.share(3)))
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            BGWSimulation(4, 3)
+        mpc = BGWSimulation(5, 3, 257)
+        with pytest.raises(ValueError):
+            mpc.multiply(mpc.share([1, 2]), mpc.share([3]))
+        with pytest.raises(ValueError):
+            mpc.multiply([element[1:] for element in mpc.share([1, 2])],
+                         [element[1:] for element in mpc.share([3, 4])])
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
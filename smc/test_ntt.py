@@ -35,6 +35,8 @@ from sage.rings.finite_rings.constructor import FiniteField
 from sage.misc.functional import parent
 from sage.misc.functional import is_odd
 from sage.matrix.constructor import Matrix
+from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
+from sage.rings.infinity import Infinity
 
 import os
 import sys
@@ -45,6 +47,7 @@ sys.path.append('/usr/lib/python2.7/dist-packages')
 import pytest
 
 import ntt
+import bench_ntt
 
 def simple_test(F, n, k):
     m = [F.zero_element()] * n
@@ -67,6 +70,93 @@ def simple_test(F, n, k):
     assert r == s and m == ss and m == rr, "ERROR!!!"
 
 
+class TestNTT():
+    def test_transform(self):
+        simple_test(FiniteField(7), 6, 3)
+        simple_test(FiniteField(257), 16, 5)
+        simple_test(FiniteField(7340033), 64, 10)
+
+    def test_poly_mul(self):
+        for F in [FiniteField(257), FiniteField(7340033), FiniteField(256, 'a')]:
+            P = PolynomialRing(F, 'x')
+            for la, lb in [(1, 1), (3, 40), (50, 50), (100, 7)]:
+                a = [F.random_element() for i in range(la)]
+                b = [F.random_element() for i in range(lb)]
+                for crossover in [0, 32, None]:
+                    c = ntt.poly_mul(a, b, F, crossover)
+                    assert len(c) == la + lb - 1
+                    assert P(c) == P(a) * P(b)
+
+    def test_poly_divmod(self):
+        for F in [FiniteField(257), FiniteField(7340033), FiniteField(256, 'a')]:
+            P = PolynomialRing(F, 'x')
+            for la, lb in [(1, 1), (2, 5), (40, 3), (100, 50), (130, 7)]:
+                a = [F.random_element() for i in range(la)]
+                b = [F.random_element() for i in range(lb-1)] + [F.one()]
+                for crossover in [0, 32, None]:
+                    q, r = ntt.poly_divmod(a, b, F, crossover)
+                    assert len(r) == lb - 1
+                    assert (P(q), P(r)) == P(a).quo_rem(P(b))
+
+    def test_convolve_batch(self):
+        F = FiniteField(7340033)
+        kernel = [F.random_element() for i in range(20)]
+        vectors = [[F.random_element() for i in range(l)] for l in [1, 20, 33, 0]]
+        result = ntt.convolve_batch(vectors, kernel, F, crossover=0)
+        for v, c in zip(vectors, result):
+            assert c == ntt._schoolbook(v, kernel, F)
+
+    def test_tuned_crossover(self):
+        F = FiniteField(7340033)
+        crossover = ntt.tuned_crossover(F)
+        assert crossover == Infinity or crossover in [2**i for i in range(1, 8)]
+        assert ntt.tuned_crossover(F) == crossover
+        assert ntt.tuned_crossover(FiniteField(256, 'a')) == Infinity
+
+    def test_pruned(self):
+        F = FiniteField(7340033)
+        n = 256
+        for k in [0, 1, 3, 64, 129, 256]:
+            a = [F.random_element() for i in range(k)]
+            full = ntt.ntt(a + [F.zero()] * (n - k), F)
+            for outputs in [0, 1, 7, 100, 256]:
+                assert ntt.ntt_pruned(a, F, n, outputs) == full[:outputs]
+            assert ntt.intt_pruned(full, F, outputs=k) == a
+        with pytest.raises(ValueError):
+            ntt.ntt_pruned([F.one()] * 3, F, 2)
+        with pytest.raises(ValueError):
+            ntt.ntt_pruned([F.one()], F, 24)
+
+    def test_additive(self):
+        for F in [FiniteField(2**8, 'a'), FiniteField(2**16, 'a')]:
+            P = PolynomialRing(F, 'x')
+            for n, k in [(1, 1), (2, 1), (16, 5), (64, 64), (256, 30)]:
+                a = [F.random_element() for i in range(k)]
+                b = ntt.additive_fft(a, F, n)
+                assert b == [P(a)(F.fetch_int(i)) for i in range(n)]
+                assert ntt.additive_ifft(b, F) == a + [F.zero()] * (n - k)
+            a = [F.random_element() for i in range(32)]
+            assert ntt.intt(ntt.ntt(a, F, 'additive'), F, 'additive') == a
+        with pytest.raises(ValueError):
+            ntt.additive_fft([F.one()], FiniteField(257), 4)
+        with pytest.raises(ValueError):
+            ntt.additive_fft([F.one()], F, 12)
+
+    def test_fit_exponent(self):
+        sizes = [2**i for i in range(4, 12)]
+        assert abs(bench_ntt.fit_exponent(sizes, [3e-6 * n for n in sizes]) - 1) < 1e-9
+        assert abs(bench_ntt.fit_exponent(sizes, [1e-8 * n**2 for n in sizes]) - 2) < 1e-9
+
+
+class ManualTest():
+    def test_scaling(self):
+        F = FiniteField(bench_ntt.PRIME)
+        report = bench_ntt.run([F], max_bits=12, max_slow_bits=6, max_textbook_bits=8)
+        assert set(fit['implementation'] for fit in report['fits']) == \
+            set(bench_ntt.IMPLEMENTATIONS)
+        assert not bench_ntt.check(report, 0.5)
+
+
 ### main
 def parseargs():
     """ Parse the commandline arguments
@@ -89,3 +179,7 @@ if __name__ == '__main__':
 
     F = FiniteField(256, 'a')
     simple_test(F, 15, 7)
+
+    if args.manual:
+        # manual testing zone
+        ManualTest().test_scaling()
@@ -31,7 +31,7 @@ AUTHORS:
 from rabin_ids import RabinIDS
 
 from sage import *
-from sage.misc.prandom import randint
+from sage.misc.prandom import randint, sample
 from sage.rings.arith import random_prime, next_prime
 from sage.functions.log import log
 
@@ -86,8 +86,96 @@ class TestRabinIDS():
         assert data == templ_generic(7, 3, 2**8, data)
         assert data == templ_generic(7, 3, 2**8, data, 'bw', None, 2)
 
+    def test_repair(self):
+        for order in [257, 2**8, 2**16]:
+            ids = RabinIDS(7, 3, order)
+            data = [randint(0, 255) for i in range(60)]
+            shares = ids.share(data)
+            for index in [1, 4, 7]:
+                lost = [block[index-1] for block in shares]
+                survivors = [[s for s in block if s[0] != index] for block in shares]
+                assert lost == ids.repair(survivors, index)
+                assert lost == ids.repair([block[3:] for block in survivors], index)
+
+                # columns of share holders
+                columns = ids.encode(data)
+                survivors = [c for c in columns if c[0] != index]
+                assert columns[index-1] == ids.repair(survivors, index)
+                assert columns[index-1] == ids.repair(survivors[2:5], index)
+
+    def test_repair_tagged(self):
+        ids = RabinIDS(7, 3, 2**8, tag_key=b'key')
+        data = [randint(0, 255) for i in range(60)]
+        shares = ids.share(data)
+        lost = [block.pop(3) for block in shares]
+        # corrupted and moved shares are dropped, the rest is repaired
+        shares[0][0] = (1, (shares[0][0][1]+1) % 256, shares[0][0][2])
+        shares[5][1] = shares[6][1]
+        assert lost == ids.repair(shares, 4)
+        with pytest.raises(ValueError):
+            ids.repair([block[:3] for block in shares], 4)
+
+    def test_encode(self):
+        for order in [257, 2**8, 2**16]:
+            ids = RabinIDS(7, 3, order)
+            data = [randint(0, 255) for i in range(300)]
+            shares = ids.share(data)
+            columns = ids.encode(data, chunk=16)
+            assert [(i+1, [block[i][1] for block in shares]) for i in range(7)] == columns
+            assert data == ids.reconstruct([[(x, ys[b]) for x, ys in columns[2:5]]
+                                            for b in range(100)])
+        for n, k in [(7, 3), (255, 100)]:
+            ids = RabinIDS(n, k, 2**8)
+            data = [randint(0, 255) for i in range(3*k)]
+            assert ids.encode(data, chunk=2, encoder='additive') == ids.encode(data)
+            assert ids.share(data, encoder='additive') == ids.share(data)
+            assert ids.share(data, encoder='poly') == ids.share(data)
+            with pytest.raises(ValueError):
+                ids.share(data, encoder='matrix')
+
+    def test_decode(self):
+        for order in [257, 2**8, 2**16]:
+            ids = RabinIDS(7, 3, order)
+            data = [randint(0, 255) for i in range(300)]
+            columns = ids.encode(data)
+            assert data == ids.decode(columns)
+            assert data == ids.decode(columns[::-2])
+            shares = ids.share(data)
+            # different erasures per block
+            shares = [block[b%5:] for b, block in enumerate(shares)]
+            assert data == ids.reconstruct(shares)
+            with pytest.raises(ValueError):
+                ids.decode(columns[:2])
+            shares = ids.share(data)
+            shares[7][5] = (shares[7][5][0], (shares[7][5][1]+1) % order)
+            with pytest.raises(ValueError):
+                ids.reconstruct(shares)
+            assert data == ids.reconstruct([block[:3] for block in shares])
+
+    def test_tags(self):
+        ids = RabinIDS(7, 3, 257, tag_key=b'secret key')
+        data = [randint(1, 255) for i in range(60)]
+        shares = ids.share(data)
+        for block in shares:
+            for i in sample(range(7), 4):
+                block[i] = (block[i][0], (block[i][1]+1) % 257, block[i][2])
+        assert data == ids.reconstruct(shares)
+        assert data == ids.reconstruct(shares, decoder='bw')
+
 
 class ManualTest():
+    def test_throughput(self, size=2**20):
+        import time
+        ids = RabinIDS(7, 3, 2**8)
+        data = [randint(0, 255) for i in range(size - size%3)]
+        start = time.time()
+        ids.encode(data)
+        print("encode: {:.3f} MB/s".format(len(data) / (time.time()-start) / 2**20))
+        shares = ids.share(data)
+        start = time.time()
+        ids.reconstruct([block[4:] for block in shares])
+        print("decode: {:.3f} MB/s".format(len(data) / (time.time()-start) / 2**20))
+
     def test_case_tmp(self):
         data = [i for i in range(12)]
         assert data == templ_verbose(7, 3, 2**8, data, 'lg', None, 0)
@@ -31,12 +31,14 @@ AUTHORS:
 from shamir_ss import ShamirSS
 
 from sage import *
-from sage.misc.prandom import randint
+from sage.misc.prandom import randint, sample
 from sage.rings.arith import random_prime, next_prime
 from sage.functions.log import log
 
+import gc
 import os
 import sys
+import pickle
 import argparse
 
 # make host packages available
@@ -96,6 +98,220 @@ class TestShamirSS():
             assert s == templ_generic(n, k, o, s)
             assert s == templ_generic(n, k, o, s, 'bw', None, 1)
 
+    def test_refresh(self):
+        o = 2**31-1
+        secret = [randint(0, o-1) for i in range(16)]
+        sss = ShamirSS(7, 3, o)
+        shares = sss.share(secret)
+        fresh = sss.refresh(shares)
+        assert fresh != shares
+        assert secret == sss.reconstruct(fresh)
+        assert secret == sss.reconstruct([s[4:] for s in sss.refresh(shares)])
+        assert secret[0] == sss.reconstruct(sss.refresh(shares[0][:3]))
+
+    def test_reshare(self):
+        o = 2**31-1
+        secret = [randint(0, o-1) for i in range(16)]
+        sss = ShamirSS(7, 3, o)
+        shares = sss.reshare(sss.share(secret), 10, 5)
+        assert secret == ShamirSS(10, 5, o).reconstruct(shares)
+        assert secret == ShamirSS(10, 5, o).reconstruct([s[5:] for s in shares])
+        shares = ShamirSS(10, 5, o).reshare(shares, 5, 2)
+        assert secret == sss.reconstruct([s[1:3] for s in shares])
+
+    def test_linear_operations(self):
+        o = 2**31-1
+        a = [randint(0, 2**16) for i in range(16)]
+        b = [randint(0, 2**8) for i in range(16)]
+        sss = ShamirSS(7, 3, o)
+        sa, sb = sss.share(a), sss.share(b)
+        assert [x+y for x, y in zip(a, b)] == sss.reconstruct(sss.add(sa, sb))
+        assert [x-y for x, y in zip(a, b)] == \
+            [s if s < o//2 else s-o for s in sss.reconstruct(sss.sub(sa, sb))]
+        assert [3*x for x in a] == sss.reconstruct(sss.scale(sa, 3))
+        assert sum(a) == sss.reconstruct(sss.sum(sa))
+        assert sum(x*y for x, y in zip(a, b)) == sss.reconstruct(sss.weighted_sum(sa, b))
+        # single share-sets
+        assert 5 == sss.reconstruct(sss.sum(sss.share(5)))
+        assert 15 == sss.reconstruct(sss.weighted_sum(sss.share(5), [3]))
+        assert 15 == sss.reconstruct(sss.scale(sss.share(5), 3))
+
+    def test_accumulator(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        acc = sss.accumulator()
+        data = [randint(0, 2**16) for i in range(64)]
+        for i in range(0, 64, 8):
+            acc.add(sss.share(data[i:i+8]))
+        acc.add(sss.share(5), weight=2)
+        assert sum(data) + 10 == sss.reconstruct(acc.value())
+
+    def test_tags(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o, tag_key=b'secret key')
+        secret = [randint(0, o-1) for i in range(16)]
+        shares = sss.share(secret)
+        assert all(len(share) == 3 for element in shares for share in element)
+        for element in shares:
+            for i in sample(range(7), 4):
+                element[i] = (element[i][0], (element[i][1]+1) % o, element[i][2])
+        assert secret == sss.reconstruct(shares)
+        with pytest.raises(ValueError):
+            ShamirSS(7, 3, o).reconstruct(shares)
+        with pytest.raises(ValueError):
+            ShamirSS(7, 3, o, tag_key=b'other key').reconstruct(shares)
+
+        # shares moved between share-sets or replayed after refresh
+        shares = sss.share(secret)
+        fresh = sss.refresh(shares)
+        assert all(len(share) == 3 for element in fresh for share in element)
+        for i in range(3):
+            fresh[0][i] = fresh[1][i]
+            fresh[2][i] = shares[2][i]
+        assert [len(element) for element in sss._check_tags(fresh)[:3]] == [4, 7, 4]
+        assert secret == sss.reconstruct(fresh)
+        with pytest.raises(ValueError):
+            sss.reconstruct(fresh[::-1])
+        assert secret == ShamirSS(9, 4, o, tag_key=b'secret key').reconstruct(
+            sss.reshare(shares, 9, 4))
+        with pytest.raises(ValueError):
+            sss.add(shares, shares)
+
+    def test_precompute(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        sss.precompute(20)
+        secret = [randint(0, o-1) for i in range(30)]
+        shares = sss.share(secret)
+        assert len(sss._pool) == 0
+        assert secret == sss.reconstruct(shares)
+        assert secret == sss.reconstruct([element[4:] for element in shares])
+
+        # every pooled sharing is used once
+        sss.precompute(10)
+        a, b = sss.share([0, 0])
+        assert a != b
+
+        # extension fields and tags
+        sss = ShamirSS(5, 2, 2**8, tag_key=b'key')
+        sss.precompute(4)
+        assert [1, 2, 3] == sss.reconstruct(sss.share([1, 2, 3]))
+        sss.precompute(0)
+        assert len(sss._pool) == 0
+
+    def test_node_layout(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        secret = [randint(0, o-1) for i in range(25)]
+        shares = sss.share(secret, layout='node')
+        x, ys = shares.shares_for(6)
+        assert x == 6 and len(ys) == 25
+        # only y-values are kept, not the polynomials
+        assert not hasattr(shares, '_C')
+        columns = shares.columns()
+        assert columns[5] == (x, ys)
+        assert secret == sss.reconstruct(shares)
+        assert secret == sss.reconstruct(sample(columns, 3))
+        assert secret == sss.reconstruct(columns, decoder='bw')
+
+        # same polynomials as secret-major share-sets
+        elements = [[(x, ys[b]) for x, ys in columns] for b in range(25)]
+        assert secret == sss.reconstruct(elements)
+
+        assert 42 == sss.reconstruct(sss.share(42, layout='node'))
+        with pytest.raises(ValueError):
+            sss.share(42, layout='other')
+        with pytest.raises(ValueError):
+            ShamirSS(tag_key=b'key').share(42, layout='node')
+
+    def test_reconstruct_iter(self):
+        o = 2**31-1
+        sss = ShamirSS(7, 3, o)
+        secret = [randint(0, o-1) for i in range(50)]
+        shares = sss.share(secret)
+        for chunk in [1, 7, 50, 1024]:
+            assert secret == list(sss.reconstruct_iter(iter(shares), chunk))
+        assert secret == list(sss.reconstruct_iter(shares, 16, decoder='bw'))
+
+        # mixed share indices
+        mixed = [sample(element, 3) for element in shares]
+        assert secret == list(sss.reconstruct_iter(mixed, 8))
+
+        # surplus shares are checked as in reconstruct
+        mixed = [sample(element, 3 + b % 4) for b, element in enumerate(shares)]
+        assert secret == list(sss.reconstruct_iter(mixed, 8)) == sss.reconstruct(mixed)
+        bad = [list(element) for element in shares]
+        bad[3][6] = (7, (bad[3][6][1] + 1) % o)
+        with pytest.raises(ValueError):
+            list(sss.reconstruct_iter(bad, 8))
+        with pytest.raises(ValueError):
+            sss.reconstruct(bad)
+
+        # consumed lazily
+        pulled = []
+        def stream():
+            for element in shares:
+                pulled.append(element)
+                yield element
+        secrets = sss.reconstruct_iter(stream(), chunk=10)
+        assert secret[0] == next(secrets)
+        assert len(pulled) == 10
+
+        # tags
+        sss = ShamirSS(7, 3, o, tag_key=b'key')
+        shares = sss.share(secret)
+        shares[3][0] = (1, (shares[3][0][1] + 1) % o, shares[3][0][2])
+        assert secret == list(sss.reconstruct_iter(shares, 5))
+
+    def test_precompute_background(self):
+        sss = ShamirSS(7, 3, 2**31-1)
+        sss.precompute(64, background=True)
+        for i in range(10):
+            assert 42 == sss.reconstruct(sss.share([42] * 16)[3])
+        # pool below half, wait for the refill
+        sss.share([42] * 40)
+        while len(sss._pool) < 64:
+            assert sss._filled.wait(10)
+            sss._filled.clear()
+        sss.precompute(0)
+        assert sss._refiller is None and len(sss._pool) == 0
+
+        # restart right after stopping
+        sss.precompute(64, background=True)
+        assert sss._refiller.is_alive()
+        sss.precompute(0)
+
+        # the thread does not keep the scheme alive
+        sss.precompute(8, background=True)
+        refiller = sss._refiller
+        del sss
+        gc.collect()
+        refiller.join(10)
+        assert not refiller.is_alive()
+
+    def test_pickle(self):
+        sss = ShamirSS(7, 3, 2**31-1)
+        sss.precompute(10, background=True)
+        sss.policy()
+        copy = pickle.loads(pickle.dumps(sss))
+        assert len(copy._pool) == 0 and copy._refiller is None
+        assert 42 == copy.reconstruct(copy.share(42))
+        sss.precompute(0)
+
+    def test_additive_encoder(self):
+        for n, k, o in [(7, 3, 2**8), (15, 5, 2**8), (16, 4, 2**16)]:
+            sss = ShamirSS(n, k, o)
+            secret = [randint(0, o-1) for i in range(20)]
+            shares = sss.share(secret, encoder='additive')
+            assert [[x for x, y in element] for element in shares] == [list(range(1, n+1))] * 20
+            assert secret == sss.reconstruct([sample(element, k) for element in shares])
+        sss.precompute(4)
+        assert secret == sss.reconstruct(sss.share(secret, encoder='additive'))
+        with pytest.raises(TypeError):
+            ShamirSS(7, 3, 257).share(1, encoder='additive')
+        with pytest.raises(ValueError):
+            sss.share(1, encoder='unknown')
+
 
 class ManualTest():
     def test_case_01(self):
@@ -109,7 +325,8 @@ class ManualTest():
         assert 177 == templ_generic(7, 5, 256, 177, 'bw', None, 1)
         assert 177 == templ_generic(7, 5, 256, 177, 'bw', None, 1)
         assert 177 == templ_generic(7, 3, 256, 177, 'bw', None, 2)
-        assert 177 != templ_generic(7, 3, 256, 177, 'bw', None, 3)
+        with pytest.raises(ValueError):
+            templ_generic(7, 3, 256, 177, 'bw', None, 3)
             
     def test_case_03(self):
         for i in range(100):
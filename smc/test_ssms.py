@@ -0,0 +1,104 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for ssms module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from ssms import KrawczykSSMS
+
+from sage import *
+from sage.misc.prandom import randint, sample
+
+import os
+import sys
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+def templ_generic(n, k, order, data, num_shares=None):
+        ssms = KrawczykSSMS(n, k, order)
+        shares = ssms.share(data)
+        if num_shares is not None:
+            shares = sample(shares, num_shares)
+        return ssms.reconstruct(shares)
+
+
+class TestKrawczykSSMS():
+    def test_extension_fields(self):
+        data = os.urandom(1000)
+        assert data == templ_generic(7, 3, 2**8, data)
+        assert data == templ_generic(7, 3, 2**8, data, 3)
+        assert data == templ_generic(10, 4, 2**16, data, 4)
+        assert data == templ_generic(10, 4, 2**24, data, 5)
+
+    def test_prime_fields(self):
+        data = os.urandom(333)
+        assert data == templ_generic(7, 3, 257, data, 3)
+        assert data == templ_generic(7, 3, 65537, data, 4)
+
+    def test_single_key_symbol(self):
+        # the key fits in one symbol of the Mersenne prime field
+        data = os.urandom(300)
+        shares = KrawczykSSMS(5, 2, 2**521-1).share(data)
+        assert all(len(key) == 1 for x, key, ys in shares)
+        assert data == templ_generic(5, 2, 2**521-1, data, 2)
+
+    def test_lengths(self):
+        for length in [0, 1, 2, 7, 8, 9, 63, 64, 65]:
+            data = os.urandom(length)
+            assert data == templ_generic(5, 2, 2**16, data, 2)
+
+    def test_share_size(self):
+        data = os.urandom(3000)
+        shares = KrawczykSSMS(7, 3, 2**8).share(data)
+        assert all(len(ys) <= 1003 for x, key, ys in shares)
+        assert all(len(key) == 32 for x, key, ys in shares)
+
+    def test_not_enough_shares(self):
+        ssms = KrawczykSSMS(7, 3, 2**8)
+        with pytest.raises(ValueError):
+            ssms.reconstruct(ssms.share(b'data')[:2])
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    # run py.test for current file
+    pytest.main([sys.argv[0]])
@@ -0,0 +1,165 @@
+#!/bin/env sage -python
+# coding: UTF-8
+r"""
+Testcases for vss module
+
+Use as standalone test module for *out of sage tree* testing. 
+Please note, this module uses test.py from the host installation,
+so an adequate version must be installed.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+from vss import FeldmanVSS, PedersenVSS, GROUP, multi_exp, hash_to_group
+
+from sage import *
+from sage.misc.prandom import randint
+
+import sys
+import time
+import argparse
+
+# make host packages available
+sys.path.append('/usr/lib/python2.7/dist-packages')
+import pytest
+
+
+def corrupt(share):
+    return (share[0], share[1] + 1) + tuple(share[2:])
+
+
+def templ_generic(cls):
+        p, q, g = GROUP
+        vss = cls(7, 3)
+        secret = [randint(0, q-1) for i in range(40)]
+        shares, commitments = vss.deal(secret)
+        assert [] == vss.verify(shares, commitments)
+        assert secret == vss.reconstruct([element[4:] for element in shares])
+
+        # shares of a single holder
+        assert [] == vss.verify([element[2:3] for element in shares], commitments)
+
+        # invalid shares are identified
+        shares[5][2] = corrupt(shares[5][2])
+        shares[9][0] = corrupt(shares[9][0])
+        assert [(5, 3), (9, 1)] == vss.verify(shares, commitments)
+
+        # invalid commitments
+        commitments[7][1] = commitments[7][1] * g % p
+        assert 9 == len(vss.verify(shares, commitments))
+        commitments[7][1] = p - commitments[7][1]  # not in the subgroup
+        assert 9 == len(vss.verify(shares, commitments))
+
+
+class TestVSS():
+    def test_multi_exp(self):
+        p, q, g = GROUP
+        for count in [1, 5, 31, 32, 200]:
+            bases = [pow(g, randint(0, q-1), p) for i in range(count)]
+            exponents = [randint(0, q-1) for i in range(count)]
+            expected = 1
+            for b, e in zip(bases, exponents):
+                expected = expected * pow(b, e, p) % p
+            assert expected == multi_exp(bases, exponents, p)
+
+    def test_feldman(self):
+        templ_generic(FeldmanVSS)
+        # shares are plain Shamir shares
+        vss = FeldmanVSS(7, 3)
+        assert 7 == vss.reconstruct(vss.sum([vss.share(3), vss.share(4)]))
+        assert 2 == len(vss.share([1, 2]))
+
+    def test_pedersen(self):
+        templ_generic(PedersenVSS)
+        p, q, g = GROUP
+        h = hash_to_group(p, b'pedersen')
+        assert pow(h, q, p) == 1 and h not in (1, g)
+
+    def test_single(self):
+        vss = PedersenVSS(5, 2)
+        shares, commitments = vss.deal(42)
+        assert [] == vss.verify(shares, commitments)
+        assert 42 == vss.reconstruct(shares, decoder='bw')
+        with pytest.raises(TypeError):
+            vss.share(GROUP[1])
+
+        # one-element lists are unwrapped like ShamirSS.share
+        shares, commitments = vss.deal([42])
+        assert 5 == len(shares) and 2 == len(commitments)
+        assert [] == vss.verify(shares, commitments)
+        with pytest.raises(ValueError):
+            vss.share(42, layout='node')
+        with pytest.raises(ValueError):
+            vss.share(42, encoder='additive')
+
+    def test_linear(self):
+        for cls in [FeldmanVSS, PedersenVSS]:
+            vss = cls(7, 3)
+            a, ca = vss.deal([40, 41])
+            b, cb = vss.deal([2, 3])
+            result = [(vss.add(a, b), [1, 1], [42, 44]),
+                      (vss.sub(a, b), [1, -1], [38, 38])]
+            for shares, weights, expected in result:
+                assert expected == vss.reconstruct(shares)
+                for element, c, d in zip(shares, ca, cb):
+                    assert [] == vss.verify(element, vss.combine_commitments([c, d], weights))
+            total = vss.weighted_sum(a, [1, 2])
+            assert 122 == vss.reconstruct(total)
+            assert [] == vss.verify(total, vss.combine_commitments(ca, [1, 2]))
+            assert 81 == vss.reconstruct(vss.sum(a))
+            assert 80 == vss.reconstruct(vss.scale(a[0], 2))
+
+
+class ManualTest():
+    def test_batch_speedup(self):
+        vss = FeldmanVSS(7, 3)
+        shares, commitments = vss.deal(list(range(1000)))
+        holder = [element[:1] for element in shares]
+        start = time.time()
+        assert [] == vss.verify(holder, commitments)
+        batch = time.time() - start
+        start = time.time()
+        for element, cs in zip(holder, commitments):
+            assert [] == vss.verify(element, cs)
+        single = time.time() - start
+        print("batch {:.3f}s, one by one {:.3f}s".format(batch, single))
+
+
+### main
+def parseargs():
+    """ Parse the commandline arguments
+    """
+    parser = argparse.ArgumentParser(description='')
+    parser.add_argument('-m', '--manual', action='store_true', 
+                        help='Run test cases manually.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseargs()
+
+    if args.manual:
+        # manual testing zone
+        ManualTest().test_batch_speedup()
+
+    else:
+        # run py.test for current file
+        pytest.main([sys.argv[0]])
@@ -0,0 +1,692 @@
+# coding: UTF-8
+r"""
+Verifiable secret sharing
+
+Implements the verifiable secret sharing schemes of Feldman [Feldman1987]_
+and Pedersen [Pedersen1991]_ on top of :class:`ShamirSS`. The dealer
+publishes commitments to the coefficients of the sharing polynomials in
+the subgroup of prime order `q` of `\ZZ_p^*`, where `p = 2q + 1` is a
+safe prime, and every shareholder can check its shares against them.
+
+Many shares are verified at once with a random linear combination of the
+verification equations, i.e. a single multi-exponentiation, only if this
+batch check fails every share is checked on its own. Group elements are
+plain Python integers. Note that this code is for educational purposes
+only.
+
+AUTHORS:
+
+- smc contributors (2026): initial version
+
+REFERENCES:
+
+.. [Feldman1987] Feldman, P. (1987). A practical scheme for non-interactive
+   verifiable secret sharing. 28th Annual Symposium on Foundations of
+   Computer Science, 427-438. :doi:`10.1109/SFCS.1987.4`
+.. [Pedersen1991] Pedersen, T. P. (1991). Non-interactive and
+   information-theoretic secure verifiable secret sharing. Advances in
+   Cryptology - CRYPTO'91, 129-140. :doi:`10.1007/3-540-46766-1_9`
+"""
+###############################################################################
+# Copyright 2026, smc contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+import struct
+import random
+import hashlib
+import binascii
+
+from shamir_ss import ShamirSS
+
+# 256 bit safe prime p = 2q + 1 and generator of the subgroup of order q
+GROUP = (0xc768a69cba0e645b786f75fd584b27cf10078515eca5e8039fe963b0bb3db5f3,
+         0x63b4534e5d07322dbc37bafeac2593e78803c28af652f401cff4b1d85d9edaf9,
+         4)
+STRAUS = 32  # multi-exponentiations with fewer bases use Straus' method
+WEIGHT_BITS = 128  # maximum bits of the random weights of batch verification
+
+_random = random.SystemRandom()
+
+
+###
+# group arithmetic
+#
+def safe_prime_group(bits):
+    r"""
+    Generate group parameters.
+
+    INPUT:
+
+    - ``bits`` -- bit length of the safe prime `p`.
+
+    OUTPUT:
+
+    Tuple `(p, q, g)` of a safe prime `p = 2q + 1` and a generator `g` of
+    the subgroup of order `q`.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.vss import safe_prime_group
+        sage: p, q, g = safe_prime_group(64)
+        sage: p == 2*q + 1 and is_prime(p) and is_prime(q)
+        True
+        sage: pow(g, q, p)
+        1
+    """
+    from sage.rings.arith import random_prime, is_prime
+    while True:
+        q = int(random_prime(2**(bits-1), lbound=2**(bits-2)))
+        if is_prime(2*q + 1):
+            return 2*q + 1, q, 4
+
+
+def hash_to_group(p, label):
+    r"""
+    Derive group element without known discrete logarithm.
+
+    INPUT:
+
+    - ``p`` -- the safe prime.
+    - ``label`` -- bytes to derive the element from.
+
+    OUTPUT:
+
+    Element of the subgroup of quadratic residues.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.vss import GROUP, hash_to_group
+        sage: p, q, g = GROUP
+        sage: h = hash_to_group(p, b'pedersen')
+        sage: pow(h, q, p) == 1 and h != g
+        True
+    """
+    size = (p.bit_length() + 7) // 8 + 16
+    counter = 0
+    while True:
+        stream = b''
+        while len(stream) < size:
+            stream += hashlib.sha256(label + struct.pack('>II', counter, len(stream))).digest()
+        h = pow(int(binascii.hexlify(stream[:size]), 16) % p, 2, p)
+        if h not in (0, 1):
+            return h
+        counter += 1
+
+
+def multi_exp(bases, exponents, p):
+    r"""
+    Compute `\prod_i b_i^{e_i} \bmod p`.
+
+    Uses Straus' interleaved method for few bases and Pippenger's bucket
+    method otherwise.
+
+    INPUT:
+
+    - ``bases`` -- list of integer.
+    - ``exponents`` -- list of non-negative integer.
+    - ``p`` -- the modulus.
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.vss import multi_exp
+        sage: multi_exp([2, 3, 5], [10, 20, 30], 1009) == 2**10 * 3**20 * 5**30 % 1009
+        True
+    """
+    if len(bases) < STRAUS:
+        return _straus(bases, exponents, p)
+    return _pippenger(bases, exponents, p)
+
+
+def _straus(bases, exponents, p, window=4):
+    r"""
+    Multi-exponentiation with Straus' method (fixed windows).
+    """
+    size = 2**window
+    tables = []
+    for b in bases:
+        table = [1]
+        for i in range(1, size):
+            table.append(table[-1] * b % p)
+        tables.append(table)
+    bits = max([e.bit_length() for e in exponents] + [1])
+    mask = size - 1
+    acc = 1
+    for shift in range((bits - 1) // window * window, -1, -window):
+        for i in range(window):
+            acc = acc * acc % p
+        for table, e in zip(tables, exponents):
+            digit = (e >> shift) & mask
+            if digit:
+                acc = acc * table[digit] % p
+    return acc
+
+
+def _pippenger(bases, exponents, p):
+    r"""
+    Multi-exponentiation with Pippenger's bucket method.
+    """
+    window = max(1, len(bases).bit_length() - 2)
+    mask = 2**window - 1
+    bits = max([e.bit_length() for e in exponents] + [1])
+    acc = 1
+    for shift in range((bits - 1) // window * window, -1, -window):
+        for i in range(window):
+            acc = acc * acc % p
+        buckets = [1] * (mask + 1)
+        for b, e in zip(bases, exponents):
+            digit = (e >> shift) & mask
+            if digit:
+                buckets[digit] = buckets[digit] * b % p
+        running = total = 1
+        for digit in range(mask, 0, -1):
+            running = running * buckets[digit] % p
+            total = total * running % p
+        acc = acc * total % p
+    return acc
+
+
+def _jacobi(a, n):
+    r"""
+    Jacobi symbol `(a/n)` for odd `n`.
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+class FeldmanVSS(ShamirSS):
+    r"""
+    Feldman verifiable secret sharing.
+
+    The shares are Shamir shares over `GF(q)`, the commitments are
+    `C_j = g^{a_j}` for the coefficients `a_j` of the sharing polynomial.
+
+    INPUT:
+
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``group`` -- (default: ``GROUP``) tuple `(p, q, g)` of group
+      parameters (see :func:`safe_prime_group`).
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.vss import FeldmanVSS
+
+    Generate and verify shares::
+
+        sage: vss = FeldmanVSS(7, 3)
+        sage: shares, commitments = vss.deal(42)
+        sage: vss.verify(shares, commitments)
+        []
+        sage: vss.reconstruct(shares[2:5])
+        42
+
+    Verify many share-sets at once, invalid shares are identified::
+
+        sage: shares, commitments = vss.deal(list(range(10)))
+        sage: shares[3][1] = (2, shares[3][1][1] + 1)
+        sage: vss.verify(shares, commitments)
+        [(3, 2)]
+    """
+    def __init__(self, n=7, k=3, group=GROUP):
+        r"""
+        Feldman verifiable secret sharing.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: FeldmanVSS(7, 3, (23, 11, 4))
+            (7,3)-Feldman verifiable secret sharing over Finite Field of size 11
+        """
+        self._p, self._q, self._g = [int(v) for v in group]
+        ShamirSS.__init__(self, n, k, self._q)
+        self._generators = (self._g,)
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: print(FeldmanVSS(5, 2))
+            (5,2)-Feldman verifiable secret sharing over Finite Field of size 45097579439023108674966352496533040853651720015910120200252785239850259241721
+        """
+        return "({},{})-Feldman verifiable secret sharing over {}".format(
+            self._n, self._k, self._F)
+
+
+    def _polynomial(self, secret):
+        r"""
+        Return random coefficients with the secret as constant term.
+        """
+        q = self._q
+        return [int(secret) % q] + [_random.randrange(q) for i in range(self._k - 1)]
+
+
+    def _evaluate(self, coeffs, x):
+        r"""
+        Evaluate polynomial at ``x`` modulo `q` (Horner's rule).
+        """
+        y = 0
+        for c in reversed(coeffs):
+            y = (y * x + c) % self._q
+        return y
+
+
+    def _deal(self, secret):
+        r"""
+        Return share-set and commitments of a single secret.
+        """
+        if not 0 <= secret < self._q:
+            raise TypeError("secret must be within 0 and field order.")
+        a = self._polynomial(secret)
+        shares = [(x, self._evaluate(a, x)) for x in range(1, self._n + 1)]
+        return shares, [pow(self._g, c, self._p) for c in a]
+
+
+    def _check(self, items, commitments, weights):
+        r"""
+        Check weighted sum of verification equations.
+
+        Every item is a tuple of share-set index, share index and the values
+        committed with the generators. The equations
+        `\prod_t G_t^{v_t} = \prod_j C_j^{x^j}` are combined with the
+        weights into a single multi-exponentiation.
+        """
+        p, q, k = self._p, self._q, self._k
+        bases = list(self._generators)
+        exponents = [0] * len(bases)
+        powers = {}  # exponent per commitment
+        for (b, x, values), rho in zip(items, weights):
+            for t, v in enumerate(values):
+                exponents[t] = (exponents[t] - rho * v) % q
+            xj = rho
+            for j in range(k):
+                powers[(b, j)] = (powers.get((b, j), 0) + xj) % q
+                xj = xj * x % q
+        for (b, j), e in powers.items():
+            bases.append(commitments[b][j])
+            exponents.append(e)
+        return multi_exp(bases, exponents, p) == 1
+
+
+    def _in_group(self, element):
+        r"""
+        Check membership in the subgroup of order `q`.
+        """
+        return 0 < element < self._p and _jacobi(element, self._p) == 1
+
+    ### begin public api
+
+    def combine_commitments(self, commitments, weights):
+        r"""
+        Combine commitments of share-sets.
+
+        Returns the commitments of the weighted sum of the share-sets, e.g.
+        of the result of :meth:`weighted_sum`, :meth:`add` (weights `1, 1`)
+        or :meth:`sub` (weights `1, -1`).
+
+        INPUT:
+
+        - ``commitments`` -- list of the commitments of the share-sets.
+        - ``weights`` -- list of integer weights, one per share-set.
+
+        OUTPUT:
+
+        The commitments of the weighted sum.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: vss = FeldmanVSS()
+            sage: shares, commitments = vss.deal([40, 2])
+            sage: total = vss.sub(shares[0], shares[1])
+            sage: vss.verify(total, vss.combine_commitments(commitments, [1, -1]))
+            []
+        """
+        if len(commitments) != len(weights):
+            raise ValueError("number of weights must match number of commitments.")
+        weights = [int(w) % self._q for w in weights]
+        return [multi_exp(list(cs), weights, self._p) for cs in zip(*commitments)]
+
+
+    def deal(self, secret):
+        r"""
+        Generate shares and commitments.
+
+        INPUT:
+
+        - ``secret`` -- the secret to be shared as integer or list of it.
+
+        OUTPUT:
+
+        Tuple of the shares and the commitments, i.e. a list of `k` group
+        elements per share-set. Both are lists of it, if list input with
+        more than one secret (see :meth:`share`).
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: vss = FeldmanVSS()
+            sage: shares, commitments = vss.deal([1, 2])
+            sage: len(shares), len(shares[0]), len(commitments[0])
+            (2, 7, 3)
+            sage: shares, commitments = vss.deal([1])
+            sage: len(shares), len(commitments)
+            (7, 3)
+        """
+        if not isinstance(secret, list):
+            secret = [secret]
+        dealt = [self._deal(s) for s in secret]
+        if len(dealt) == 1:
+            return dealt[0]
+        return [d[0] for d in dealt], [d[1] for d in dealt]
+
+
+    def precompute(self, count, background=False):
+        r"""
+        Precompute random sharings of zero.
+
+        Not supported, the commitments need the coefficients of every
+        sharing polynomial.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: FeldmanVSS().precompute(10)
+            Traceback (most recent call last):
+            ...
+            ValueError: verifiable secret sharing does not use precomputed zero-sharings.
+        """
+        raise ValueError("verifiable secret sharing does not use precomputed zero-sharings.")
+
+
+    def share(self, secret, layout='secret', encoder='poly'):
+        r"""
+        Generate shares.
+
+        The commitments are discarded, use :meth:`deal` to publish them.
+
+        INPUT:
+
+        - ``secret`` -- the secret to be shared as integer or list of it.
+        - ``layout`` -- (default: ``'secret'``) only ``'secret'``, one
+          share-set per secret, is supported.
+        - ``encoder`` -- (default: ``'poly'``) only ``'poly'``, evaluation of
+          the sharing polynomials, is supported.
+
+        OUTPUT:
+
+        The shares or a list of shares, if list input.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: vss = FeldmanVSS()
+            sage: vss.reconstruct(vss.add(vss.share(1), vss.share(2)))
+            3
+            sage: vss.share(1, layout='node')
+            Traceback (most recent call last):
+            ...
+            ValueError: verifiable secret sharing supports only the secret-major layout.
+        """
+        if layout != 'secret':
+            raise ValueError("verifiable secret sharing supports only the secret-major layout.")
+        if encoder != 'poly':
+            raise ValueError("verifiable secret sharing supports only the polynomial encoder.")
+        return self.deal(secret)[0]
+
+
+    def verify(self, shares, commitments):
+        r"""
+        Verify shares against commitments.
+
+        All shares are checked with one random linear combination of the
+        verification equations. Only if this check fails, the shares are
+        checked one by one.
+
+        INPUT:
+
+        - ``shares`` -- a share-set or list of share-sets, possibly partial
+          (e.g. the shares of a single shareholder).
+        - ``commitments`` -- the commitments of the share-sets.
+
+        OUTPUT:
+
+        List of invalid shares as tuples of share-set index and share
+        index, empty if all shares are valid.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import FeldmanVSS
+            sage: vss = FeldmanVSS()
+            sage: shares, commitments = vss.deal([1, 2, 3])
+            sage: vss.verify([element[4:5] for element in shares], commitments)
+            []
+        """
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+            commitments = [commitments]
+        if len(shares) != len(commitments):
+            raise ValueError("number of share-sets and commitments must match.")
+
+        items = [(b, int(share[0]), tuple(int(v) for v in share[1:]))
+                 for b, element in enumerate(shares) for share in element]
+        members = all(self._in_group(c) for cs in commitments for c in cs)
+        bound = min(2**WEIGHT_BITS, self._q)
+        weights = [_random.randrange(1, bound) for item in items]
+        if members and self._check(items, commitments, weights):
+            return []
+        return [(b, x) for b, x, values in items
+                if not self._check([(b, x, values)], commitments, [1])]
+
+
+class PedersenVSS(FeldmanVSS):
+    r"""
+    Pedersen verifiable secret sharing.
+
+    A second random polynomial `b(x)` blinds the commitments
+    `C_j = g^{a_j} h^{b_j}`, hence they do not reveal anything about the
+    secret. Every share is a tuple `(x, a(x), b(x))`. The generator `h` is
+    derived by hashing, so its discrete logarithm is not known.
+
+    INPUT:
+
+    - ``n``  --  (default: ``7``) the number of shares.
+    - ``k``  --  (default: ``3``) the threshold for reconstruction.
+    - ``group`` -- (default: ``GROUP``) tuple `(p, q, g)` of group
+      parameters (see :func:`safe_prime_group`).
+
+    EXAMPLES::
+
+        sage: from sage.crypto.smc.vss import PedersenVSS
+        sage: vss = PedersenVSS(5, 2)
+        sage: shares, commitments = vss.deal([42, 43])
+        sage: vss.verify(shares, commitments)
+        []
+        sage: vss.reconstruct([element[3:] for element in shares])
+        [42, 43]
+        sage: shares[1][0] = (1, shares[1][0][1], shares[1][0][2] + 1)
+        sage: vss.verify(shares, commitments)
+        [(1, 1)]
+    """
+    def __init__(self, n=7, k=3, group=GROUP):
+        FeldmanVSS.__init__(self, n, k, group)
+        self._h = hash_to_group(self._p, b'pedersen')
+        self._generators = (self._g, self._h)
+
+    ### begin module private api
+
+    def _repr_(self):
+        r"""
+        Return String representation of self.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import PedersenVSS
+            sage: PedersenVSS(7, 3, (23, 11, 4))
+            (7,3)-Pedersen verifiable secret sharing over Finite Field of size 11
+        """
+        return "({},{})-Pedersen verifiable secret sharing over {}".format(
+            self._n, self._k, self._F)
+
+
+    def _deal(self, secret):
+        r"""
+        Return share-set and commitments of a single secret.
+        """
+        if not 0 <= secret < self._q:
+            raise TypeError("secret must be within 0 and field order.")
+        p = self._p
+        a = self._polynomial(secret)
+        b = self._polynomial(_random.randrange(self._q))
+        shares = [(x, self._evaluate(a, x), self._evaluate(b, x))
+                  for x in range(1, self._n + 1)]
+        commitments = [multi_exp([self._g, self._h], [c, d], p) for c, d in zip(a, b)]
+        return shares, commitments
+
+
+    def _split(self, shares):
+        r"""
+        Split list of share-sets into value and blinding share-sets.
+        """
+        if any(len(share) != 3 for element in shares for share in element):
+            raise ValueError("Pedersen shares must be (x,y,r)-tuples.")
+        return ([[(x, y) for x, y, r in element] for element in shares],
+                [[(x, r) for x, y, r in element] for element in shares])
+
+
+    def _join(self, values, blindings):
+        r"""
+        Join value and blinding share-sets to Pedersen share-sets.
+        """
+        return [[(x, y, r) for (x, y), (z, r) in zip(ye, re)]
+                for ye, re in zip(values, blindings)]
+
+
+    def _combine(self, a, b, op):
+        r"""
+        Apply linear operation to values and blindings.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import PedersenVSS
+            sage: vss = PedersenVSS(7, 3, (23, 11, 4))
+            sage: vss._combine([(1, 5, 1), (2, 7, 2)], [(1, 6, 3), (2, 8, 4)], lambda A, B: A + B)
+            [(1, 0, 4), (2, 4, 6)]
+        """
+        # make shares iterable
+        single = type(a[0]) == tuple
+        if single:
+            a, b = [a], [b]
+        (ay, ar), (by, br) = self._split(a), self._split(b)
+        shares = self._join(FeldmanVSS._combine(self, ay, by, op),
+                            FeldmanVSS._combine(self, ar, br, op))
+        if single:
+            shares = shares[0]
+        return shares
+
+    ### begin public api
+
+    def reconstruct(self, shares, decoder='lg'):
+        r"""
+        Reconstruct shares.
+
+        The blinding values are dropped, see :meth:`ShamirSS.reconstruct`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import PedersenVSS
+            sage: vss = PedersenVSS()
+            sage: shares, commitments = vss.deal(42)
+            sage: vss.reconstruct(shares, decoder='bw')
+            42
+        """
+        if type(shares[0]) == tuple:
+            shares = [(x, y) for x, y, r in shares]
+        else:
+            shares = [[(x, y) for x, y, r in element] for element in shares]
+        return FeldmanVSS.reconstruct(self, shares, decoder)
+
+
+    def scale(self, shares, scalar):
+        r"""
+        Multiply shared values by public scalar.
+
+        Values and blindings are scaled, see :meth:`ShamirSS.scale`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import PedersenVSS
+            sage: vss = PedersenVSS()
+            sage: shares, commitments = vss.deal(21)
+            sage: doubled = vss.scale(shares, 2)
+            sage: vss.verify(doubled, vss.combine_commitments([commitments], [2]))
+            []
+            sage: vss.reconstruct(doubled)
+            42
+        """
+        # make shares iterable
+        single = type(shares[0]) == tuple
+        if single:
+            shares = [shares]
+        values, blindings = self._split(shares)
+        shares = self._join(FeldmanVSS.scale(self, values, scalar),
+                            FeldmanVSS.scale(self, blindings, scalar))
+        if single:
+            shares = shares[0]
+        return shares
+
+
+    def weighted_sum(self, shares, weights):
+        r"""
+        Weighted sum over batch of shared values.
+
+        Values and blindings are summed, see :meth:`ShamirSS.weighted_sum`.
+
+        EXAMPLES::
+
+            sage: from sage.crypto.smc.vss import PedersenVSS
+            sage: vss = PedersenVSS()
+            sage: shares, commitments = vss.deal([10, 11])
+            sage: total = vss.weighted_sum(shares, [2, 2])
+            sage: vss.verify(total, vss.combine_commitments(commitments, [2, 2]))
+            []
+            sage: vss.reconstruct(total)
+            42
+        """
+        # make shares iterable
+        if type(shares[0]) == tuple:
+            shares = [shares]
+        values, blindings = self._split(shares)
+        return self._join([FeldmanVSS.weighted_sum(self, values, weights)],
+                          [FeldmanVSS.weighted_sum(self, blindings, weights)])[0]
+
+
+# vim: set fileencoding=UTF-8 filetype=python :